@@ -1,69 +1,235 @@
-from tracemalloc import start
-from wsgiref import validate
-from fastapi import FastAPI, HTTPException
-import pickle
-from requests import request
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
+from typing import Any, Dict, List
+import json
+import tempfile
 import time
-import pandas as pd
 
 
-from churn_system.schema import validate_inference_data
 from churn_system.config.config import load_config
-from churn_system.logging.logger import get_logger
-from churn_system.monitoring.prediction_store import store_prediction
+from churn_system.logging.logger import enable_background_logging, get_logger
+from churn_system.monitoring.prediction_store import (
+    store_prediction,
+    store_predictions,
+    get_prediction_writer,
+)
 from churn_system.config.config import CONFIG
-from churn_system.features.build_features import build_features
-from churn_system.api.schema_generator import generate_request_model
-from pathlib import Path
+from churn_system.api.model_registry import ModelRegistry
+from churn_system.api.scoring_executor import (
+    ScoringExecutor,
+    ScoringQueueFull,
+    StageError,
+    score_record,
+)
+from churn_system.inference.batch import score_records
+from churn_system.inference.tree_ensemble import EnsemblePipeline
+from churn_system.inference.micro_batcher import MicroBatcher
+from churn_system.monitoring.metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE,
+    ERRORS,
+    MODEL_INFO,
+    PREDICTIONS,
+    PROBABILITY,
+    REGISTRY as METRICS,
+    SCORING_IN_FLIGHT,
+    STAGE_SECONDS,
+    VALIDATION_FAILURES,
+    MetricsMiddleware,
+)
+from pydantic import BaseModel, ValidationError
+from contextlib import asynccontextmanager
 
 logger = get_logger(__name__, CONFIG["logging"]["api"])
 
 config = load_config()
 
-app = FastAPI(title="Churn Prediction API")
-RequestModel = generate_request_model()
+SERVING = config["serving"]
 
-# Load the model Once at startup
+# Set by load_serving_state at startup, not at import
+registry = None
+batcher = None
+scoring_executor = None
 
-model_path = Path(CONFIG["paths"]["production_model"])
 
-with open(model_path,"rb") as f:
-    model = pickle.load(f)
+def load_serving_state():
+    """
+    Load the production model and build the serving helpers (idempotent).
+
+    Runs at application startup, so importing this module stays cheap
+    and free of model loading; the pre-fork launcher calls it in the
+    parent before forking workers.
+    """
+
+    global registry, batcher, scoring_executor
+
+    if registry is not None:
+        return
+
+    # Load the model once through the production pointer;
+    # promotions and rollbacks are picked up by the registry's
+    # background watcher (hot reload)
+    registry = ModelRegistry(
+        poll_seconds=config["model_reload"]["poll_seconds"],
+        warm_up_pipeline=config["model_reload"]["warm_up_pipeline"],
+    )
+
+    # Optional dynamic batching of concurrent single-row requests
+    if config["batching"]["enabled"]:
+        batcher = MicroBatcher(
+            registry.active.scoring_model,
+            max_batch_size=config["batching"]["max_batch_size"],
+            max_wait_ms=config["batching"]["max_wait_ms"],
+        )
+
+    # Async serving: /predict on the event loop, scoring on a bounded executor
+    if SERVING["mode"] == "async":
+        scoring_executor = ScoringExecutor(
+            kind=SERVING["executor"],
+            workers=SERVING["workers"],
+            max_queue=SERVING["max_queue"],
+            predict_proba=batcher.predict_proba if batcher is not None else None,
+        )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    load_serving_state()
+
+    if batcher is not None:
+        batcher.start()
+
+    if config["model_reload"]["enabled"]:
+        registry.start()
+
+    if scoring_executor is not None:
+        # The event loop must not block on log file writes
+        enable_background_logging()
+        scoring_executor.start(registry.active.model_dir)
+
+    yield
+
+    registry.stop()
+
+    if scoring_executor is not None:
+        scoring_executor.stop()
+
+    if batcher is not None:
+        batcher.stop()
+
+    # Drain buffered prediction logs before the worker exits
+    get_prediction_writer().close()
+
+
+app = FastAPI(title="Churn Prediction API", lifespan=lifespan)
+
+# Request counts and end-to-end latency per endpoint, for /metrics
+app.add_middleware(
+    MetricsMiddleware,
+    endpoints=["/", "/predict", "/predict/batch", "/predict/batch/compact", "/predict/batch/stream", "/metrics"],
+)
 
 THRESHOLD = config["inference"]["threshold"]    
+# Label children bound once; .labels() costs more than the observation itself
+STAGE = {
+    stage: STAGE_SECONDS.labels(stage=stage)
+    for stage in ("parse", "build_features", "validate", "predict", "store")
+}
+PREDICT_COMPILED = PREDICTIONS.labels(endpoint="/predict", path="compiled")
+PREDICT_PIPELINE = PREDICTIONS.labels(endpoint="/predict", path="pipeline")
+PREDICT_INVALID = VALIDATION_FAILURES.labels(endpoint="/predict")
+
+RETRY_AFTER_SECONDS = SERVING["retry_after_seconds"]
+
+MAX_BATCH_RECORDS = config["batch"]["max_records"]
+STREAM_CHUNK_SIZE = config["batch"]["stream_chunk_size"]
+STREAM_SPOOL_BYTES = config["batch"]["stream_spool_bytes"]
 
 @app.get("/")
 def health_check():
-    return {"status" : "ok", "message" : "Churn model is running"}
+    health = {
+        "status" : "ok",
+        "message" : "Churn model is running",
+        "model" : registry.active.info(),
+        "prediction_log" : get_prediction_writer().metrics(),
+    }
+
+    if scoring_executor is not None:
+        health["scoring"] = scoring_executor.metrics()
 
-@app.post("/predict")
-def predict(payload: RequestModel):
+    return health
+
+@app.get("/metrics")
+def metrics():
     """
-    
-    Accepts raw feature dictionary and returns churn probability
-    
+
+    Prometheus text exposition of the API metrics.
+
     """
-    start_time = time.time()
-    logger.info("Received prediction request")
-    
+    # Info gauge: only the version serving now
+    MODEL_INFO.clear()
+    MODEL_INFO.labels(version=registry.active.version).set(1)
+
+    if scoring_executor is not None:
+        SCORING_IN_FLIGHT.set(scoring_executor.in_flight)
+
+    return Response(METRICS.expose(), media_type=METRICS_CONTENT_TYPE)
+
+
+def parse_request(active, payload: Dict[str, Any]) -> dict:
+    """
+    Validate a /predict body against the active model's request model.
+    """
+
+    # Validated here rather than in the signature: the schema follows the active model
     try:
-        df = pd.DataFrame([payload.model_dump()])
-        df = build_features(df,training=False)
-        df_valid = validate_inference_data(df)
-    except Exception as e:
-        logger.error(f'Validation failed: {e}')
-        raise HTTPException(status_code=400, detail=str(e))
-    
+        return active.request_model.model_validate(payload).model_dump()
+    except ValidationError as e:
+        PREDICT_INVALID.inc()
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in e.errors()]
+        )
+
+
+def stage_error(e: StageError) -> HTTPException:
+    if e.stage == "validate":
+        PREDICT_INVALID.inc()
+        logger.error(f'Validation failed: {e.message}')
+        return HTTPException(status_code=400, detail=e.message)
+
+    ERRORS.labels(stage=e.stage).inc()
+    logger.error(f"Prediction failed: {e.message}")
+    return HTTPException(status_code=500, detail = "Prediction failed")
+
+
+def finish_prediction(active, record: dict, scored: tuple, start_time: float) -> dict:
+    """
+    Record stage metrics, queue the prediction log and build the response.
+    """
+
+    prob, compiled, timings = scored
+
+    for stage, seconds in timings.items():
+        STAGE[stage].observe(seconds)
+
+    stage_start = time.perf_counter()
+
     try:
-        prob = model.predict_proba(df_valid)[:,1][0]
         prediction = int(prob >= THRESHOLD)
-        store_prediction(payload.model_dump(), prob, prediction)
+        store_prediction(record, prob, prediction)
     except Exception as e:
+        ERRORS.labels(stage="store").inc()
         logger.error(f"Prediction failed: {e}")
         raise HTTPException(status_code=500, detail = "Prediction failed")
-    
-    latency = time.time() - start_time
-    logger.info(f"Inference dataframe shape: {df.shape}")
+
+    now = time.perf_counter()
+    STAGE["store"].observe(now - stage_start)
+
+    (PREDICT_COMPILED if compiled else PREDICT_PIPELINE).inc()
+    PROBABILITY.observe(prob)
+
+    latency = now - start_time
     logger.info(
         f"Prediction made | prob = {prob:.4f} | pred = {prediction} | latency = {latency:.4f}s"
     )
@@ -73,5 +239,303 @@ def predict(payload: RequestModel):
             "churn_probability" : round(float(prob), 4),
             "prediction" : prediction,
             "threshold" : THRESHOLD,
+            "model_version" : active.version,
             "latency_seconds" : round(latency,4)
-        }
\ No newline at end of file
+        }
+
+
+def predict(payload: Dict[str, Any]):
+    """
+    
+    Accepts raw feature dictionary and returns churn probability
+    
+    """
+    start_time = time.perf_counter()
+    logger.info("Received prediction request")
+
+    # One model for the whole request, even if a hot reload swaps it meanwhile
+    active = registry.active
+
+    record = parse_request(active, payload)
+    STAGE["parse"].observe(time.perf_counter() - start_time)
+
+    try:
+        scored = score_record(active, record, batcher.predict_proba if batcher is not None else None)
+    except StageError as e:
+        raise stage_error(e)
+
+    return finish_prediction(active, record, scored, start_time)
+
+
+async def predict_async(payload: Dict[str, Any]):
+    """
+
+    Async serving mode of /predict: parsing, logging and metrics on
+    the event loop, scoring on the scoring executor.
+
+    Returns 503 with Retry-After when the executor is saturated.
+
+    """
+    start_time = time.perf_counter()
+    logger.info("Received prediction request")
+
+    active = registry.active
+
+    record = parse_request(active, payload)
+    STAGE["parse"].observe(time.perf_counter() - start_time)
+
+    try:
+        scored = await scoring_executor.score(active, record)
+    except ScoringQueueFull as e:
+        logger.warning(f"Prediction rejected: {e}")
+        raise HTTPException(
+            status_code=503,
+            detail="Scoring queue full",
+            headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+        )
+    except StageError as e:
+        raise stage_error(e)
+
+    return finish_prediction(active, record, scored, start_time)
+
+
+app.add_api_route(
+    "/predict",
+    predict_async if SERVING["mode"] == "async" else predict,
+    methods=["POST"],
+)
+
+# Request model the cached OpenAPI schema was built for
+_openapi_request_model = None
+
+
+def openapi() -> dict:
+    """
+    OpenAPI schema with the active model's request model as the /predict body.
+
+    /predict validates inside the handler, so FastAPI only sees a free-form
+    object; the body schema is replaced here and rebuilt after a hot reload.
+    """
+
+    global _openapi_request_model
+
+    request_model = registry.active.request_model if registry is not None else None
+
+    if app.openapi_schema is not None and request_model is _openapi_request_model:
+        return app.openapi_schema
+
+    app.openapi_schema = None
+    schema = FastAPI.openapi(app)
+
+    if request_model is not None:
+        body = request_model.model_json_schema(ref_template="#/components/schemas/{model}")
+        components = schema.setdefault("components", {}).setdefault("schemas", {})
+        components.update(body.pop("$defs", {}))
+        components[body["title"]] = body
+
+        schema["paths"]["/predict"]["post"]["requestBody"] = {
+            "content": {
+                "application/json": {"schema": {"$ref": f"#/components/schemas/{body['title']}"}}
+            },
+            "required": True,
+        }
+
+    _openapi_request_model = request_model
+
+    return schema
+
+
+app.openapi = openapi
+
+
+def run_batch(active, records: list, offset: int = 0, endpoint: str = "/predict/batch", compact: bool = False):
+    """
+    Score a list of raw records with one serving model
+    and log the successful predictions.
+
+    `compact` records are arrays of feature values in schema order.
+    """
+
+    results, payloads, probs, preds = score_records(
+        active.scoring_model,
+        records,
+        active.request_model,
+        THRESHOLD,
+        active.validation_plan,
+        row_model=active.row_model if compact else None,
+    )
+
+    path = "ensemble" if isinstance(active.scoring_model, EnsemblePipeline) else "pipeline"
+    PREDICTIONS.labels(endpoint=endpoint, path=path).inc(len(probs))
+    VALIDATION_FAILURES.labels(endpoint=endpoint).inc(len(results) - len(probs))
+
+    for prob in probs:
+        PROBABILITY.observe(prob)
+
+    try:
+        store_predictions(payloads, probs, preds)
+    except Exception as e:
+        ERRORS.labels(stage="store").inc()
+        logger.error(f"Batch prediction logging failed: {e}")
+
+    if offset:
+        for result in results:
+            result["index"] += offset
+
+    return results
+
+
+def batch_response(active, records: list, endpoint: str, compact: bool = False) -> dict:
+    """
+    Score a whole batch request and build the /predict/batch response.
+    """
+
+    start_time = time.perf_counter()
+
+    if len(records) > MAX_BATCH_RECORDS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {len(records)} > {MAX_BATCH_RECORDS} records",
+        )
+
+    logger.info(f"Received batch prediction request | records = {len(records)}")
+
+    results = run_batch(active, records, endpoint=endpoint, compact=compact)
+
+    failed = sum(1 for r in results if "error" in r)
+    latency = time.perf_counter() - start_time
+
+    logger.info(
+        f"Batch prediction made | records = {len(records)} | failed = {failed} | latency = {latency:.4f}s"
+    )
+
+    return {
+        "results": results,
+        "count": len(results),
+        "failed": failed,
+        "threshold": THRESHOLD,
+        "model_version": active.version,
+        "latency_seconds": round(latency, 4),
+    }
+
+
+@app.post("/predict/batch")
+def predict_batch(records: List[Any]):
+    """
+
+    Accepts a list of raw feature dictionaries and returns
+    churn probabilities in input order.
+
+    Invalid records are reported per record instead of
+    failing the whole batch.
+
+    """
+    return batch_response(registry.active, records, "/predict/batch")
+
+
+class CompactBatch(BaseModel):
+    columns: List[str]
+    rows: List[Any]
+
+
+@app.post("/predict/batch/compact")
+def predict_batch_compact(batch: CompactBatch):
+    """
+
+    /predict/batch for high-volume callers: the feature names
+    once in `columns`, then one array of values per record.
+
+    `columns` must equal the active model's feature schema,
+    so a hot reload cannot silently shift values between features.
+
+    """
+    active = registry.active
+
+    if batch.columns != active.feature_schema:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "message": "columns do not match the model's feature schema",
+                "model_version": active.version,
+                "expected_columns": active.feature_schema,
+            },
+        )
+
+    return batch_response(active, batch.rows, "/predict/batch/compact", compact=True)
+
+
+def parse_ndjson_line(line: bytes):
+    """
+    Decode one NDJSON line, returning the raw text on failure
+    so the record can be reported as invalid.
+    """
+
+    try:
+        return json.loads(line)
+    except ValueError:
+        return line.decode("utf-8", errors="replace")
+
+
+@app.post("/predict/batch/stream")
+async def predict_batch_stream(request: Request):
+    """
+
+    Streaming variant of /predict/batch.
+
+    Reads newline-delimited JSON records, scores them in chunks
+    and streams one JSON result per line in input order.
+
+    """
+    logger.info("Received streaming batch prediction request")
+
+    # The whole stream is scored by the model active when it started
+    active = registry.active
+
+    # The body is spooled before responding: the response stream
+    # and the request stream cannot both consume the ASGI receive channel.
+    body = tempfile.SpooledTemporaryFile(max_size=STREAM_SPOOL_BYTES)
+
+    async for data in request.stream():
+        body.write(data)
+
+    body.seek(0)
+
+    def read_chunks():
+        chunk = []
+
+        for line in body:
+            if line.strip():
+                chunk.append(parse_ndjson_line(line))
+
+            if len(chunk) >= STREAM_CHUNK_SIZE:
+                yield chunk
+                chunk = []
+
+        if chunk:
+            yield chunk
+
+    async def score_stream():
+        offset = 0
+        chunks = read_chunks()
+
+        try:
+            while True:
+                chunk = await run_in_threadpool(next, chunks, None)
+
+                if chunk is None:
+                    break
+
+                results = await run_in_threadpool(run_batch, active, chunk, offset, "/predict/batch/stream")
+                offset += len(chunk)
+
+                yield "".join(json.dumps(r) + "\n" for r in results)
+        finally:
+            body.close()
+
+        logger.info(f"Streaming batch prediction completed | records = {offset}")
+
+    return StreamingResponse(
+        score_stream(),
+        media_type="application/x-ndjson",
+        headers={"X-Model-Version": active.version},
+    )
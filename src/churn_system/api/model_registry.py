@@ -0,0 +1,278 @@
+"""
+Model Registry Handle
+
+Keeps the API serving whatever model the production pointer names
+(see lifecycle/registry.py), without a process restart.
+
+A background thread polls the pointer and the model files. When a
+promotion or rollback changes them, the new model and its contract
+are loaded off the request path, checked against the promoted digest
+and a warm-up prediction, and swapped in with a single reference
+assignment.
+
+Request handlers read `registry.active` once and use that
+ServingModel for the whole request, so in-flight requests finish on
+the model they started with while new ones use the new model.
+"""
+
+import json
+import math
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from churn_system.api.schema_generator import generate_request_model, generate_row_model
+from churn_system.config.config import CONFIG
+from churn_system.features.build_features import build_features
+from churn_system.inference.compiled_scorer import load_compiled_scorer
+from churn_system.inference.model_artifact import LazyPipeline, MANIFEST_FILE, PIPELINE_FILE
+from churn_system.inference.model_contract import set_model_contract
+from churn_system.inference.tree_ensemble import EnsemblePipeline, load_tree_ensemble
+from churn_system.inference.validation_plan import load_validation_plan
+from churn_system.lifecycle.registry import read_pointer, resolve_production_dir, verify_production
+from churn_system.logging.logger import get_logger
+
+logger = get_logger(__name__, CONFIG["logging"]["api"])
+
+METADATA_FILE = "metadata.json"
+
+# Files whose change means a new model was put in place
+WATCHED_FILES = [METADATA_FILE, PIPELINE_FILE, MANIFEST_FILE]
+
+
+def model_fingerprint(model_dir: Path) -> tuple:
+    """
+    Cheap change detector: (name, size, mtime) of the watched files.
+    """
+
+    fingerprint = []
+
+    for name in WATCHED_FILES:
+        try:
+            stat = (Path(model_dir) / name).stat()
+            fingerprint.append((name, stat.st_size, stat.st_mtime_ns))
+        except FileNotFoundError:
+            fingerprint.append((name, None, None))
+
+    return tuple(fingerprint)
+
+
+def production_fingerprint() -> tuple:
+    """
+    Pointer content plus the files of the model it resolves to.
+    """
+
+    pointer = read_pointer()
+    model_dir = resolve_production_dir()
+
+    return (
+        json.dumps(pointer, sort_keys=True) if pointer is not None else None,
+        model_fingerprint(model_dir),
+    )
+
+
+class ServingModel:
+    """
+    Everything needed to score with one model version:
+    contract, request model, pipeline and compiled fast paths.
+    """
+
+    def __init__(self, model_dir: Path):
+        self.model_dir = Path(model_dir)
+
+        # Set by the registry: production state this model was loaded for
+        self.fingerprint = None
+
+        with open(self.model_dir / METADATA_FILE, "r") as f:
+            self.contract = json.load(f)
+
+        self.version = str(self.contract.get("model_version", "unknown"))
+        self.feature_schema = self.contract["feature_schema"]
+
+        # Column order, dtypes and training ranges, compiled once per version
+        self.validation_plan = load_validation_plan(self.model_dir, self.feature_schema)
+
+        # Request validators typed from the plan: dict records and value arrays
+        self.request_model = generate_request_model(self.feature_schema, self.validation_plan)
+        self.row_model = generate_row_model(self.feature_schema, self.validation_plan)
+        self.loaded_at = time.time()
+
+        # Checksum-verified against manifest.json when training recorded one,
+        # unpickled only once a request needs the sklearn pipeline
+        self.pipeline = LazyPipeline(self.model_dir)
+
+        # NumPy-only fast path for single-row scoring (None → pipeline only).
+        # Its arrays are memory-mapped: workers share one page-cached copy
+        self.compiled_scorer = load_compiled_scorer(self.model_dir)
+
+        # Packed tree ensemble for DataFrame scoring (non-tree models → pipeline)
+        if self.compiled_scorer is not None:
+            tree_ensemble = self.compiled_scorer.ensemble
+        else:
+            tree_ensemble = load_tree_ensemble(self.model_dir)
+
+        self.scoring_model = (
+            self.pipeline if tree_ensemble is None
+            else EnsemblePipeline(self.pipeline, tree_ensemble)
+        )
+
+    def predict_frame(self, df: pd.DataFrame):
+        """
+        Build features, validate against this model's schema and score.
+        """
+
+        df = build_features(df, training=False)
+        return self.scoring_model.predict_proba(self.validation_plan.select(df))
+
+    def warm_up(self, record: dict | None, pipeline: bool = True):
+        """
+        Score one record through the compiled path /predict uses and
+        (with `pipeline`) through the pipeline path of batches and
+        fallbacks, and check the results.
+
+        The pipeline pass unpickles model.pkl here, off the request
+        path, instead of on the first batch request.
+
+        Raises
+        ------
+        ValueError
+            If a probability is not a finite number in [0, 1].
+        """
+
+        if record is None:
+            logger.warning(f"No warm-up record; model {self.version} not warmed up")
+            return
+
+        probs = []
+
+        if self.compiled_scorer is not None:
+            probs.append(self.compiled_scorer.score_record(record))
+
+        # /predict falls back to the pipeline when the compiled scorer cannot score
+        if pipeline or probs in ([], [None]):
+            probs.append(self.predict_frame(pd.DataFrame([record]))[:, 1][0])
+
+        for prob in probs:
+            if prob is not None and not (math.isfinite(prob) and 0.0 <= prob <= 1.0):
+                raise ValueError(f"Warm-up prediction out of range: {prob}")
+
+    def info(self) -> dict:
+        return {
+            "model_version": self.version,
+            "loaded_at": self.loaded_at,
+            "compiled_scorer": self.compiled_scorer is not None,
+        }
+
+
+def warm_up_record(feature_schema: list) -> dict | None:
+    """
+    First row of the training reference, restricted to the model features.
+    """
+
+    path = Path(CONFIG["paths"]["training_reference"])
+
+    if not path.exists():
+        return None
+
+    row = pd.read_csv(path, nrows=1)
+    row = row[[c for c in feature_schema if c in row.columns]]
+
+    return row.to_dict(orient="records")[0]
+
+
+class ModelRegistry:
+    """
+    Handle on the production model with background hot reload.
+    """
+
+    def __init__(self, poll_seconds: float = 5.0, warm_up_pipeline: bool = True):
+        self.poll_seconds = poll_seconds
+        self.warm_up_pipeline = warm_up_pipeline
+
+        self._failed_fingerprint = None
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+        # The first model is loaded synchronously: the API cannot serve without it
+        self.active = self._load(production_fingerprint())
+        set_model_contract(self.active.contract, self.active.model_dir)
+
+    def _load(self, fingerprint: tuple) -> ServingModel:
+        # Raises if the promoted experiment changed since promotion
+        model_dir = verify_production()
+
+        serving = ServingModel(model_dir)
+        serving.fingerprint = fingerprint
+        serving.warm_up(warm_up_record(serving.feature_schema), pipeline=self.warm_up_pipeline)
+
+        logger.info(f"Model {serving.version} loaded from {model_dir}")
+
+        return serving
+
+    def reload_if_changed(self) -> bool:
+        """
+        Load and swap in the production model if the pointer or its files changed.
+
+        A model that fails to load or warm up is logged and skipped;
+        the active model keeps serving, and the files are retried once
+        they change again (e.g. a copy in progress completes).
+
+        Returns
+        -------
+        bool
+            True when a new model was swapped in.
+        """
+
+        with self._reload_lock:
+            fingerprint = production_fingerprint()
+
+            if fingerprint in (self.active.fingerprint, self._failed_fingerprint):
+                return False
+
+            try:
+                serving = self._load(fingerprint)
+            except Exception as e:
+                self._failed_fingerprint = fingerprint
+                logger.error(f"Hot reload failed, keeping model {self.active.version}: {e}")
+                return False
+
+            previous = self.active
+
+            # Single reference swap: requests already holding `previous` finish on it
+            self.active = serving
+            set_model_contract(serving.contract, serving.model_dir)
+
+            logger.info(f"Hot reload | {previous.version} -> {serving.version}")
+
+            return True
+
+    def start(self):
+        """
+        Start the background watcher (idempotent).
+        """
+
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="model-registry", daemon=True)
+        self._thread.start()
+
+        logger.info(f"Model registry polling production every {self.poll_seconds}s")
+
+    def stop(self):
+        self._stop.set()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_seconds):
+            try:
+                self.reload_if_changed()
+            except Exception as e:
+                logger.error(f"Model registry poll failed: {e}")
@@ -3,24 +3,42 @@ Automatic API Schema Generator
 
 Builds FastAPI request schema dynamically
 from production model metadata.
+
+With a model's validation plan (inference/validation_plan.py) the
+request model is typed from training statistics:
+
+- numeric features → int / float (Optional when training had nulls)
+- categorical features → str; Literal enums of the training categories
+  (at most `request_model.max_enum_categories`) only when
+  `validation.unknown_categories` is "reject", since unseen categories
+  are otherwise scored like the encoders score them
+- raw columns dropped by build_features (CustomerID, Churn Score, ...)
+  → optional, default None, excluded from the validated payload
+
+so type problems are rejected by pydantic-core with per-field errors
+instead of surfacing later in pandas or sklearn. Without a plan every
+feature is accepted as Any.
+
+`generate_row_model` builds the matching validator for the compact
+encoding: one array of values per record, in feature order.
 """
 
 
-from pathlib import Path
-from pydantic import create_model
-from typing import Dict, Any
+from pydantic import Field, TypeAdapter, create_model
+from typing import Dict, Any, Literal, Optional, Tuple
 
 from churn_system.config.config import CONFIG
+from churn_system.features.build_features import DROP_COLUMNS, ZERO_FILLED_COLUMNS
+from churn_system.lifecycle.registry import resolve_production_dir
+
+REQUEST_MODEL_CONFIG = CONFIG["request_model"]
 
 def load_feature_schema():
     """
     Load feature schema from production metadata.
     """
 
-    metadata_path = (
-        Path(CONFIG["paths"]["production_model"])
-        .parent / "metadata.json"
-    )
+    metadata_path = resolve_production_dir() / "metadata.json"
 
     if not metadata_path.exists():
         raise FileNotFoundError(
@@ -35,22 +53,76 @@ def load_feature_schema():
     return metadata["feature_schema"]
 
 
-def generate_request_model():
+def feature_types(features: list, plan=None) -> list:
+    """
+    Python type of every feature, in feature order.
+    """
+
+    if plan is None or not REQUEST_MODEL_CONFIG["typed"]:
+        return [Any] * len(features)
+
+    max_enum = REQUEST_MODEL_CONFIG["max_enum_categories"]
+    types = []
+
+    for feature in features:
+
+        # Blank or textual values are zero-filled by build_features
+        if feature in ZERO_FILLED_COLUMNS:
+            types.append(Any)
+
+        elif feature in plan.numeric:
+            spec = plan.numeric[feature]
+            kind = int if spec["dtype"].startswith(("int", "uint")) else float
+            types.append(Optional[kind] if spec["nullable"] else kind)
+
+        elif feature in plan.categorical:
+            categories = plan.categorical[feature]["categories"]
+
+            if plan.reject_unknown and categories and len(categories) <= max_enum:
+                types.append(Literal[tuple(categories)])
+            else:
+                types.append(str)
+
+        else:
+            types.append(Any)
+
+    return types
+
+
+def generate_request_model(features: list | None = None, plan=None):
     """
     Dynamically create Pydantic request model.
+
+    Uses the production feature schema unless `features` is given
+    (e.g. the schema of a model being hot-reloaded). Features are
+    typed from `plan` (a ValidationPlan) when one is given.
     """
 
-    features = load_feature_schema()
+    if features is None:
+        features = load_feature_schema()
 
     fields: Dict[str, tuple] = {}
 
-    # Default → accept any type (safe starting point)
-    for feature in features:
-        fields[feature] = (Any, ...)
+    for feature, kind in zip(features, feature_types(features, plan)):
+        fields[feature] = (kind, ...)
+
+    # Full raw records validate too; the dropped columns never reach the model
+    for column in DROP_COLUMNS:
+        if column not in fields:
+            fields[column] = (Any, Field(default=None, exclude=True))
 
     RequestModel = create_model(
         "DynamicPredictionRequest",
         **fields
     )
 
-    return RequestModel
\ No newline at end of file
+    return RequestModel
+
+
+def generate_row_model(features: list, plan=None) -> TypeAdapter:
+    """
+    Validator for one array-encoded record: the feature values in
+    `features` order, typed like the request model.
+    """
+
+    return TypeAdapter(Tuple[tuple(feature_types(features, plan))])
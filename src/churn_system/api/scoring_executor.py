@@ -0,0 +1,265 @@
+"""
+Scoring Executor
+
+Runs model scoring for the async serving mode (`serving.mode: async`)
+on a dedicated pool, off the event loop:
+
+- thread  : worker threads score with the ServingModel the request
+            holds; NumPy and sklearn release the GIL in their inner loops
+- process : worker processes load each model version themselves
+            (memory-mapped arrays, so the pages are shared) and receive
+            only the validated record
+
+The pool admits at most `workers + max_queue` jobs. Requests beyond
+that raise ScoringQueueFull, which the API turns into a 503 with
+Retry-After, so an overloaded worker sheds load instead of letting
+queueing delay grow without bound.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pandas as pd
+
+from churn_system.config.config import CONFIG
+from churn_system.features.build_features import build_features
+from churn_system.logging.logger import get_logger
+
+logger = get_logger(__name__, CONFIG["logging"]["api"])
+
+
+class ScoringQueueFull(Exception):
+    """
+    Raised when the scoring pool has no free slot for another job.
+    """
+
+
+class StageError(Exception):
+    """
+    Scoring failure in a named stage ("validate" or "predict").
+
+    Plain string arguments, so it survives the trip back from a
+    worker process.
+    """
+
+    def __init__(self, stage: str, message: str):
+        super().__init__(stage, message)
+        self.stage = stage
+        self.message = message
+
+
+# ---------- scoring ----------
+
+def score_record(active, record: dict, predict_proba=None) -> tuple:
+    """
+    Score one validated request record the way /predict does:
+    compiled fast path first, then the sklearn pipeline.
+
+    Parameters
+    ----------
+    active : ServingModel
+    record : dict
+        Output of the model's request model.
+    predict_proba : callable, optional
+        Replaces `active.scoring_model.predict_proba(df)` on the
+        pipeline path (e.g. the micro-batcher).
+
+    Returns
+    -------
+    tuple
+        (probability, compiled, timings) where timings maps each
+        stage run to its duration in seconds.
+
+    Raises
+    ------
+    StageError
+        If feature building / validation or prediction fails.
+    """
+
+    stage_start = time.perf_counter()
+    timings = {}
+
+    if active.compiled_scorer is not None:
+        # The compiled path builds no frame: the plan's opt-in rejections
+        # are checked here, so /predict agrees with /predict/batch
+        error = active.validation_plan.record_error(record)
+
+        if error is not None:
+            raise StageError("validate", f"Invalid inference data: {error}")
+
+        prob = active.compiled_scorer.score_record(record)
+
+        if prob is not None:
+            timings["predict"] = time.perf_counter() - stage_start
+            return prob, True, timings
+
+    try:
+        df = build_features(pd.DataFrame([record]), training=False)
+
+        now = time.perf_counter()
+        timings["build_features"] = now - stage_start
+        stage_start = now
+
+        df_valid = active.validation_plan.select(df)
+
+        now = time.perf_counter()
+        timings["validate"] = now - stage_start
+        stage_start = now
+    except Exception as e:
+        raise StageError("validate", str(e))
+
+    try:
+        if predict_proba is not None:
+            prob = predict_proba(df_valid, model=active.scoring_model)[:, 1][0]
+        else:
+            prob = active.scoring_model.predict_proba(df_valid)[:, 1][0]
+    except Exception as e:
+        raise StageError("predict", str(e))
+
+    timings["predict"] = time.perf_counter() - stage_start
+
+    return float(prob), False, timings
+
+
+# ---------- process workers ----------
+
+# The model this worker process last scored with
+_worker_model = None
+
+
+def _worker_serving_model(model_dir: str):
+    global _worker_model
+
+    if _worker_model is None or str(_worker_model.model_dir) != model_dir:
+        # Imported here: the API module graph is not needed in workers
+        from churn_system.api.model_registry import ServingModel
+
+        _worker_model = ServingModel(model_dir)
+
+    return _worker_model
+
+
+def _init_worker(model_dir: str):
+    _worker_serving_model(model_dir)
+
+
+def _score_in_worker(model_dir: str, record: dict) -> tuple:
+    return score_record(_worker_serving_model(model_dir), record)
+
+
+# ---------- executor ----------
+
+class ScoringExecutor:
+    """
+    Bounded scoring pool awaited from the event loop.
+
+    Parameters
+    ----------
+    kind : str
+        "thread" or "process".
+    workers : int, optional
+        Pool size; None → CPU count.
+    max_queue : int
+        Jobs allowed to wait for a free worker before new ones are rejected.
+    predict_proba : callable, optional
+        Pipeline-path override for thread workers (the micro-batcher).
+    """
+
+    def __init__(self, kind: str = "thread", workers: int | None = None, max_queue: int = 64, predict_proba=None):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown scoring executor: {kind}")
+
+        self.kind = kind
+        self.workers = workers or os.cpu_count() or 1
+        self.capacity = self.workers + max_queue
+        self.predict_proba = predict_proba
+
+        self.in_flight = 0
+        self.rejected = 0
+
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def start(self, model_dir=None):
+        """
+        Create the pool (idempotent). Process workers are started and
+        load `model_dir` now rather than on the first request.
+        """
+
+        if self._pool is not None:
+            return
+
+        if self.kind == "thread":
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="scoring")
+        else:
+            # spawn: the API process runs threads (reload watcher, log writer) that fork would copy mid-state
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(str(model_dir),),
+            )
+            self._pool.submit(int).result()
+
+        logger.info(
+            f"Scoring executor started | kind = {self.kind} | workers = {self.workers} "
+            f"| capacity = {self.capacity}"
+        )
+
+    def stop(self):
+        """
+        Finish running jobs and shut the pool down.
+        """
+
+        pool, self._pool = self._pool, None
+
+        if pool is not None:
+            pool.shutdown(wait=True)
+            logger.info(f"Scoring executor stopped | rejected = {self.rejected}")
+
+    async def score(self, active, record: dict) -> tuple:
+        """
+        Score a record on the pool; see `score_record` for the result.
+
+        Raises
+        ------
+        ScoringQueueFull
+            If `capacity` jobs are already running or waiting.
+        """
+
+        if self._pool is None:
+            self.start(active.model_dir)
+
+        with self._lock:
+            if self.in_flight >= self.capacity:
+                self.rejected += 1
+                raise ScoringQueueFull(f"{self.in_flight} scoring jobs in flight")
+
+            self.in_flight += 1
+
+        if self.kind == "thread":
+            future = self._pool.submit(score_record, active, record, self.predict_proba)
+        else:
+            future = self._pool.submit(_score_in_worker, str(active.model_dir), record)
+
+        # Released when the job finishes, even if the client has gone away
+        future.add_done_callback(self._release)
+
+        return await asyncio.wrap_future(future)
+
+    def _release(self, future):
+        with self._lock:
+            self.in_flight -= 1
+
+    def metrics(self) -> dict:
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "capacity": self.capacity,
+            "in_flight": self.in_flight,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,240 @@
+"""
+Pre-Fork API Launcher
+
+Serves the API with several worker processes that share one loaded model.
+
+`uvicorn --workers N` spawns N fresh interpreters, and each of them
+imports pandas and sklearn, unpickles the model and opens its own log
+files. This launcher instead:
+
+1. caps the numeric libraries at `threads_per_process` threads
+   (environment set before NumPy is imported, threadpoolctl in each
+   worker), so N workers do not start N x CPU BLAS/OpenMP threads
+2. imports the API once in the parent: model, contract, compiled
+   scorer and (with preload) the sklearn pipeline are loaded here
+3. freezes the garbage collector's view of those objects and forks
+   the workers, which share the loaded pages copy-on-write
+4. writes every worker's log records from the parent, over one queue,
+   so log files are never appended to or rotated concurrently
+5. restarts workers that die, and stops them all on SIGINT / SIGTERM
+
+All workers accept connections from one listening socket.
+
+Usage:
+    python -m churn_system.api.serve --processes 4 --port 8000
+"""
+
+import argparse
+import os
+import signal
+import socket
+import time
+
+from churn_system.config.config import CONFIG
+
+SERVING = CONFIG["serving"]
+
+# Numeric libraries read these when they are first imported
+THREAD_ENV_VARS = [
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+]
+
+
+def threads_per_process(processes: int, threads: int | None = None) -> int:
+    """
+    Numeric library threads per worker: an even share of the CPUs unless set.
+    """
+
+    if threads:
+        return threads
+
+    return max(1, (os.cpu_count() or 1) // processes)
+
+
+def limit_threads(threads: int):
+    """
+    Set the thread caps for libraries not imported yet.
+    """
+
+    for name in THREAD_ENV_VARS:
+        os.environ[name] = str(threads)
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    """
+    Listening socket shared by all workers.
+
+    Created with an explicit IPPROTO_TCP: asyncio only sets TCP_NODELAY
+    on accepted connections when the listener declares TCP, and without
+    it Nagle's algorithm halves single-worker throughput.
+    """
+
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+
+    sock = socket.socket(family, socket.SOCK_STREAM, socket.IPPROTO_TCP)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.set_inheritable(True)
+
+    return sock
+
+
+def _run_worker(config, sock, threads: int):
+    from threadpoolctl import threadpool_limits
+
+    # Covers thread pools created before the environment was set
+    threadpool_limits(limits=threads)
+
+    import uvicorn
+
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+class PreforkServer:
+    """
+    Parent process: loads the app, forks and supervises the workers.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        processes: int,
+        threads: int,
+        preload_pipeline: bool = True,
+    ):
+        self.host = host
+        self.port = port
+        self.processes = processes
+        self.threads = threads
+        self.preload_pipeline = preload_pipeline
+
+        self.workers = []
+        self._stopping = False
+
+    def load(self):
+        """
+        Import and warm up the API in the parent, before any fork.
+        """
+
+        import gc
+        import multiprocessing
+
+        import uvicorn
+
+        from churn_system.api import api
+        from churn_system.logging.logger import enable_background_logging, get_logger
+
+        self.logger = get_logger(__name__, CONFIG["logging"]["api"])
+        self.context = multiprocessing.get_context("fork")
+
+        # With preload the warm-up unpickles the pipeline here, shared by every worker;
+        # without it, workers unpickle it on demand
+        api.config["model_reload"]["warm_up_pipeline"] = self.preload_pipeline
+        api.load_serving_state()
+
+        # Workers inherit loggers that forward to this process
+        enable_background_logging(log_queue=self.context.Queue())
+
+        self.config = uvicorn.Config(api.app, host=self.host, port=self.port, log_level="warning")
+        self.socket = bind_socket(self.host, self.port)
+
+        # Objects loaded so far are never collected: the collector's
+        # bookkeeping writes would otherwise copy their pages in every worker
+        gc.collect()
+        gc.freeze()
+
+        self.logger.info(
+            f"Pre-fork server loaded model {api.registry.active.version} | "
+            f"processes = {self.processes} | threads per process = {self.threads}"
+        )
+
+    def spawn(self):
+        worker = self.context.Process(
+            target=_run_worker,
+            args=(self.config, self.socket, self.threads),
+            name=f"api-worker-{len(self.workers)}",
+        )
+        worker.start()
+
+        self.logger.info(f"Worker {worker.pid} started")
+
+        return worker
+
+    def run(self):
+        self.load()
+
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+
+        self.workers = [self.spawn() for _ in range(self.processes)]
+
+        self.logger.info(f"Serving on http://{self.host}:{self.port}")
+
+        while not self._stopping:
+            for i, worker in enumerate(self.workers):
+                if not worker.is_alive() and not self._stopping:
+                    self.logger.error(f"Worker {worker.pid} exited with code {worker.exitcode}; restarting")
+                    self.workers[i] = self.spawn()
+
+            time.sleep(0.5)
+
+        self.stop()
+
+    def _handle_stop(self, signum, frame):
+        self._stopping = True
+
+    def stop(self, timeout: float = 30.0):
+        """
+        Ask every worker to shut down gracefully (uvicorn drains
+        requests and runs the lifespan shutdown), then wait.
+        """
+
+        for worker in self.workers:
+            if worker.is_alive():
+                os.kill(worker.pid, signal.SIGTERM)
+
+        deadline = time.monotonic() + timeout
+
+        for worker in self.workers:
+            worker.join(max(deadline - time.monotonic(), 0))
+
+            if worker.is_alive():
+                self.logger.warning(f"Worker {worker.pid} did not stop in time; killing")
+                worker.kill()
+                worker.join()
+
+        self.socket.close()
+        self.logger.info("Pre-fork server stopped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the churn API with pre-forked workers")
+    parser.add_argument("--host", type=str, default=SERVING["host"])
+    parser.add_argument("--port", type=int, default=SERVING["port"])
+    parser.add_argument("--processes", type=int, default=SERVING["processes"], help="default: CPU count")
+    parser.add_argument("--threads", type=int, default=SERVING["threads_per_process"], help="numeric library threads per worker")
+    parser.add_argument("--no-preload", action="store_true", help="let workers unpickle the pipeline on demand")
+    args = parser.parse_args()
+
+    processes = args.processes or os.cpu_count() or 1
+    threads = threads_per_process(processes, args.threads)
+
+    # Before anything imports NumPy
+    limit_threads(threads)
+
+    PreforkServer(
+        host=args.host,
+        port=args.port,
+        processes=processes,
+        threads=threads,
+        preload_pipeline=not args.no_preload,
+    ).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+In-Process ASGI Client
+
+Calls the FastAPI app directly through the ASGI interface: no server,
+no sockets and no HTTP client library, so benchmarks measure the
+application rather than the network stack.
+
+    with ASGIClient(app) as client:
+        response = client.post("/predict", json=record)
+
+The app's lifespan (model reload watcher, micro-batcher, prediction
+log writer) runs on entry and exit like under uvicorn. `arequest`
+can be awaited concurrently on the client's event loop to overlap
+requests the way a server would.
+"""
+
+import asyncio
+import json as jsonlib
+
+
+class ASGIResponse:
+    def __init__(self, status_code: int, headers: dict, content: bytes):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8")
+
+    def json(self):
+        return jsonlib.loads(self.content)
+
+
+class ASGIClient:
+    """
+    Minimal HTTP/1.1 caller for an ASGI application.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.loop = asyncio.new_event_loop()
+        self._lifespan = None
+
+    # ---------- lifespan ----------
+
+    def __enter__(self):
+        self._lifespan = self.app.router.lifespan_context(self.app)
+        self.loop.run_until_complete(self._lifespan.__aenter__())
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            self.loop.run_until_complete(self._lifespan.__aexit__(None, None, None))
+        finally:
+            self.loop.close()
+
+    # ---------- requests ----------
+
+    async def arequest(
+        self,
+        method: str,
+        path: str,
+        json=None,
+        content: bytes | None = None,
+        headers: dict | None = None,
+    ) -> ASGIResponse:
+        """
+        Send one request through the app and collect the full response.
+        """
+
+        if json is not None:
+            content = jsonlib.dumps(json).encode("utf-8")
+
+        content = content or b""
+
+        request_headers = {"content-type": "application/json", **(headers or {})}
+        request_headers["content-length"] = str(len(content))
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [(k.lower().encode(), v.encode()) for k, v in request_headers.items()],
+            "client": ("127.0.0.1", 0),
+            "server": ("testserver", 80),
+        }
+
+        sent_body = False
+        response_done = asyncio.Event()
+
+        async def receive():
+            nonlocal sent_body
+
+            if not sent_body:
+                sent_body = True
+                return {"type": "http.request", "body": content, "more_body": False}
+
+            # Streaming responses listen for a disconnect; only send it once done
+            await response_done.wait()
+            return {"type": "http.disconnect"}
+
+        status = None
+        response_headers = {}
+        body = []
+
+        async def send(message):
+            nonlocal status
+
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                response_headers.update(
+                    (k.decode("latin-1"), v.decode("latin-1")) for k, v in message.get("headers", [])
+                )
+
+            elif message["type"] == "http.response.body":
+                body.append(message.get("body", b""))
+
+                if not message.get("more_body", False):
+                    response_done.set()
+
+        await self.app(scope, receive, send)
+
+        return ASGIResponse(status, response_headers, b"".join(body))
+
+    def request(self, method: str, path: str, **kwargs) -> ASGIResponse:
+        return self.loop.run_until_complete(self.arequest(method, path, **kwargs))
+
+    def get(self, path: str, **kwargs) -> ASGIResponse:
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path: str, **kwargs) -> ASGIResponse:
+        return self.request("POST", path, **kwargs)
@@ -0,0 +1,98 @@
+"""
+Compiled Scorer Benchmark
+
+Per-row latency of the production model through the pandas/sklearn
+path used by /predict versus the compiled NumPy scorer, plus the
+largest probability difference between the two.
+
+Usage:
+    python -m churn_system.benchmarks.compiled_scorer_benchmark --rows 2000
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from churn_system.benchmarks.synthetic import make_telco_frame
+from churn_system.features.build_features import build_features
+from churn_system.inference.compiled_scorer import compile_pipeline, load_compiled_scorer
+from churn_system.inference.model_artifact import load_pipeline
+from churn_system.lifecycle.registry import resolve_production_dir
+from churn_system.schema import validate_inference_data
+
+
+def latencies(fn, records: list) -> np.ndarray:
+    timings = np.empty(len(records))
+
+    for i, record in enumerate(records):
+        start = time.perf_counter()
+        fn(record)
+        timings[i] = time.perf_counter() - start
+
+    return timings
+
+
+def summarize(timings: np.ndarray) -> dict:
+    return {
+        "p50_us": float(np.percentile(timings, 50) * 1e6),
+        "p99_us": float(np.percentile(timings, 99) * 1e6),
+        "mean_us": float(timings.mean() * 1e6),
+    }
+
+
+def run(rows: int) -> dict:
+    model_dir = resolve_production_dir()
+    model = load_pipeline(model_dir)
+
+    # Models exported without a scorer are compiled here (raises if unsupported)
+    scorer = load_compiled_scorer(model_dir) or compile_pipeline(model)
+
+    features = build_features(make_telco_frame(rows, seed=7))
+    records = features.to_dict(orient="records")
+
+    def pipeline_score(record):
+        df = build_features(pd.DataFrame([record]), training=False)
+        return model.predict_proba(validate_inference_data(df))[:, 1][0]
+
+    # Warm-up (imports, caches, first-call allocations)
+    for record in records[:20]:
+        pipeline_score(record)
+        scorer.score_record(record)
+
+    pipeline_timings = latencies(pipeline_score, records)
+    compiled_timings = latencies(scorer.score_record, records)
+
+    expected = model.predict_proba(features)[:, 1]
+    compiled = scorer.predict_records(records)
+
+    return {
+        "rows": rows,
+        "model": type(model.named_steps["model"]).__name__,
+        "pipeline": summarize(pipeline_timings),
+        "compiled": summarize(compiled_timings),
+        "p50_speedup": float(np.median(pipeline_timings) / np.median(compiled_timings)),
+        "fallback_rows": int(np.isnan(compiled).sum()),
+        "max_abs_difference": float(np.nanmax(np.abs(compiled - expected))),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compiled scorer latency benchmark")
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--output", type=str, default=None)
+    args = parser.parse_args()
+
+    results = run(args.rows)
+
+    print(json.dumps(results, indent=2))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Encoding Benchmark
+
+Encoded width, memory and fit time of the cardinality-based
+preprocessor (features/encoding.py) versus one-hot encoding every
+categorical column, on Telco-shaped data: for the preprocessor itself
+and for fitting each candidate model on its output.
+
+Usage:
+    python -m churn_system.benchmarks.encoding_benchmark --rows 20000
+"""
+
+import argparse
+import json
+import pickle
+import time
+import tracemalloc
+
+import scipy.sparse as sp
+from sklearn.compose import ColumnTransformer
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+from churn_system.benchmarks.synthetic import make_telco_frame
+from churn_system.features.build_features import build_features
+from churn_system.features.encoding import build_column_encoder, encoding_plan
+from churn_system.training.steps.model_training import build_candidates
+
+
+def onehot_preprocessor(X) -> ColumnTransformer:
+    """
+    The previous preprocessor: every categorical column one-hot encoded.
+    """
+
+    categorical_cols = X.select_dtypes(include=["object", "category"]).columns
+    numerical_cols = X.select_dtypes(exclude=["object", "category"]).columns
+
+    return ColumnTransformer(
+        transformers=[
+            ("num", StandardScaler(), numerical_cols),
+            ("cat", OneHotEncoder(handle_unknown="ignore"), categorical_cols),
+        ]
+    )
+
+
+def matrix_bytes(Xt) -> int:
+    if sp.issparse(Xt):
+        Xt = sp.csr_matrix(Xt)
+        return int(Xt.data.nbytes + Xt.indices.nbytes + Xt.indptr.nbytes)
+
+    return int(Xt.nbytes)
+
+
+def traced(fn):
+    """
+    Result, seconds and peak traced (Python/NumPy) memory of fn().
+    """
+
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    result = fn()
+
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, round(seconds, 3), round(peak / 2**20, 2)
+
+
+def measure(preprocessor, X, y, fit_models: bool) -> dict:
+    Xt, seconds, peak = traced(lambda: preprocessor.fit_transform(X))
+
+    results = {
+        "width": int(Xt.shape[1]),
+        "sparse": bool(sp.issparse(Xt)),
+        "matrix_mb": round(matrix_bytes(Xt) / 2**20, 2),
+        "peak_memory_mb": peak,
+        "preprocessor_kb": round(len(pickle.dumps(preprocessor)) / 2**10, 1),
+        "fit_transform_seconds": seconds,
+    }
+
+    if fit_models:
+        results["models"] = {}
+
+        for name, model in build_candidates().items():
+            _, seconds, peak = traced(lambda: model.fit(Xt, y))
+
+            results["models"][name] = {
+                "fit_seconds": seconds,
+                "peak_memory_mb": peak,
+                "model_kb": round(len(pickle.dumps(model)) / 2**10, 1),
+            }
+
+    return results
+
+
+def run(rows: int, fit_models: bool = True) -> dict:
+    df = make_telco_frame(rows, seed=11, categorical=True)
+    X, y = build_features(df), df["Churn Value"]
+
+    baseline = measure(onehot_preprocessor(X), X, y, fit_models)
+
+    preprocessor = build_column_encoder(X)
+    encoded = measure(preprocessor, X, y, fit_models)
+
+    plan = encoding_plan(preprocessor)
+
+    results = {
+        "rows": rows,
+        "strategies": {
+            col: spec["strategy"]
+            for col, spec in plan["columns"].items()
+            if spec["strategy"] != "scaled"
+        },
+        "onehot": baseline,
+        "encoded": encoded,
+        "width_reduction": round(baseline["width"] / encoded["width"], 1),
+        "matrix_memory_reduction": round(baseline["matrix_mb"] / max(encoded["matrix_mb"], 1e-9), 1),
+        "preprocessor_size_reduction": round(baseline["preprocessor_kb"] / encoded["preprocessor_kb"], 1),
+    }
+
+    if fit_models:
+        results["fit_speedup"] = {
+            name: round(baseline["models"][name]["fit_seconds"] / stats["fit_seconds"], 1)
+            for name, stats in encoded["models"].items()
+        }
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Categorical encoding benchmark")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--no-models", action="store_true", help="only benchmark the preprocessor")
+    parser.add_argument("--output", type=str, default=None)
+    args = parser.parse_args()
+
+    results = run(args.rows, fit_models=not args.no_models)
+
+    print(json.dumps(results, indent=2))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Import-Time Benchmark
+
+Start-up cost of every entry point, measured with `python -X importtime`
+in a fresh interpreter per run, from an empty working directory:
+
+- import_ms        : cumulative import time of the entry point module
+                     (best of `--repeat` runs, so .pyc compilation and a
+                     cold page cache are not counted)
+- heaviest         : modules with the largest self time, to see what to defer
+- forbidden_loaded : heavy packages an entry point must not load at
+                     import (e.g. sklearn for the API, which serves from
+                     compiled artifacts)
+- created_paths    : files or directories the import created; imports
+                     must not touch the filesystem
+
+Each entry point has a budget (BUDGETS). Budgets are wall-clock and
+machine-dependent: they were set with about 30% headroom on a 1-CPU
+container and guard against regressions such as a new top-level
+import of the training stack. The forbidden-module and side-effect
+checks hold on any machine.
+
+Usage:
+    python -m churn_system.benchmarks.import_benchmark
+    python -m churn_system.benchmarks.import_benchmark --module churn_system.api.api --output imports.json
+
+Exits with status 1 when any entry point fails a check.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Entry point → import budget (ms)
+BUDGETS = {
+    "churn_system.api.api": 1200,
+    "churn_system.api.serve": 100,
+    "churn_system.lifecycle.orchestrator": 700,
+    "churn_system.lifecycle.scheduler": 700,
+    "churn_system.pipelines.training_pipeline": 150,
+    "churn_system.pipelines.monitoring_pipeline": 700,
+    "churn_system.training.train": 1900,
+}
+
+# Entry point → top-level packages it must not import
+FORBIDDEN = {
+    "churn_system.api.api": ["sklearn", "scipy", "requests", "wsgiref", "tracemalloc"],
+    "churn_system.api.serve": ["numpy", "pandas", "sklearn"],
+    "churn_system.lifecycle.orchestrator": ["sklearn", "requests"],
+    "churn_system.lifecycle.scheduler": ["sklearn", "requests"],
+    "churn_system.pipelines.training_pipeline": ["pandas", "sklearn", "venv"],
+    "churn_system.pipelines.monitoring_pipeline": ["sklearn"],
+}
+
+# Prints the top-level packages loaded, after -X importtime has written to stderr
+PROBE = "import {module}, sys, json; print(json.dumps(sorted({{m.split('.')[0] for m in sys.modules}})))"
+
+
+def parse_importtime(stderr: str) -> list:
+    """
+    (module, self_us, cumulative_us) for every `import time:` line.
+    """
+
+    rows = []
+
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+
+    return rows
+
+
+def import_once(module: str, workdir: Path) -> tuple:
+    """
+    Import `module` in a fresh interpreter; return (importtime rows, loaded packages).
+    """
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE.format(module=module)],
+        cwd=workdir,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(p for p in sys.path if p)},
+    )
+
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    return parse_importtime(result.stderr), json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def measure(module: str, repeat: int = 3, top: int = 10) -> dict:
+    """
+    Import cost and checks for one entry point.
+    """
+
+    best = None
+
+    with tempfile.TemporaryDirectory(prefix="churn-import-") as tmp:
+        workdir = Path(tmp)
+
+        for _ in range(repeat):
+            rows, packages = import_once(module, workdir)
+            total = next(cumulative for name, _, cumulative in rows if name == module)
+
+            if best is None or total < best[0]:
+                best = (total, rows, packages)
+
+        created = sorted(str(p.relative_to(workdir)) for p in workdir.rglob("*"))
+
+    total, rows, packages = best
+    budget = BUDGETS.get(module)
+    forbidden = [p for p in FORBIDDEN.get(module, []) if p in packages]
+
+    heaviest = sorted(rows, key=lambda row: row[1], reverse=True)[:top]
+
+    return {
+        "import_ms": round(total / 1000, 1),
+        "budget_ms": budget,
+        "within_budget": budget is None or total / 1000 <= budget,
+        "forbidden_loaded": forbidden,
+        "created_paths": created,
+        "modules_loaded": len(rows),
+        "heaviest": [
+            {"module": name, "self_ms": round(self_us / 1000, 1)}
+            for name, self_us, _ in heaviest
+        ],
+        "passed": (budget is None or total / 1000 <= budget) and not forbidden and not created,
+    }
+
+
+def run(modules: list | None = None, repeat: int = 3) -> dict:
+    return {module: measure(module, repeat) for module in (modules or list(BUDGETS))}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import time of the churn_system entry points")
+    parser.add_argument("--module", action="append", default=None, help="entry point (repeatable; default: all)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=str, default=None)
+    args = parser.parse_args()
+
+    results = run(args.module, args.repeat)
+
+    for module, r in results.items():
+        status = "ok" if r["passed"] else "FAIL"
+        print(f"{status:4}  {module:45} {r['import_ms']:8.1f} ms  (budget {r['budget_ms']} ms)")
+
+        if r["forbidden_loaded"]:
+            print(f"      forbidden modules loaded: {', '.join(r['forbidden_loaded'])}")
+
+        if r["created_paths"]:
+            print(f"      created at import: {', '.join(r['created_paths'])}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    sys.exit(0 if all(r["passed"] for r in results.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,552 @@
+"""
+Load Generator
+
+Replays a corpus of prediction requests against the API and reports
+throughput, error rates, latency histograms and latency percentiles
+corrected for coordinated omission.
+
+Corpus (one JSON request body per line):
+- --corpus FILE.jsonl : recorded requests
+- --from-logs         : inputs replayed from the prediction log store
+- default             : rows of paths.training_reference
+
+Concurrency models (asyncio, one event loop):
+- open loop   (--rate R)                : requests start on a fixed
+  schedule, R per second, whether or not earlier ones have finished
+- closed loop (--concurrency N)         : N users, each sends its next
+  request when the previous one completes
+- paced closed loop (--concurrency N --rate R): N users share a
+  schedule of R requests per second
+
+Coordinated omission: a slow server delays the requests queued behind
+it, and a generator that only times actual sends never records that
+wait. Every scheduled request therefore keeps its intended start
+time; "latency" is measured from it, "service_time" from the actual
+send. Unpaced closed loops have no schedule, so both are the same.
+
+Targets:
+- asgi  (default) : the app called in-process (asgi_client.py)
+- local           : the app served by uvicorn in a background thread,
+                    over localhost HTTP (one worker, for per-worker
+                    capacity planning)
+- --url URL       : any running server
+
+asgi and local load the production model of the current working
+directory. The generator shares the process (and the GIL) with the
+app in these modes, so absolute numbers are conservative.
+
+Usage:
+    python -m churn_system.benchmarks.load_generator --rate 200 --duration 10
+    python -m churn_system.benchmarks.load_generator --target local --rate 100,200,400 --slo-p99-ms 50
+    python -m churn_system.benchmarks.load_generator --url http://127.0.0.1:8000 --concurrency 16 --requests 5000
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.parse import urlparse
+
+import numpy as np
+import pandas as pd
+
+from churn_system.benchmarks.asgi_client import ASGIClient
+
+# Latency histogram buckets: 0.01 ms to 100 s, ~12% wide
+HISTOGRAM_EDGES_MS = 10 ** np.arange(-2, 5.01, 0.05)
+
+PERCENTILES = [50, 90, 99, 99.9, 99.99]
+
+# Prediction log columns that are not part of the request
+LOG_ONLY_COLUMNS = ["prediction_probability", "prediction", "timestamp"]
+
+
+# ---------- corpus ----------
+
+def _frame_bodies(df: pd.DataFrame) -> list:
+    # Missing values as JSON null, not NaN
+    records = df.astype(object).where(df.notna(), None).to_dict(orient="records")
+
+    return [json.dumps(record).encode("utf-8") for record in records]
+
+
+def load_corpus(path: Path) -> list:
+    """
+    Request bodies of a JSONL file (blank lines are skipped).
+    """
+
+    with open(path, "rb") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def corpus_from_reference(limit: int | None = None) -> list:
+    from churn_system.config.config import CONFIG
+
+    df = pd.read_csv(CONFIG["paths"]["training_reference"], nrows=limit)
+
+    return _frame_bodies(df)
+
+
+def corpus_from_logs(limit: int = 100000) -> list:
+    from churn_system.monitoring.prediction_store import iter_predictions
+
+    frames, rows = [], 0
+
+    for chunk in iter_predictions(batch_rows=min(limit, 65536)):
+        frames.append(chunk.drop(columns=[c for c in LOG_ONLY_COLUMNS if c in chunk.columns]))
+        rows += len(chunk)
+
+        if rows >= limit:
+            break
+
+    if not frames:
+        raise ValueError("Prediction log is empty")
+
+    return _frame_bodies(pd.concat(frames, ignore_index=True).head(limit))
+
+
+def write_corpus(bodies: list, path: Path):
+    with open(path, "wb") as f:
+        for body in bodies:
+            f.write(body + b"\n")
+
+
+# ---------- targets ----------
+
+class ASGITarget:
+    """
+    The app called in-process; must run on the ASGIClient's event loop.
+    """
+
+    def __init__(self, client: ASGIClient):
+        self.client = client
+
+    async def send(self, path: str, body: bytes) -> int:
+        response = await self.client.arequest("POST", path, content=body)
+        return response.status_code
+
+    async def close(self):
+        pass
+
+
+class HTTPConnection:
+    """
+    One keep-alive HTTP/1.1 connection (stdlib asyncio streams).
+    """
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def request(self, path: str, body: bytes) -> tuple:
+        head = (
+            f"POST {path} HTTP/1.1\r\n"
+            f"Host: {self.host}:{self.port}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "\r\n"
+        )
+
+        self.writer.write(head.encode("latin-1") + body)
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        headers = {}
+
+        while True:
+            line = await self.reader.readline()
+
+            if line in (b"\r\n", b"\n", b""):
+                break
+
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if "content-length" in headers:
+            content = await self.reader.readexactly(int(headers["content-length"]))
+
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            parts = []
+
+            while True:
+                size = int((await self.reader.readline()).split(b";")[0], 16)
+
+                if size == 0:
+                    await self.reader.readline()
+                    break
+
+                parts.append(await self.reader.readexactly(size))
+                await self.reader.readline()
+
+            content = b"".join(parts)
+
+        else:
+            content = await self.reader.read()
+            headers["connection"] = "close"
+
+        return status, content, headers.get("connection", "").lower() != "close"
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+class HTTPTarget:
+    """
+    Pool of keep-alive connections to one server; a new connection
+    is opened whenever every existing one is busy.
+    """
+
+    def __init__(self, url: str):
+        parsed = urlparse(url)
+
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 80
+        self.idle = []
+        self.opened = 0
+
+    async def send(self, path: str, body: bytes) -> int:
+        connection = self.idle.pop() if self.idle else None
+
+        if connection is None:
+            connection = HTTPConnection(self.host, self.port)
+            await connection.connect()
+            self.opened += 1
+
+        try:
+            status, _, reusable = await connection.request(path, body)
+        except BaseException:
+            connection.close()
+            raise
+
+        if reusable:
+            self.idle.append(connection)
+        else:
+            connection.close()
+
+        return status
+
+    async def close(self):
+        for connection in self.idle:
+            connection.close()
+
+        self.idle = []
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextmanager
+def local_server(app, startup_timeout: float = 60.0):
+    """
+    Serve the app with one uvicorn worker in a background thread.
+
+    Yields
+    ------
+    str
+        Base URL of the server.
+    """
+
+    import uvicorn
+
+    port = free_port()
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", access_log=False)
+    )
+
+    thread = threading.Thread(target=server.run, name="load-generator-server", daemon=True)
+    thread.start()
+
+    deadline = time.monotonic() + startup_timeout
+
+    while not server.started:
+        if not thread.is_alive() or time.monotonic() > deadline:
+            raise RuntimeError("Local server failed to start")
+
+        time.sleep(0.05)
+
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+# ---------- load ----------
+
+class Recorder:
+    """
+    Intended start, actual start and completion of every request.
+    """
+
+    def __init__(self):
+        self.intended, self.sent, self.done = [], [], []
+        self.statuses = Counter()
+
+    async def call(self, target, path: str, body: bytes, intended: float):
+        sent = time.perf_counter()
+
+        try:
+            status = str(await target.send(path, body))
+        except Exception as e:
+            status = type(e).__name__
+
+        self.intended.append(intended)
+        self.sent.append(sent)
+        self.done.append(time.perf_counter())
+        self.statuses[status] += 1
+
+
+async def open_loop(target, path: str, bodies: list, rate: float, n_requests: int, max_outstanding: int) -> Recorder:
+    """
+    Start request i at t0 + i / rate, independent of completions.
+
+    At most `max_outstanding` requests are in flight; beyond that the
+    schedule slips, and the corrected latency shows it.
+    """
+
+    recorder = Recorder()
+    slots = asyncio.Semaphore(max_outstanding)
+    tasks = []
+
+    async def run(body, intended):
+        try:
+            await recorder.call(target, path, body, intended)
+        finally:
+            slots.release()
+
+    start = time.perf_counter()
+
+    for i in range(n_requests):
+        intended = start + i / rate
+        delay = intended - time.perf_counter()
+
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        await slots.acquire()
+        tasks.append(asyncio.ensure_future(run(bodies[i % len(bodies)], intended)))
+
+    await asyncio.gather(*tasks)
+
+    return recorder
+
+
+async def closed_loop(target, path: str, bodies: list, concurrency: int, n_requests: int, rate: float | None = None) -> Recorder:
+    """
+    `concurrency` users sending back to back; with `rate`, they follow a
+    shared schedule of `rate` requests per second instead.
+    """
+
+    recorder = Recorder()
+    counter = iter(range(n_requests))
+    start = time.perf_counter()
+
+    async def user():
+        for i in counter:
+            if rate is None:
+                intended = time.perf_counter()
+            else:
+                intended = start + i / rate
+                delay = intended - time.perf_counter()
+
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            await recorder.call(target, path, bodies[i % len(bodies)], intended)
+
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+
+    return recorder
+
+
+# ---------- report ----------
+
+def latency_summary(seconds: np.ndarray) -> dict:
+    ms = seconds * 1e3
+
+    summary = {f"p{p:g}": round(float(np.percentile(ms, p)), 3) for p in PERCENTILES}
+    summary["max"] = round(float(ms.max()), 3)
+    summary["mean"] = round(float(ms.mean()), 3)
+
+    return summary
+
+
+def histogram(seconds: np.ndarray) -> list:
+    """
+    Non-empty log-spaced buckets: requests with latency <= le_ms
+    (and above the previous bucket).
+    """
+
+    counts = np.bincount(
+        np.searchsorted(HISTOGRAM_EDGES_MS, seconds * 1e3),
+        minlength=len(HISTOGRAM_EDGES_MS) + 1,
+    )
+
+    edges = list(HISTOGRAM_EDGES_MS) + [float("inf")]
+
+    return [
+        {"le_ms": round(float(edge), 4), "count": int(count)}
+        for edge, count in zip(edges, counts)
+        if count
+    ]
+
+
+def report(recorder: Recorder, model: dict) -> dict:
+    intended = np.asarray(recorder.intended)
+    sent = np.asarray(recorder.sent)
+    done = np.asarray(recorder.done)
+
+    latency = done - intended
+    service_time = done - sent
+
+    elapsed = float(done.max() - intended.min())
+    total = len(done)
+    errors = {status: n for status, n in recorder.statuses.items() if not status.startswith("2")}
+
+    return {
+        **model,
+        "requests": total,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_rps": round(total / elapsed, 1),
+        "error_rate": round(sum(errors.values()) / total, 6),
+        "statuses": dict(recorder.statuses),
+        # Scheduled send → response: what a client on the schedule experiences
+        "latency_ms": latency_summary(latency),
+        # Actual send → response
+        "service_time_ms": latency_summary(service_time),
+        "schedule_lag_ms": latency_summary(sent - intended),
+        "latency_histogram": histogram(latency),
+    }
+
+
+async def run_load(target, bodies: list, args, rate: float | None) -> dict:
+    n_requests = args.requests
+
+    if args.duration is not None and rate is not None:
+        n_requests = int(rate * args.duration)
+
+    try:
+        if args.concurrency is None:
+            recorder = await open_loop(target, args.path, bodies, rate, n_requests, args.max_outstanding)
+            model = {"model": "open", "target_rate": rate}
+        else:
+            recorder = await closed_loop(target, args.path, bodies, args.concurrency, n_requests, rate)
+            model = {"model": "closed", "concurrency": args.concurrency, "target_rate": rate}
+    finally:
+        await target.close()
+
+    return report(recorder, model)
+
+
+def capacity(results: list, slo_p99_ms: float, max_error_rate: float) -> dict:
+    """
+    Highest target rate whose corrected p99 and error rate met the SLO.
+    """
+
+    passing = [
+        r for r in results
+        if r["target_rate"] is not None
+        and r["latency_ms"]["p99"] <= slo_p99_ms
+        and r["error_rate"] <= max_error_rate
+    ]
+
+    return {
+        "slo_p99_ms": slo_p99_ms,
+        "max_error_rate": max_error_rate,
+        "max_rate": max((r["target_rate"] for r in passing), default=None),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay prediction requests against the API")
+    parser.add_argument("--corpus", type=str, default=None, help="JSONL file, one request body per line")
+    parser.add_argument("--from-logs", action="store_true", help="replay inputs from the prediction log store")
+    parser.add_argument("--corpus-size", type=int, default=10000, help="rows taken from logs or the training reference")
+    parser.add_argument("--write-corpus", type=str, default=None, help="save the corpus as JSONL and exit")
+    parser.add_argument("--target", choices=["asgi", "local"], default="asgi")
+    parser.add_argument("--url", type=str, default=None, help="running server (overrides --target)")
+    parser.add_argument("--path", type=str, default="/predict")
+    parser.add_argument("--rate", type=str, default=None, help="requests per second; comma-separated for a sweep")
+    parser.add_argument("--concurrency", type=int, default=None, help="closed-loop users (default: open loop)")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--duration", type=float, default=None, help="seconds per run (with --rate)")
+    parser.add_argument("--max-outstanding", type=int, default=1000, help="open-loop in-flight limit")
+    parser.add_argument("--warmup", type=int, default=50, help="unrecorded requests before each run")
+    parser.add_argument("--slo-p99-ms", type=float, default=None, help="report the highest rate meeting this p99")
+    parser.add_argument("--max-error-rate", type=float, default=0.001)
+    parser.add_argument("--output", type=str, default=None)
+    args = parser.parse_args()
+
+    if args.corpus:
+        bodies = load_corpus(Path(args.corpus))
+    elif args.from_logs:
+        bodies = corpus_from_logs(args.corpus_size)
+    else:
+        bodies = corpus_from_reference(args.corpus_size)
+
+    if args.write_corpus:
+        write_corpus(bodies, Path(args.write_corpus))
+        print(f"Wrote {len(bodies)} requests to {args.write_corpus}")
+        return
+
+    if args.rate is None and args.concurrency is None:
+        parser.error("Give --rate (open loop) and/or --concurrency (closed loop)")
+
+    rates = [float(r) for r in args.rate.split(",")] if args.rate else [None]
+
+    async def runs(make_target):
+        results = []
+
+        for rate in rates:
+            warmup = make_target()
+            for body in bodies[:args.warmup]:
+                await warmup.send(args.path, body)
+            await warmup.close()
+
+            results.append(await run_load(make_target(), bodies, args, rate))
+
+        return results
+
+    if args.url:
+        results = asyncio.run(runs(lambda: HTTPTarget(args.url)))
+        target = args.url
+    else:
+        from churn_system.api.api import app
+
+        if args.target == "local":
+            with local_server(app) as url:
+                results = asyncio.run(runs(lambda: HTTPTarget(url)))
+        else:
+            with ASGIClient(app) as client:
+                results = client.loop.run_until_complete(runs(lambda: ASGITarget(client)))
+
+        target = args.target
+
+    document = {"target": target, "path": args.path, "corpus_size": len(bodies), "runs": results}
+
+    if args.slo_p99_ms is not None:
+        document["capacity"] = capacity(results, args.slo_p99_ms, args.max_error_rate)
+
+    print(json.dumps(document, indent=2))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(document, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
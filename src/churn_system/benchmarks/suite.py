@@ -0,0 +1,473 @@
+"""
+Benchmark Suite
+
+End-to-end benchmarks of the training, inference and monitoring hot
+paths on synthetic Telco-shaped data, written as one JSON document
+that can be compared across commits:
+
+- features   : build_features / validate_inference_data cost per row,
+               for whole frames and for single-row requests
+- training   : the training pipeline on a synthetic raw CSV, with
+               train_candidate_models wall time and memory per candidate
+- store      : store_prediction submit latency and write throughput
+- monitoring : calculate_psi and evaluate_model_health time against
+               prediction log size
+- api        : /predict latency percentiles and throughput, and
+               /predict/batch rows per second, called in-process
+               (asgi_client.py)
+- imports    : import time of every entry point against its budget
+               (import_benchmark.py)
+
+Every run happens in a scratch working directory (all data, model and
+log paths in settings.yaml are relative), so the synthetic model,
+predictions and logs never touch the real ones. churn_system modules
+are imported only after switching to it.
+
+Usage:
+    python -m churn_system.benchmarks.suite --rows 20000 --output bench.json
+    python -m churn_system.benchmarks.suite --compare base.json bench.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import sklearn
+
+from churn_system.benchmarks.asgi_client import ASGIClient
+from churn_system.benchmarks.synthetic import make_telco_frame
+
+# Bump when result keys change meaning
+SUITE_VERSION = 1
+
+# Outcome columns of the raw data; never part of a prediction request
+OUTCOME_COLUMNS = ["Churn Label", "Churn Value", "Churn Score", "Churn Reason", "CLTV"]
+
+
+# ---------- helpers ----------
+
+def summarize(timings, unit: float = 1e3) -> dict:
+    """
+    Percentiles of per-call timings (seconds), in ms by default (unit=1e6 → µs).
+    """
+
+    timings = np.asarray(timings) * unit
+
+    return {
+        "p50": round(float(np.percentile(timings, 50)), 3),
+        "p90": round(float(np.percentile(timings, 90)), 3),
+        "p99": round(float(np.percentile(timings, 99)), 3),
+        "max": round(float(timings.max()), 3),
+        "mean": round(float(timings.mean()), 3),
+    }
+
+
+def best_of(fn, repeat: int = 3) -> float:
+    timings = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def request_records(n: int, seed: int, shift: float = 0.0) -> list:
+    """
+    Raw prediction requests: synthetic customers without outcome columns.
+    """
+
+    return make_telco_frame(n, seed=seed, shift=shift).drop(columns=OUTCOME_COLUMNS).to_dict(orient="records")
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ---------- stages ----------
+
+def bench_features(rows: int, single_rows: int = 500) -> dict:
+    from churn_system.features.build_features import build_features
+    from churn_system.schema import validate_inference_data
+
+    frame = make_telco_frame(rows, seed=1)
+    features = build_features(frame)
+    schema = list(features.columns)
+
+    build_seconds = best_of(lambda: build_features(frame))
+    validate_seconds = best_of(lambda: validate_inference_data(features, schema))
+
+    build_timings, validate_timings = [], []
+
+    for record in frame.head(single_rows).to_dict(orient="records"):
+        start = time.perf_counter()
+        df = build_features(pd.DataFrame([record]))
+        build_timings.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        validate_inference_data(df, schema)
+        validate_timings.append(time.perf_counter() - start)
+
+    return {
+        "rows": rows,
+        "build_features_us_per_row": round(build_seconds / rows * 1e6, 3),
+        "validate_us_per_row": round(validate_seconds / rows * 1e6, 3),
+        "single_row_build_features_us": summarize(build_timings, unit=1e6),
+        "single_row_validate_us": summarize(validate_timings, unit=1e6),
+    }
+
+
+def bench_training(rows: int, search: bool) -> dict:
+    """
+    Train on a synthetic raw CSV and promote the champion, which the
+    monitoring and api stages then use.
+    """
+
+    from churn_system.config.config import CONFIG
+
+    CONFIG["search"]["enabled"] = search
+    CONFIG["training"]["profile_memory"] = True
+
+    raw_path = Path(CONFIG["paths"]["raw_data"])
+    raw_path.parent.mkdir(parents=True, exist_ok=True)
+    make_telco_frame(rows, seed=0).to_csv(raw_path, index=False)
+
+    from churn_system.lifecycle.registry import EXPERIMENTS_DIR, set_production
+    from churn_system.training import train
+
+    start = time.perf_counter()
+    train.main()
+    seconds = time.perf_counter() - start
+
+    model_dir = EXPERIMENTS_DIR / f"churn_model_{train.MODEL_VERSION}"
+
+    with open(model_dir / "experiment_report.json", "r") as f:
+        report = json.load(f)
+
+    set_production(model_dir.name)
+
+    return {
+        "rows": rows,
+        "search": search,
+        "pipeline_seconds": round(seconds, 3),
+        "candidate_training_seconds": report["training"]["wall_seconds"],
+        "workers": report["training"]["workers"],
+        "candidates": {
+            name: {
+                "wall_seconds": stats["wall_seconds"],
+                "peak_memory_mb": stats["peak_memory_mb"],
+                "max_rss_mb": stats["max_rss_mb"],
+            }
+            for name, stats in report["training"]["candidates"].items()
+        },
+        "champion": report["winner"],
+    }
+
+
+def _log_predictions(records: list, flush_every: int):
+    """
+    Queue records for the prediction log writer without overflowing its queue.
+    """
+
+    from churn_system.monitoring.prediction_store import get_prediction_writer, store_predictions
+
+    writer = get_prediction_writer()
+
+    for start in range(0, len(records), flush_every):
+        chunk = records[start:start + flush_every]
+        store_predictions(chunk, [0.5] * len(chunk), [0] * len(chunk))
+        writer.flush()
+
+
+def bench_store(n_records: int) -> dict:
+    from churn_system.features.build_features import build_features
+    from churn_system.monitoring.prediction_store import WRITER_CONFIG, get_prediction_writer, store_prediction
+
+    records = build_features(make_telco_frame(n_records, seed=2)).to_dict(orient="records")
+
+    writer = get_prediction_writer()
+    written, dropped = writer.written_records, writer.dropped_records
+
+    # Flush before the queue fills, so no record is dropped
+    flush_every = max(1, WRITER_CONFIG["queue_size"] // 2)
+    submit_timings = []
+
+    start = time.perf_counter()
+
+    for i, record in enumerate(records, 1):
+        t = time.perf_counter()
+        store_prediction(record, 0.5, 0)
+        submit_timings.append(time.perf_counter() - t)
+
+        if i % flush_every == 0:
+            writer.flush()
+
+    writer.flush()
+    seconds = time.perf_counter() - start
+
+    return {
+        "records": n_records,
+        "backend": WRITER_CONFIG["backend"],
+        "submit_us": summarize(submit_timings, unit=1e6),
+        "written_per_second": round((writer.written_records - written) / seconds, 1),
+        "dropped": writer.dropped_records - dropped,
+    }
+
+
+def bench_monitoring(log_sizes: list) -> dict:
+    from churn_system.config.config import CONFIG
+    from churn_system.features.build_features import build_features
+    from churn_system.monitoring.drift import calculate_psi
+    from churn_system.monitoring.model_health import evaluate_model_health
+    from churn_system.monitoring.prediction_store import (
+        WRITER_CONFIG,
+        get_prediction_writer,
+        has_predictions,
+        load_predictions,
+    )
+
+    reference = pd.read_csv(CONFIG["paths"]["training_reference"])
+    production = build_features(make_telco_frame(max(log_sizes), seed=3, shift=0.1))
+    records = production.to_dict(orient="records")
+
+    writer = get_prediction_writer()
+    flush_every = max(1, WRITER_CONFIG["queue_size"] // 2)
+
+    def log_rows() -> int:
+        # Rows actually in the log: earlier stages (bench_store, bench_api) write to it too
+        writer.flush()
+        return len(load_predictions(["timestamp"])) if has_predictions() else 0
+
+    psi, health = [], []
+
+    for size in sorted(log_sizes):
+        actual = production["Monthly Charges"].iloc[:size]
+
+        psi.append({
+            "rows": size,
+            "seconds": round(best_of(lambda: calculate_psi(reference["Monthly Charges"], actual)), 6),
+        })
+
+        # Grow the prediction log to `size` records
+        logged = log_rows()
+        if size > logged:
+            _log_predictions(records[:size - logged], flush_every)
+
+        # First call counts the new log partitions, the second reuses that state
+        start = time.perf_counter()
+        evaluate_model_health()
+        first = time.perf_counter() - start
+
+        start = time.perf_counter()
+        evaluate_model_health()
+        repeat = time.perf_counter() - start
+
+        health.append({
+            "log_rows": log_rows(),
+            "seconds": round(first, 4),
+            "repeat_seconds": round(repeat, 4),
+        })
+
+    return {"calculate_psi": psi, "evaluate_model_health": health}
+
+
+def bench_api(n_requests: int, batch_size: int, warmup: int = 20) -> dict:
+    from churn_system.api.api import app
+
+    records = request_records(n_requests, seed=4)
+
+    with ASGIClient(app) as client:
+        for record in records[:warmup]:
+            client.post("/predict", json=record)
+
+        timings, errors = [], 0
+        start = time.perf_counter()
+
+        for record in records:
+            t = time.perf_counter()
+            response = client.post("/predict", json=record)
+            timings.append(time.perf_counter() - t)
+
+            errors += response.status_code != 200
+
+        seconds = time.perf_counter() - start
+
+        batch_timings = []
+
+        for i in range(0, len(records), batch_size):
+            t = time.perf_counter()
+            response = client.post("/predict/batch", json=records[i:i + batch_size])
+            batch_timings.append(time.perf_counter() - t)
+
+            errors += response.status_code != 200
+
+    return {
+        "requests": n_requests,
+        "errors": int(errors),
+        "predict_latency_ms": summarize(timings),
+        "predict_throughput_rps": round(n_requests / seconds, 1),
+        "batch_size": batch_size,
+        "batch_latency_ms": summarize(batch_timings),
+        "batch_rows_per_second": round(len(records) / sum(batch_timings), 1),
+    }
+
+
+def bench_imports() -> dict:
+    from churn_system.benchmarks.import_benchmark import run as run_imports
+
+    # Fresh interpreters: this process has everything imported already
+    results = run_imports()
+
+    return {
+        module: {key: r[key] for key in ("import_ms", "budget_ms", "passed")}
+        for module, r in results.items()
+    }
+
+
+# ---------- suite ----------
+
+def run(args) -> dict:
+    log_sizes = [int(s) for s in args.log_sizes.split(",")]
+
+    results = {}
+    stages = [
+        ("features", lambda: bench_features(args.rows)),
+        ("training", lambda: bench_training(args.rows, args.search)),
+        ("store", lambda: bench_store(args.store_records)),
+        ("monitoring", lambda: bench_monitoring(log_sizes)),
+        ("api", lambda: bench_api(args.requests, args.batch_size)),
+        ("imports", lambda: bench_imports()),
+    ]
+
+    for name, stage in stages:
+        start = time.perf_counter()
+        results[name] = stage()
+        results[name]["stage_seconds"] = round(time.perf_counter() - start, 3)
+
+    return results
+
+
+def flatten(results: dict, prefix: str = "") -> dict:
+    """
+    Numeric leaves of a result tree, keyed by dotted path.
+    """
+
+    flat = {}
+
+    for key, value in results.items():
+        path = f"{prefix}{key}"
+
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{path}."))
+        elif isinstance(value, list):
+            flat.update(flatten({str(i): v for i, v in enumerate(value)}, f"{path}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[path] = value
+
+    return flat
+
+
+def compare(baseline: dict, current: dict) -> dict:
+    """
+    Relative change of every metric present in both result files.
+    """
+
+    before = flatten(baseline["results"])
+    after = flatten(current["results"])
+
+    return {
+        "baseline_commit": baseline.get("commit"),
+        "current_commit": current.get("commit"),
+        "metrics": {
+            key: {
+                "baseline": before[key],
+                "current": after[key],
+                "change_pct": round((after[key] - before[key]) / before[key] * 100, 1) if before[key] else None,
+            }
+            for key in before
+            if key in after
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end benchmark suite")
+    parser.add_argument("--rows", type=int, default=20000, help="rows for feature and training benchmarks")
+    parser.add_argument("--requests", type=int, default=2000, help="/predict requests")
+    parser.add_argument("--batch-size", type=int, default=100, help="records per /predict/batch request")
+    parser.add_argument("--store-records", type=int, default=20000, help="records for store_prediction")
+    parser.add_argument("--log-sizes", type=str, default="1000,10000,50000", help="prediction log sizes for monitoring")
+    parser.add_argument("--search", action="store_true", help="include hyperparameter search in training")
+    parser.add_argument("--workdir", type=str, default=None, help="scratch directory (default: a new temporary one)")
+    parser.add_argument("--keep-workdir", action="store_true")
+    parser.add_argument("--output", type=str, default=None)
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"), help="compare two result files")
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0], "r") as f:
+            baseline = json.load(f)
+        with open(args.compare[1], "r") as f:
+            current = json.load(f)
+
+        print(json.dumps(compare(baseline, current), indent=2))
+        return
+
+    output = Path(args.output).resolve() if args.output else None
+    workdir = Path(args.workdir or tempfile.mkdtemp(prefix="churn-bench-")).resolve()
+    workdir.mkdir(parents=True, exist_ok=True)
+
+    document = {
+        "suite_version": SUITE_VERSION,
+        "commit": git_commit(),
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "sklearn": sklearn.__version__,
+        },
+        "parameters": {k: v for k, v in vars(args).items() if k not in ("compare", "output", "workdir", "keep_workdir")},
+    }
+
+    cwd = Path.cwd()
+    os.chdir(workdir)
+
+    try:
+        document["results"] = run(args)
+    finally:
+        os.chdir(cwd)
+
+        if not args.keep_workdir and args.workdir is None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print(json.dumps(document, indent=2))
+
+    if output:
+        with open(output, "w") as f:
+            json.dump(document, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
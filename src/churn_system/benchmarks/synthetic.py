@@ -0,0 +1,125 @@
+"""
+Synthetic Telco Data
+
+Generates raw, Telco-shaped customer data (same columns and value
+domains as data/Telco_customer_churn_raw.csv) at any scale, so
+benchmarks do not depend on the real dataset.
+"""
+
+import numpy as np
+import pandas as pd
+
+YES_NO = ["Yes", "No"]
+SERVICE = ["Yes", "No", "No internet service"]
+
+PAYMENT_METHODS = [
+    "Bank transfer (automatic)",
+    "Credit card (automatic)",
+    "Electronic check",
+    "Mailed check",
+]
+
+
+def _choice(rng, values: list, n: int, categorical: bool) -> pd.Series | np.ndarray:
+    codes = rng.integers(0, len(values), n)
+
+    if categorical:
+        return pd.Categorical.from_codes(codes, categories=values)
+
+    return np.asarray(values, dtype=object)[codes]
+
+
+def make_telco_frame(
+    n_rows: int,
+    seed: int = 42,
+    extra_numeric: int = 0,
+    categorical: bool = False,
+    shift: float = 0.0,
+) -> pd.DataFrame:
+    """
+    Build a raw Telco-shaped dataframe.
+
+    Parameters
+    ----------
+    n_rows : int
+        Number of customers.
+    seed : int
+        Random seed.
+    extra_numeric : int
+        Additional numeric columns ("Feature 0", ...) for wide-frame benchmarks.
+    categorical : bool
+        Store text columns as pandas categoricals (much less memory at 1M+ rows).
+    shift : float
+        Shifts numeric distributions, to simulate production drift.
+    """
+
+    rng = np.random.default_rng(seed)
+    n = n_rows
+
+    def pick(values):
+        return _choice(rng, values, n, categorical)
+
+    tenure = np.clip(rng.integers(0, 73, n) + int(shift * 12), 0, 72)
+    monthly = (rng.uniform(18.25, 118.75, n) * (1 + shift)).round(2)
+    total = (tenure * monthly).round(2)
+
+    contract_codes = rng.integers(0, 3, n)
+    contracts = ["Month-to-month", "One year", "Two year"]
+
+    logit = (
+        -2.0
+        + 1.5 * (contract_codes == 0)
+        - 0.03 * tenure
+        + 0.01 * monthly
+    )
+    churn = (rng.uniform(size=n) < 1 / (1 + np.exp(-logit))).astype(np.int64)
+
+    latitude = rng.uniform(32.5, 42.0, n).round(6)
+    longitude = rng.uniform(-124.3, -114.2, n).round(6)
+    city_codes = rng.integers(0, 1100, n)
+
+    df = pd.DataFrame({
+        "CustomerID": pd.RangeIndex(n).astype(str),
+        "Count": np.ones(n, dtype=np.int64),
+        "Country": pick(["United States"]),
+        "State": pick(["California"]),
+        "City": pick([f"City {i}" for i in range(1100)]) if categorical
+        else np.char.add("City ", city_codes.astype(str)).astype(object),
+        "Zip Code": rng.integers(90001, 96162, n),
+        "Lat Long": np.char.add(
+            np.char.add(latitude.astype(str), ", "), longitude.astype(str)
+        ).astype(object),
+        "Latitude": latitude,
+        "Longitude": longitude,
+        "Gender": pick(["Male", "Female"]),
+        "Senior Citizen": pick(YES_NO),
+        "Partner": pick(YES_NO),
+        "Dependents": pick(YES_NO),
+        "Tenure Months": tenure,
+        "Phone Service": pick(YES_NO),
+        "Multiple Lines": pick(["Yes", "No", "No phone service"]),
+        "Internet Service": pick(["DSL", "Fiber optic", "No"]),
+        "Online Security": pick(SERVICE),
+        "Online Backup": pick(SERVICE),
+        "Device Protection": pick(SERVICE),
+        "Tech Support": pick(SERVICE),
+        "Streaming TV": pick(SERVICE),
+        "Streaming Movies": pick(SERVICE),
+        "Contract": pd.Categorical.from_codes(contract_codes, categories=contracts)
+        if categorical else np.asarray(contracts, dtype=object)[contract_codes],
+        "Paperless Billing": pick(YES_NO),
+        "Payment Method": pick(PAYMENT_METHODS),
+        "Monthly Charges": monthly,
+        "Total Charges": total,
+        "Churn Label": np.where(churn == 1, "Yes", "No").astype(object),
+        "Churn Value": churn,
+        "Churn Score": rng.integers(5, 100, n),
+        "CLTV": rng.integers(2003, 6501, n),
+        "Churn Reason": np.where(churn == 1, "Competitor offered more data", "").astype(object),
+    })
+
+    for i in range(extra_numeric):
+        df[f"Feature {i}"] = rng.normal(shift, 1.0, n)
+
+    return df
+
@@ -0,0 +1,114 @@
+"""
+Tree Ensemble Benchmark
+
+Throughput of the packed tree ensemble versus the sklearn estimator
+on the same transformed feature matrix, for batch sizes from 1 to 100k.
+
+Preprocessing is excluded: both paths share the same ColumnTransformer.
+
+Usage:
+    python -m churn_system.benchmarks.tree_ensemble_benchmark
+    python -m churn_system.benchmarks.tree_ensemble_benchmark --model-dir models/experiments/<version>
+"""
+
+import argparse
+import json
+import pickle
+import time
+from pathlib import Path
+
+import numpy as np
+
+from churn_system.benchmarks.synthetic import make_telco_frame
+from churn_system.features.build_features import build_features
+from churn_system.inference.tree_ensemble import TreeEnsemble
+from churn_system.lifecycle.registry import resolve_production_dir
+
+BATCH_SIZES = [1, 10, 100, 1_000, 10_000, 100_000]
+
+
+def rows_per_second(fn, X, min_seconds: float = 0.5) -> float:
+    """
+    Best-of throughput over repeated calls lasting at least min_seconds.
+    """
+
+    fn(X[:1])
+
+    best = float("inf")
+    elapsed = 0.0
+
+    while elapsed < min_seconds:
+        start = time.perf_counter()
+        fn(X)
+        duration = time.perf_counter() - start
+
+        best = min(best, duration)
+        elapsed += duration
+
+    return X.shape[0] / best
+
+
+def run(model_dir: Path, batch_sizes: list) -> dict:
+    with open(model_dir / "model.pkl", "rb") as f:
+        pipeline = pickle.load(f)
+
+    estimator = pipeline.named_steps["model"]
+    ensemble = TreeEnsemble.from_estimator(estimator)
+
+    raw = make_telco_frame(max(batch_sizes), seed=11)
+    X = pipeline.named_steps["preprocessor"].transform(build_features(raw)).tocsr()
+
+    difference = float(np.abs(
+        ensemble.predict(X[:10_000]) - estimator.predict_proba(X[:10_000])[:, 1]
+    ).max())
+
+    results = []
+
+    for size in batch_sizes:
+        batch = X[:size]
+
+        sklearn_rps = rows_per_second(lambda b: estimator.predict_proba(b), batch)
+        packed_rps = rows_per_second(ensemble.predict, batch)
+
+        results.append({
+            "batch_size": size,
+            "sklearn_rows_per_second": round(sklearn_rps, 1),
+            "packed_rows_per_second": round(packed_rps, 1),
+            "speedup": round(packed_rps / sklearn_rps, 2),
+        })
+
+        print(json.dumps(results[-1]))
+
+    return {
+        "model": type(estimator).__name__,
+        "evaluation": "lookup" if ensemble.lookup else "traversal",
+        "trees": ensemble.n_trees,
+        "nodes": int(len(ensemble.feature)),
+        "features": ensemble.n_features,
+        "max_abs_difference": difference,
+        "batches": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tree ensemble throughput benchmark")
+    parser.add_argument(
+        "--model-dir",
+        type=Path,
+        default=resolve_production_dir(),
+    )
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=BATCH_SIZES)
+    parser.add_argument("--output", type=str, default=None)
+    args = parser.parse_args()
+
+    results = run(args.model_dir, args.batch_sizes)
+
+    print(json.dumps(results, indent=2))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
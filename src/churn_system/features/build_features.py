@@ -21,6 +21,10 @@ DROP_COLUMNS = [
 TARGET_COLUMN = "Churn Value"
 
 
+# Numeric columns where unparseable or missing values become 0
+ZERO_FILLED_COLUMNS = ["Total Charges"]
+
+
 def build_features(df: pd.DataFrame, training: bool = False) -> pd.DataFrame:
     """
     Prepare model-ready features.
@@ -35,9 +39,8 @@ def build_features(df: pd.DataFrame, training: bool = False) -> pd.DataFrame:
 
     df = df.copy()
 
-    df["Total Charges"] = pd.to_numeric(
-        df["Total Charges"], errors="coerce"
-    ).fillna(0)
+    for col in ZERO_FILLED_COLUMNS:
+        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
 
     if TARGET_COLUMN in df.columns:
         df = df.drop(columns=[TARGET_COLUMN])
@@ -0,0 +1,212 @@
+"""
+Categorical Encoding
+
+Per-column encoding strategies, chosen from each column's cardinality
+in the training data:
+
+- onehot    : at most `encoding.max_onehot_cardinality` categories;
+              one indicator column per category
+- frequency : high-cardinality columns become a single column holding
+              the category's share of the training rows (unseen and
+              rarer than `encoding.min_frequency_count` → 0)
+- hash      : high-cardinality columns are hashed (crc32) into
+              `encoding.hash_width` indicator columns
+
+One-hot encoding every categorical column turned City and Lat Long
+(one value per customer) into thousands of near-empty columns; the
+bounded strategies keep the encoded width close to the number of
+low-cardinality categories.
+
+The fitted encoders are pickled with the pipeline, so serving applies
+exactly the training transforms. `encoding_plan` summarizes them for
+metadata.json.
+"""
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.compose import ColumnTransformer
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+from churn_system.config.config import CONFIG
+from churn_system.features.hashing import hash_bucket
+
+ENCODING_CONFIG = CONFIG.get("encoding", {})
+
+STRATEGIES = ("onehot", "frequency", "hash")
+
+
+def _as_frame(X) -> pd.DataFrame:
+    return X if isinstance(X, pd.DataFrame) else pd.DataFrame(X)
+
+
+class FrequencyEncoder(TransformerMixin, BaseEstimator):
+    """
+    Replace each category by its relative frequency in the training data.
+
+    Categories seen fewer than `min_count` times are not stored (their
+    frequency is ~0 anyway), which keeps the fitted maps small for
+    ID-like columns. They, unseen and missing values encode as 0.
+    """
+
+    def __init__(self, min_count: int = 2):
+        self.min_count = min_count
+
+    def fit(self, X, y=None):
+        X = _as_frame(X)
+
+        self.frequencies_ = []
+
+        for col in X.columns:
+            counts = X[col].astype(object).value_counts(dropna=True)
+            kept = counts[counts >= self.min_count]
+
+            self.frequencies_.append((kept / len(X)).to_dict())
+
+        self.feature_names_in_ = np.asarray(X.columns, dtype=object)
+        self.n_features_in_ = X.shape[1]
+
+        return self
+
+    def transform(self, X):
+        X = _as_frame(X)
+        out = np.zeros((len(X), len(self.frequencies_)), dtype=np.float64)
+
+        for j, (col, frequencies) in enumerate(zip(X.columns, self.frequencies_)):
+            # Look up each distinct value once, not once per row
+            codes, uniques = pd.factorize(X[col].astype(object))
+            values = np.array([frequencies.get(u, 0.0) for u in uniques], dtype=np.float64)
+
+            present = codes >= 0
+            out[present, j] = values[codes[present]]
+
+        return out
+
+    def get_feature_names_out(self, input_features=None):
+        return np.asarray([f"{col}_frequency" for col in self.feature_names_in_], dtype=object)
+
+
+class HashingEncoder(TransformerMixin, BaseEstimator):
+    """
+    Hash each column's categories into `width` indicator columns.
+    Missing values encode as all zeros.
+    """
+
+    def __init__(self, width: int = 64):
+        self.width = width
+
+    def fit(self, X, y=None):
+        X = _as_frame(X)
+
+        self.feature_names_in_ = np.asarray(X.columns, dtype=object)
+        self.n_features_in_ = X.shape[1]
+
+        return self
+
+    def transform(self, X):
+        X = _as_frame(X)
+        rows, cols = [], []
+
+        for j, col in enumerate(X.columns):
+            codes, uniques = pd.factorize(X[col].astype(object))
+            buckets = np.array([hash_bucket(str(u), self.width) for u in uniques], dtype=np.intp)
+
+            present = np.flatnonzero(codes >= 0)
+            rows.append(present)
+            cols.append(j * self.width + buckets[codes[present]])
+
+        rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.intp)
+        cols = np.concatenate(cols) if cols else np.empty(0, dtype=np.intp)
+
+        return sp.csr_matrix(
+            (np.ones(len(rows)), (rows, cols)),
+            shape=(len(X), self.width * self.n_features_in_),
+        )
+
+    def get_feature_names_out(self, input_features=None):
+        return np.asarray(
+            [f"{col}_hash{k}" for col in self.feature_names_in_ for k in range(self.width)],
+            dtype=object,
+        )
+
+
+# ---------- strategies ----------
+
+def choose_strategies(X: pd.DataFrame) -> dict:
+    """
+    Encoding strategy per categorical column, from its training cardinality.
+    """
+
+    max_onehot = ENCODING_CONFIG.get("max_onehot_cardinality", 30)
+    high_cardinality = ENCODING_CONFIG.get("high_cardinality", "frequency")
+
+    if high_cardinality not in STRATEGIES[1:]:
+        raise ValueError(f"Unknown high-cardinality encoding: {high_cardinality}")
+
+    categorical_cols = X.select_dtypes(include=["object", "category"]).columns
+
+    return {
+        col: "onehot" if X[col].nunique(dropna=True) <= max_onehot else high_cardinality
+        for col in categorical_cols
+    }
+
+
+def build_column_encoder(X: pd.DataFrame) -> ColumnTransformer:
+    """
+    Scaled numeric columns plus one encoder per strategy in use.
+    """
+
+    strategies = choose_strategies(X)
+
+    numerical_cols = X.select_dtypes(exclude=["object", "category"]).columns
+
+    def columns(strategy):
+        return [col for col, s in strategies.items() if s == strategy]
+
+    transformers = [("num", StandardScaler(), numerical_cols)]
+
+    if columns("onehot"):
+        transformers.append(("cat", OneHotEncoder(handle_unknown="ignore"), columns("onehot")))
+
+    if columns("frequency"):
+        transformers.append(
+            ("freq", FrequencyEncoder(min_count=ENCODING_CONFIG.get("min_frequency_count", 2)), columns("frequency"))
+        )
+
+    if columns("hash"):
+        transformers.append(
+            ("hash", HashingEncoder(width=ENCODING_CONFIG.get("hash_width", 64)), columns("hash"))
+        )
+
+    return ColumnTransformer(transformers=transformers)
+
+
+def encoding_plan(preprocessor: ColumnTransformer) -> dict:
+    """
+    Fitted strategy and encoded width per input column (for metadata.json).
+    """
+
+    columns = {}
+
+    for _, transformer, cols in preprocessor.transformers_:
+        if isinstance(transformer, StandardScaler):
+            for col in cols:
+                columns[col] = {"strategy": "scaled", "width": 1}
+
+        elif isinstance(transformer, OneHotEncoder):
+            for col, cats in zip(cols, transformer.categories_):
+                columns[col] = {"strategy": "onehot", "categories": len(cats), "width": len(cats)}
+
+        elif isinstance(transformer, FrequencyEncoder):
+            for col, frequencies in zip(cols, transformer.frequencies_):
+                columns[col] = {"strategy": "frequency", "categories": len(frequencies), "width": 1}
+
+        elif isinstance(transformer, HashingEncoder):
+            for col in cols:
+                columns[col] = {"strategy": "hash", "width": transformer.width}
+
+    return {
+        "encoded_width": sum(c["width"] for c in columns.values()),
+        "columns": columns,
+    }
@@ -0,0 +1,342 @@
+"""
+Feature Cache
+
+Engineered training data, keyed by what it was built from:
+
+    <cache_dir>/<key>/
+        entry.json          inputs, item index, size
+        X_train.parquet     DataFrames / Series (Parquet)
+        Xt_train.*.npy      arrays and CSR matrix parts (.npy, no pickle)
+        preprocessor.pkl    other objects (pickle, sha256-checked)
+
+The key hashes the raw dataset's content, the source of the feature
+builder and the preprocessor, and the build parameters (split, folds,
+library versions). Retraining on unchanged data therefore skips
+loading, validation, feature engineering and encoding, and any change
+to the data or to the code that builds features starts a new entry.
+
+The cache is bounded by `feature_cache.max_bytes`; the least recently
+used entries are evicted first.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import shutil
+import time
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+import sklearn
+
+from churn_system.config.config import CONFIG
+import churn_system.features.build_features as feature_builder
+from churn_system.inference.model_artifact import file_sha256
+from churn_system.logging.logger import get_logger
+
+logger = get_logger(__name__, CONFIG["logging"]["training"])
+
+CACHE_CONFIG = CONFIG.get("feature_cache", {})
+CACHE_DIR = Path(CACHE_CONFIG.get("dir", "data/feature_cache"))
+MAX_BYTES = CACHE_CONFIG.get("max_bytes", 512 * 2**20)
+
+# Bump when the on-disk layout changes
+FORMAT_VERSION = 1
+
+ENTRY_FILE = "entry.json"
+CSR_PARTS = ("data", "indices", "indptr")
+
+
+# ---------- keys ----------
+
+def dataset_fingerprint(data_path: Path) -> str:
+    """
+    sha256 of a dataset file, or of a columnar store's part names and
+    sizes (parts are immutable once written).
+    """
+
+    data_path = Path(data_path)
+
+    if data_path.is_file():
+        return file_sha256(data_path)
+
+    digest = hashlib.sha256()
+
+    for path in sorted(p for p in data_path.rglob("*") if p.is_file()):
+        digest.update(f"{path.relative_to(data_path)}:{path.stat().st_size}".encode())
+
+    return digest.hexdigest()
+
+
+def code_version(*objects) -> str:
+    """
+    Hash of the source code that produces cached items.
+    """
+
+    digest = hashlib.sha256()
+
+    for obj in objects:
+        digest.update(inspect.getsource(obj).encode())
+
+    return digest.hexdigest()
+
+
+def cache_key(data_path: Path, *code, **params) -> tuple[str, dict]:
+    """
+    Content address of a cache entry.
+
+    Parameters
+    ----------
+    data_path : Path
+        Raw dataset (file or columnar store); its content is
+        hashed, not its name or mtime.
+    *code
+        Modules or functions whose source shapes the cached items.
+    **params
+        Build parameters (JSON-serializable).
+
+    Returns
+    -------
+    tuple[str, dict]
+        Key and the inputs it was derived from.
+    """
+
+    inputs = {
+        "format_version": FORMAT_VERSION,
+        "dataset_sha256": dataset_fingerprint(data_path),
+        "code_version": code_version(feature_builder, *code),
+        "pandas": pd.__version__,
+        "sklearn": sklearn.__version__,
+        **params,
+    }
+
+    key = hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()[:32]
+
+    return key, inputs
+
+
+# ---------- items ----------
+
+def _save_item(entry_dir: Path, name: str, value) -> dict:
+    if isinstance(value, pd.DataFrame):
+        value.to_parquet(entry_dir / f"{name}.parquet")
+        return {"kind": "frame", "files": [f"{name}.parquet"]}
+
+    if isinstance(value, pd.Series):
+        value.to_frame().to_parquet(entry_dir / f"{name}.parquet")
+        return {"kind": "series", "files": [f"{name}.parquet"]}
+
+    if sp.issparse(value):
+        value = sp.csr_matrix(value)
+        files = []
+
+        for part in CSR_PARTS:
+            np.save(entry_dir / f"{name}.{part}.npy", getattr(value, part), allow_pickle=False)
+            files.append(f"{name}.{part}.npy")
+
+        return {"kind": "csr", "files": files, "shape": list(value.shape)}
+
+    if isinstance(value, np.ndarray):
+        np.save(entry_dir / f"{name}.npy", value, allow_pickle=False)
+        return {"kind": "array", "files": [f"{name}.npy"]}
+
+    path = entry_dir / f"{name}.pkl"
+
+    with open(path, "wb") as f:
+        pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    return {"kind": "pickle", "files": [path.name], "sha256": file_sha256(path)}
+
+
+def _load_item(entry_dir: Path, spec: dict):
+    kind = spec["kind"]
+    paths = [entry_dir / name for name in spec["files"]]
+
+    if kind == "frame":
+        return pd.read_parquet(paths[0])
+
+    if kind == "series":
+        return pd.read_parquet(paths[0]).iloc[:, 0]
+
+    if kind == "csr":
+        parts = [np.load(path, allow_pickle=False) for path in paths]
+        return sp.csr_matrix(tuple(parts), shape=tuple(spec["shape"]))
+
+    if kind == "array":
+        return np.load(paths[0], allow_pickle=False)
+
+    # Only unpickle the file this cache wrote
+    if file_sha256(paths[0]) != spec["sha256"]:
+        raise ValueError(f"Checksum mismatch for cached {paths[0]}")
+
+    with open(paths[0], "rb") as f:
+        return pickle.load(f)
+
+
+# ---------- entries ----------
+
+def load_entry(key: str) -> dict | None:
+    """
+    Load a cached entry, or None on a miss (or an unreadable entry).
+    """
+
+    entry_dir = CACHE_DIR / key
+    entry_path = entry_dir / ENTRY_FILE
+
+    if not entry_path.exists():
+        return None
+
+    try:
+        with open(entry_path, "r") as f:
+            entry = json.load(f)
+
+        items = {name: _load_item(entry_dir, spec) for name, spec in entry["items"].items()}
+    except Exception as e:
+        logger.warning(f"Feature cache entry {key} unreadable, rebuilding: {e}")
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        return None
+
+    # Recency for LRU eviction
+    os.utime(entry_path)
+
+    return items
+
+
+def save_entry(key: str, items: dict, inputs: dict) -> int:
+    """
+    Write an entry next to its final path and rename it into place,
+    so readers never see a partial entry.
+
+    Returns
+    -------
+    int
+        Size of the entry in bytes.
+    """
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+    entry_dir = CACHE_DIR / key
+    tmp_dir = CACHE_DIR / f".{key}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir()
+
+    specs = {name: _save_item(tmp_dir, name, value) for name, value in items.items()}
+    size = sum(path.stat().st_size for path in tmp_dir.iterdir())
+
+    with open(tmp_dir / ENTRY_FILE, "w") as f:
+        json.dump({"key": key, "inputs": inputs, "items": specs, "size_bytes": size}, f, indent=2)
+
+    try:
+        os.rename(tmp_dir, entry_dir)
+    except OSError:
+        # Another run stored the same entry first
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    return size
+
+
+def list_entries() -> list[dict]:
+    """
+    Cached entries, least recently used first.
+    """
+
+    entries = []
+
+    for entry_path in CACHE_DIR.glob(f"*/{ENTRY_FILE}"):
+        with open(entry_path, "r") as f:
+            entry = json.load(f)
+
+        entries.append({
+            "key": entry["key"],
+            "size_bytes": entry["size_bytes"],
+            "last_used": entry_path.stat().st_mtime,
+        })
+
+    return sorted(entries, key=lambda entry: entry["last_used"])
+
+
+def evict(max_bytes: int = MAX_BYTES, keep: str | None = None) -> list[str]:
+    """
+    Remove least recently used entries until the cache fits in `max_bytes`.
+    The entry `keep` (just written) is never evicted.
+    """
+
+    entries = list_entries()
+    total = sum(entry["size_bytes"] for entry in entries)
+    evicted = []
+
+    for entry in entries:
+        if total <= max_bytes:
+            break
+
+        if entry["key"] == keep:
+            continue
+
+        shutil.rmtree(CACHE_DIR / entry["key"], ignore_errors=True)
+        total -= entry["size_bytes"]
+        evicted.append(entry["key"])
+
+    if evicted:
+        logger.info(f"Feature cache evicted {len(evicted)} entries | size = {total / 2**20:.1f} MB")
+
+    return evicted
+
+
+def get_or_build(name: str, data_path: Path, build: Callable[[], dict], *code, **params) -> tuple[dict, dict]:
+    """
+    Cached items for (dataset, code, params), built and stored on a miss.
+
+    Returns
+    -------
+    tuple[dict, dict]
+        Items, and a report: hit/miss, key, seconds, size.
+    """
+
+    start = time.perf_counter()
+
+    # A missing dataset is reported by the build step itself
+    if not CACHE_CONFIG.get("enabled", False) or not Path(data_path).exists():
+        return build(), {"status": "disabled"}
+
+    key, inputs = cache_key(data_path, *code, **params)
+    items = load_entry(key)
+
+    if items is not None:
+        report = {"status": "hit", "key": key, "seconds": round(time.perf_counter() - start, 3)}
+        logger.info(f"Feature cache hit | {name} | key = {key} | {report['seconds']:.2f}s")
+        return items, report
+
+    items = build()
+    size = save_entry(key, items, inputs)
+    evict(keep=key)
+
+    report = {
+        "status": "miss",
+        "key": key,
+        "seconds": round(time.perf_counter() - start, 3),
+        "size_bytes": size,
+    }
+
+    logger.info(f"Feature cache miss | {name} | key = {key} | stored {size / 2**20:.1f} MB")
+
+    return items, report
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == "clear":
+        shutil.rmtree(CACHE_DIR, ignore_errors=True)
+        print(f"Cleared {CACHE_DIR}")
+    else:
+        entries = list_entries()
+
+        for entry in entries:
+            print(f"{entry['key']}  {entry['size_bytes'] / 2**20:8.1f} MB  {time.ctime(entry['last_used'])}")
+
+        print(f"{len(entries)} entries | {sum(e['size_bytes'] for e in entries) / 2**20:.1f} MB / {MAX_BYTES / 2**20:.0f} MB")
@@ -0,0 +1,17 @@
+"""
+Category Hashing
+
+Shared by the HashingEncoder (training) and the compiled scorer
+(serving); kept free of sklearn and pandas so the serving path can
+import it cheaply.
+"""
+
+import zlib
+
+
+def hash_bucket(value: str, width: int) -> int:
+    """
+    Stable bucket of a category (crc32; Python's hash() is salted per process).
+    """
+
+    return zlib.crc32(value.encode("utf-8")) % width
@@ -0,0 +1,227 @@
+"""
+Batch Scoring
+
+Scores many inference records with a single pass of
+feature building, validation and predict_proba.
+
+Records that fail request validation or the model's validation
+plan are reported individually and never fail the rest of the batch.
+"""
+
+import pandas as pd
+from pydantic import ValidationError
+
+from churn_system.features.build_features import build_features
+
+
+def format_validation_error(error: ValidationError) -> str:
+    """
+    Flatten a pydantic ValidationError into a short message.
+    """
+
+    parts = []
+
+    for item in error.errors():
+        location = ".".join(str(loc) for loc in item["loc"])
+        parts.append(f"{location}: {item['msg']}")
+
+    return "; ".join(parts)
+
+
+def validate_records(records: list, request_model):
+    """
+    Validate raw records against the API request model.
+
+    Returns
+    -------
+    tuple[list[int], list[dict], dict[int, str]]
+        Positions of valid records, their validated payloads,
+        and error messages keyed by input position.
+    """
+
+    positions = []
+    payloads = []
+    errors = {}
+
+    for position, record in enumerate(records):
+
+        if not isinstance(record, dict):
+            errors[position] = "Record must be a JSON object"
+            continue
+
+        try:
+            payload = request_model.model_validate(record)
+        except ValidationError as e:
+            errors[position] = format_validation_error(e)
+            continue
+
+        positions.append(position)
+        payloads.append(payload.model_dump())
+
+    return positions, payloads, errors
+
+
+def validate_rows(rows: list, row_model, columns: list):
+    """
+    Validate array-encoded records (feature values in `columns` order)
+    against the model's row validator.
+
+    Returns
+    -------
+    tuple[list[int], list[dict], dict[int, str]]
+        Same as validate_records.
+    """
+
+    positions = []
+    payloads = []
+    errors = {}
+
+    for position, row in enumerate(rows):
+
+        if not isinstance(row, list) or len(row) != len(columns):
+            errors[position] = f"Record must be an array of {len(columns)} values"
+            continue
+
+        try:
+            values = row_model.validate_python(row)
+        except ValidationError as e:
+            errors[position] = "; ".join(
+                f"{columns[item['loc'][0]]}: {item['msg']}" for item in e.errors()
+            )
+            continue
+
+        positions.append(position)
+        payloads.append(dict(zip(columns, values)))
+
+    return positions, payloads, errors
+
+
+def predict_frame(model, payloads: list, validation_plan) -> tuple:
+    """
+    Build features, validate and score all payloads at once.
+
+    Returns
+    -------
+    tuple[list, dict[int, str]]
+        Probabilities in payload order (None for invalid rows),
+        and the validation errors keyed by payload position.
+    """
+
+    df = pd.DataFrame(payloads)
+    df = build_features(df, training=False)
+    X, errors = validation_plan.validate(df)
+
+    probabilities = [None] * len(payloads)
+
+    if len(X):
+        valid = (p for p in range(len(payloads)) if p not in errors)
+
+        for position, prob in zip(valid, model.predict_proba(X)[:, 1].tolist()):
+            probabilities[position] = prob
+
+    return probabilities, errors
+
+
+def predict_isolated(model, payloads: list, validation_plan):
+    """
+    Score payloads one by one so a failing record
+    cannot take down the rest of the batch.
+
+    Only used when the vectorized pass fails.
+    """
+
+    probabilities = []
+    errors = {}
+
+    for position, payload in enumerate(payloads):
+        try:
+            probs, row_errors = predict_frame(model, [payload], validation_plan)
+        except Exception as e:
+            probs, row_errors = [None], {0: str(e)}
+
+        probabilities.append(probs[0])
+
+        if row_errors:
+            errors[position] = row_errors[0]
+
+    return probabilities, errors
+
+
+def score_records(
+    model,
+    records: list,
+    request_model,
+    threshold: float,
+    validation_plan,
+    row_model=None,
+):
+    """
+    Score a batch of raw records.
+
+    Parameters
+    ----------
+    model :
+        Fitted pipeline exposing predict_proba.
+    records : list
+        Raw request records: dicts, or value arrays when `row_model` is given.
+    request_model :
+        Pydantic model used to validate every record.
+    threshold : float
+        Decision threshold for the positive class.
+    validation_plan : ValidationPlan
+        The model's column order and per-column checks.
+    row_model : TypeAdapter, optional
+        Validator of array-encoded records, in the plan's column order.
+
+    Returns
+    -------
+    tuple[list[dict], list[dict], list[float], list[int]]
+        Per-record results in input order, plus the valid payloads
+        with their probabilities and predictions for logging.
+    """
+
+    results = [None] * len(records)
+
+    if row_model is not None:
+        positions, payloads, errors = validate_rows(records, row_model, validation_plan.columns)
+    else:
+        positions, payloads, errors = validate_records(records, request_model)
+
+    for position, message in errors.items():
+        results[position] = {"index": position, "error": message}
+
+    if not payloads:
+        return results, [], [], []
+
+    try:
+        probabilities, scoring_errors = predict_frame(model, payloads, validation_plan)
+    except Exception:
+        probabilities, scoring_errors = predict_isolated(model, payloads, validation_plan)
+
+    logged_payloads = []
+    logged_probs = []
+    logged_preds = []
+
+    for offset, position in enumerate(positions):
+
+        if offset in scoring_errors:
+            results[position] = {
+                "index": position,
+                "error": scoring_errors[offset],
+            }
+            continue
+
+        prob = probabilities[offset]
+        prediction = int(prob >= threshold)
+
+        results[position] = {
+            "index": position,
+            "churn_probability": round(float(prob), 4),
+            "prediction": prediction,
+        }
+
+        logged_payloads.append(payloads[offset])
+        logged_probs.append(prob)
+        logged_preds.append(prediction)
+
+    return results, logged_payloads, logged_probs, logged_preds
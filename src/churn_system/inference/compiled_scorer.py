@@ -0,0 +1,505 @@
+"""
+Compiled Scorer
+
+NumPy-only version of the production pipeline for single-row scoring.
+
+The fitted sklearn Pipeline is compiled once into plain arrays:
+
+- StandardScaler      → means and scales of the numeric columns
+- OneHotEncoder       → category → feature index maps
+- FrequencyEncoder    → category → frequency maps
+- HashingEncoder      → crc32 bucket offsets
+- LogisticRegression  → coefficients and intercept
+- GradientBoosting /
+  RandomForest        → packed tree ensemble (see tree_ensemble.py)
+
+Scoring a request is then a few dict lookups and array operations,
+with no DataFrame, ColumnTransformer or sklearn input validation.
+
+Records the compiled path cannot reproduce exactly (wrong value types,
+missing values) are not scored here; callers fall back to the pipeline.
+"""
+
+import math
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from churn_system.features.build_features import ZERO_FILLED_COLUMNS
+from churn_system.features.hashing import hash_bucket
+from churn_system.inference.model_artifact import (
+    has_component,
+    load_component,
+    load_pipeline,
+    save_component,
+)
+from churn_system.inference.tree_ensemble import PARITY_TOLERANCE, TreeEnsemble, expit
+from churn_system.logging.logger import get_logger
+from churn_system.config.config import CONFIG
+
+logger = get_logger(__name__, CONFIG["logging"]["api"])
+
+COMPONENT = "compiled_scorer"
+FORMAT_VERSION = 4
+
+
+class CompiledScorer:
+    """
+    Compiled preprocessing + estimator, scored from raw feature dicts.
+    """
+
+    def __init__(self, arrays: dict, ensemble: TreeEnsemble | None = None):
+        self.arrays = arrays
+        self.ensemble = ensemble
+
+        self.kind = str(arrays["kind"])
+        self.n_features = int(arrays["n_features"])
+
+        # ---------- numeric block ----------
+        self.numeric_columns = [str(c) for c in arrays["numeric_columns"]]
+        self.numeric_index = arrays["numeric_index"]
+        self.means = arrays["means"]
+        self.scales = arrays["scales"]
+        self.zero_filled = {
+            c for c in self.numeric_columns if c in ZERO_FILLED_COLUMNS
+        }
+
+        # ---------- one-hot block ----------
+        self.categorical_columns = [str(c) for c in arrays["categorical_columns"]]
+
+        categories = arrays["categories"]
+        is_text = arrays["category_is_text"]
+        offsets = arrays["category_offsets"]
+        bases = arrays["category_index"]
+
+        self.category_maps = [
+            {
+                str(categories[k]): int(bases[j]) + k - int(offsets[j])
+                for k in range(offsets[j], offsets[j + 1])
+                if is_text[k]
+            }
+            for j in range(len(self.categorical_columns))
+        ]
+
+        # ---------- frequency block ----------
+        self.frequency_columns = [str(c) for c in arrays["frequency_columns"]]
+        self.frequency_index = arrays["frequency_index"]
+
+        values = arrays["frequency_values"]
+        weights = arrays["frequency_weights"]
+        offsets = arrays["frequency_offsets"]
+
+        self.frequency_maps = [
+            {
+                str(values[k]): float(weights[k])
+                for k in range(offsets[j], offsets[j + 1])
+            }
+            for j in range(len(self.frequency_columns))
+        ]
+
+        # ---------- hash block ----------
+        self.hash_columns = [str(c) for c in arrays["hash_columns"]]
+        self.hash_index = [int(i) for i in arrays["hash_index"]]
+        self.hash_width = int(arrays["hash_width"])
+
+        # Positions of the dense values returned by transform_record
+        self.dense_index = np.concatenate([self.numeric_index, self.frequency_index])
+
+        # ---------- estimator ----------
+        if self.kind == "linear":
+            self.coef = arrays["coef"]
+            self.dense_coef = self.coef[self.dense_index]
+            self.intercept = float(arrays["intercept"])
+
+        elif self.kind == "trees":
+            if ensemble is None:
+                raise ValueError("Tree scorer requires its tree ensemble")
+
+        else:
+            raise ValueError(f"Unknown compiled scorer kind: {self.kind}")
+
+    # ---------- preprocessing ----------
+
+    def transform_record(self, record: dict):
+        """
+        Dense values (scaled numerics, then category frequencies) and
+        active indicator indices (one-hot, hashed) of one record.
+
+        Returns None when the record needs the full pipeline
+        (non-numeric numbers, non-string categories, missing values).
+        """
+
+        values = []
+
+        for col in self.numeric_columns:
+            value = record.get(col)
+
+            # build_features fills unparseable Total Charges with 0
+            if col in self.zero_filled and (
+                value is None or (isinstance(value, float) and math.isnan(value))
+            ):
+                value = 0.0
+
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                return None
+
+            if not math.isfinite(value):
+                return None
+
+            values.append(value)
+
+        scaled = (np.array(values, dtype=np.float64) - self.means) / self.scales
+
+        active = []
+
+        for col, categories in zip(self.categorical_columns, self.category_maps):
+            value = record.get(col)
+
+            if not isinstance(value, str):
+                return None
+
+            index = categories.get(value)
+
+            # Unknown categories encode as all zeros (handle_unknown="ignore")
+            if index is not None:
+                active.append(index)
+
+        frequencies = []
+
+        for col, weights in zip(self.frequency_columns, self.frequency_maps):
+            value = record.get(col)
+
+            if not isinstance(value, str):
+                return None
+
+            # Unseen categories have frequency 0
+            frequencies.append(weights.get(value, 0.0))
+
+        for col, base in zip(self.hash_columns, self.hash_index):
+            value = record.get(col)
+
+            if not isinstance(value, str):
+                return None
+
+            active.append(base + hash_bucket(value, self.hash_width))
+
+        if frequencies:
+            return np.concatenate([scaled, frequencies]), active
+
+        return scaled, active
+
+    # ---------- scoring ----------
+
+    def score_record(self, record: dict) -> float | None:
+        """
+        Churn probability of one raw feature dict, or None when the
+        record has to go through the pipeline instead.
+        """
+
+        transformed = self.transform_record(record)
+
+        if transformed is None:
+            return None
+
+        dense, active = transformed
+
+        if self.kind == "linear":
+            raw = self.intercept + dense @ self.dense_coef + self.coef[active].sum()
+            return float(expit(raw))
+
+        return self._score_trees(dense, active)
+
+    def _score_trees(self, dense: np.ndarray, active: list) -> float:
+        x = np.zeros(self.n_features, dtype=np.float64)
+        x[self.dense_index] = dense
+        x[active] = 1.0
+
+        return self.ensemble.predict_row(x)
+
+    def predict_records(self, records: list) -> np.ndarray:
+        """
+        Probabilities for many records (NaN where the pipeline is needed).
+        """
+
+        scores = [self.score_record(r) for r in records]
+
+        return np.array([np.nan if s is None else s for s in scores])
+
+    # ---------- persistence ----------
+
+    def save(self, model_dir: Path) -> Path:
+        """
+        Save the scorer; tree models also save their tree ensemble.
+        """
+
+        path = save_component(model_dir, COMPONENT, self.arrays, FORMAT_VERSION)
+
+        if self.ensemble is not None:
+            self.ensemble.save(model_dir)
+
+        return path
+
+    @classmethod
+    def load(cls, model_dir: Path, verify: bool = True) -> "CompiledScorer":
+        """
+        Memory-map the compiled scorer of a model directory.
+        """
+
+        arrays = load_component(model_dir, COMPONENT, FORMAT_VERSION, verify=verify)
+
+        ensemble = None
+        if str(arrays["kind"]) == "trees":
+            ensemble = TreeEnsemble.load(model_dir, verify=verify)
+
+        return cls(arrays, ensemble)
+
+
+# ---------- compilation ----------
+
+def compile_pipeline(pipeline) -> CompiledScorer:
+    """
+    Compile a fitted preprocessor + estimator Pipeline.
+
+    Raises
+    ------
+    NotImplementedError
+        For preprocessing steps or estimators the compiler does not support.
+    """
+
+    # sklearn is only needed to compile: loading a saved scorer never imports it
+    from sklearn.linear_model import LogisticRegression
+
+    preprocessor = pipeline.named_steps["preprocessor"]
+    estimator = pipeline.named_steps["model"]
+
+    arrays = _compile_preprocessor(preprocessor)
+
+    if isinstance(estimator, LogisticRegression):
+        if estimator.coef_.shape[0] != 1:
+            raise NotImplementedError("Only binary logistic regression is supported")
+
+        arrays.update({
+            "kind": np.array("linear"),
+            "coef": estimator.coef_[0].astype(np.float64),
+            "intercept": np.array(estimator.intercept_[0], dtype=np.float64),
+        })
+
+        return CompiledScorer(arrays)
+
+    arrays["kind"] = np.array("trees")
+
+    return CompiledScorer(arrays, TreeEnsemble.from_estimator(estimator))
+
+
+def _compile_preprocessor(preprocessor) -> dict:
+    from sklearn.compose import ColumnTransformer
+    from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+    from churn_system.features.encoding import FrequencyEncoder, HashingEncoder
+
+    if not isinstance(preprocessor, ColumnTransformer):
+        raise NotImplementedError(f"Unsupported preprocessor: {type(preprocessor).__name__}")
+
+    numeric_columns, numeric_index, means, scales = [], [], [], []
+    categorical_columns, categories, is_text, offsets, category_index = [], [], [], [0], []
+    frequency_columns, frequency_values, frequency_weights, frequency_offsets, frequency_index = [], [], [], [0], []
+    hash_columns, hash_index, hash_width = [], [], 0
+
+    position = 0
+
+    for name, transformer, columns in preprocessor.transformers_:
+
+        if transformer == "drop":
+            continue
+
+        columns = list(columns)
+
+        if isinstance(transformer, StandardScaler):
+            n = len(columns)
+
+            numeric_columns += columns
+            numeric_index += range(position, position + n)
+            means += list(transformer.mean_ if transformer.with_mean else np.zeros(n))
+            scales += list(transformer.scale_ if transformer.with_std else np.ones(n))
+
+            position += n
+
+        elif isinstance(transformer, OneHotEncoder):
+            if transformer.drop is not None or transformer.handle_unknown != "ignore":
+                raise NotImplementedError("Only OneHotEncoder(handle_unknown='ignore') without drop")
+
+            if getattr(transformer, "infrequent_categories_", None) is not None and any(
+                c is not None for c in transformer.infrequent_categories_
+            ):
+                raise NotImplementedError("Infrequent categories are not supported")
+
+            for col, cats in zip(columns, transformer.categories_):
+                categorical_columns.append(col)
+                category_index.append(position)
+
+                # Only string categories can match string inputs
+                categories += [c if isinstance(c, str) else "" for c in cats]
+                is_text += [isinstance(c, str) for c in cats]
+                offsets.append(offsets[-1] + len(cats))
+
+                position += len(cats)
+
+        elif isinstance(transformer, FrequencyEncoder):
+            for col, weights in zip(columns, transformer.frequencies_):
+                frequency_columns.append(col)
+                frequency_index.append(position)
+
+                # Only string categories can match string inputs
+                text = {c: w for c, w in weights.items() if isinstance(c, str)}
+                frequency_values += list(text)
+                frequency_weights += list(text.values())
+                frequency_offsets.append(frequency_offsets[-1] + len(text))
+
+                position += 1
+
+        elif isinstance(transformer, HashingEncoder):
+            hash_width = transformer.width
+
+            for col in columns:
+                hash_columns.append(col)
+                hash_index.append(position)
+
+                position += hash_width
+
+        else:
+            raise NotImplementedError(f"Unsupported transformer: {name}")
+
+    return {
+        "n_features": np.array(position),
+        "numeric_columns": np.array(numeric_columns, dtype=str),
+        "numeric_index": np.array(numeric_index, dtype=np.intp),
+        "means": np.array(means, dtype=np.float64),
+        "scales": np.array(scales, dtype=np.float64),
+        "categorical_columns": np.array(categorical_columns, dtype=str),
+        "categories": np.array(categories, dtype=str),
+        "category_is_text": np.array(is_text, dtype=bool),
+        "category_offsets": np.array(offsets, dtype=np.intp),
+        "category_index": np.array(category_index, dtype=np.intp),
+        "frequency_columns": np.array(frequency_columns, dtype=str),
+        "frequency_values": np.array(frequency_values, dtype=str),
+        "frequency_weights": np.array(frequency_weights, dtype=np.float64),
+        "frequency_offsets": np.array(frequency_offsets, dtype=np.intp),
+        "frequency_index": np.array(frequency_index, dtype=np.intp),
+        "hash_columns": np.array(hash_columns, dtype=str),
+        "hash_index": np.array(hash_index, dtype=np.intp),
+        "hash_width": np.array(hash_width),
+    }
+
+
+# ---------- parity ----------
+
+def check_parity(scorer: CompiledScorer, pipeline, X: pd.DataFrame) -> dict:
+    """
+    Compare compiled and pipeline probabilities on model-ready rows.
+
+    Every row is scored as-is and once more with all categories
+    replaced by unseen values, to cover unknown-category handling.
+
+    Returns
+    -------
+    dict
+        rows checked, rows that needed the pipeline, max abs difference.
+    """
+
+    unseen = X.copy()
+    for col in scorer.categorical_columns + scorer.frequency_columns + scorer.hash_columns:
+        if col in unseen.columns:
+            unseen[col] = "__unseen__"
+
+    frames = pd.concat([X, unseen], ignore_index=True)
+
+    expected = pipeline.predict_proba(frames)[:, 1]
+    compiled = scorer.predict_records(frames.to_dict(orient="records"))
+
+    scored = ~np.isnan(compiled)
+
+    return {
+        "rows": int(len(frames)),
+        "fallback_rows": int((~scored).sum()),
+        "max_abs_difference": float(
+            np.abs(compiled[scored] - expected[scored]).max() if scored.any() else 0.0
+        ),
+    }
+
+
+def export_compiled_scorer(pipeline, model_dir: Path, X: pd.DataFrame) -> Path | None:
+    """
+    Compile a trained pipeline, verify it against predict_proba on X
+    and save it next to model.pkl.
+
+    Unsupported pipelines and parity failures are logged and skipped;
+    the API then serves through the pipeline.
+    """
+
+    try:
+        scorer = compile_pipeline(pipeline)
+    except NotImplementedError as e:
+        logger.warning(f"Compiled scorer not exported: {e}")
+        return None
+
+    parity = check_parity(scorer, pipeline, X)
+
+    if parity["max_abs_difference"] > PARITY_TOLERANCE:
+        logger.error(f"Compiled scorer failed parity check: {parity}")
+        return None
+
+    path = scorer.save(model_dir)
+
+    logger.info(f"Compiled scorer exported to {path} | parity = {parity}")
+
+    return path
+
+
+def load_compiled_scorer(model_dir: Path) -> CompiledScorer | None:
+    """
+    Load the compiled scorer of a model directory, or None.
+
+    Models exported without one (or with an older format) are not
+    compiled here: that would unpickle the pipeline at load time and
+    serve without the parity check. They serve through the pipeline
+    until `python -m churn_system.inference.compiled_scorer export`.
+    """
+
+    if not has_component(model_dir, COMPONENT):
+        logger.info(f"No compiled scorer in {model_dir}; serving through the pipeline")
+        return None
+
+    try:
+        return CompiledScorer.load(model_dir)
+    except Exception as e:
+        logger.error(f"Failed to load compiled scorer, serving through the pipeline: {e}")
+        return None
+
+
+if __name__ == "__main__":
+    import sys
+
+    from churn_system.features.build_features import build_features
+    from churn_system.lifecycle.registry import resolve_production_dir
+
+    if len(sys.argv) != 2 or sys.argv[1] not in ("export", "verify"):
+        print("Usage: python -m churn_system.inference.compiled_scorer [export|verify]")
+        sys.exit(1)
+
+    production_dir = resolve_production_dir()
+
+    production_pipeline = load_pipeline(production_dir)
+
+    reference = build_features(pd.read_csv(CONFIG["paths"]["training_reference"]))
+
+    if sys.argv[1] == "export":
+        print(export_compiled_scorer(production_pipeline, production_dir, reference))
+    else:
+        production_scorer = load_compiled_scorer(production_dir)
+
+        if production_scorer is None:
+            print("No compiled scorer exported for the production model")
+            sys.exit(1)
+
+        print(check_parity(production_scorer, production_pipeline, reference))
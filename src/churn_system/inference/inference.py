@@ -1,15 +1,13 @@
-import pickle
 import pandas as pd
 import json
 from pathlib import Path
 
 from churn_system.schema import validate_inference_data
+from churn_system.inference.model_artifact import load_pipeline
+from churn_system.lifecycle.registry import resolve_production_dir
 
 # Load trained pipeline
-with open(
-    "models/experiments/churn_model_v1/model.pkl", "rb"
-) as f:
-    model = pickle.load(f)
+model = load_pipeline(Path("models/experiments/churn_model_v1"))
 
 # FULL inference payload (must match training features)
 data = {
@@ -49,7 +47,7 @@ data = {
 
 
 def load_feature_contract():
-    metadata_path = Path("models/production/current/metadata.json")
+    metadata_path = resolve_production_dir() / "metadata.json"
 
     if not metadata_path.exists():
         raise RuntimeError("Metadata file missing in production model")
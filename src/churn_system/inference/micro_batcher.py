@@ -0,0 +1,189 @@
+"""
+Micro-Batching Request Coalescer
+
+Collects concurrent single-row prediction requests and
+scores them with one predict_proba call.
+
+The sklearn pipeline has a high fixed cost per call
+(ColumnTransformer + OneHotEncoder + estimator), so scoring
+N queued rows together is much cheaper than N separate calls.
+Each caller still receives only its own rows.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import pandas as pd
+
+from churn_system.logging.logger import get_logger
+from churn_system.config.config import CONFIG
+
+logger = get_logger(__name__, CONFIG["logging"]["api"])
+
+_STOP = object()
+
+
+class MicroBatcher:
+    """
+    Dynamic batcher in front of a fitted model.
+
+    A request waits at most `max_wait_ms` for other requests
+    to join its batch, and a batch never exceeds `max_batch_size` rows.
+
+    Requests may name their own model (e.g. the version they started
+    with during a hot reload); a batch is scored per model.
+    """
+
+    def __init__(self, model, max_batch_size: int = 64, max_wait_ms: float = 5):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """
+        Start the scoring thread (idempotent).
+        """
+
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+
+            self._thread = threading.Thread(
+                target=self._run,
+                name="micro-batcher",
+                daemon=True,
+            )
+            self._thread.start()
+
+        logger.info(
+            f"Micro-batcher started | max_batch_size = {self.max_batch_size} "
+            f"| max_wait_ms = {self.max_wait * 1000:.1f}"
+        )
+
+    def stop(self):
+        """
+        Score everything already queued, then stop the scoring thread.
+        """
+
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+
+        if thread is None:
+            return
+
+        self._queue.put(_STOP)
+        thread.join()
+
+        logger.info("Micro-batcher stopped.")
+
+    def predict_proba(self, df: pd.DataFrame, model=None):
+        """
+        Queue rows for batched scoring and wait for their probabilities.
+
+        Drop-in replacement for model.predict_proba; `model` overrides
+        the batcher's default model for these rows.
+        """
+
+        if self._thread is None:
+            self.start()
+
+        future = Future()
+        self._queue.put((df, future, model if model is not None else self.model))
+
+        return future.result()
+
+    def _run(self):
+        stopping = False
+
+        while not stopping:
+            item = self._queue.get()
+
+            if item is _STOP:
+                break
+
+            batch = [item]
+            rows = len(item[0])
+            deadline = time.monotonic() + self.max_wait
+
+            while rows < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+
+                if remaining <= 0:
+                    break
+
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+                if item is _STOP:
+                    stopping = True
+                    break
+
+                batch.append(item)
+                rows += len(item[0])
+
+            self._score(batch)
+
+        self._drain()
+
+    def _drain(self):
+        """
+        Score requests that were queued after the stop signal.
+        """
+
+        batch = []
+
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if item is not _STOP:
+                batch.append(item)
+
+        if batch:
+            self._score(batch)
+
+    def _score(self, batch: list):
+        groups = {}
+
+        for item in batch:
+            groups.setdefault(id(item[2]), []).append(item)
+
+        for items in groups.values():
+            self._score_group(items[0][2], items)
+
+    def _score_group(self, model, batch: list):
+        if len(batch) == 1:
+            self._score_single(*batch[0])
+            return
+
+        try:
+            X = pd.concat([df for df, _, _ in batch], ignore_index=True)
+            probs = model.predict_proba(X)
+        except Exception:
+            # One bad request must not fail the others in its batch
+            for item in batch:
+                self._score_single(*item)
+            return
+
+        offset = 0
+
+        for df, future, _ in batch:
+            future.set_result(probs[offset:offset + len(df)])
+            offset += len(df)
+
+    def _score_single(self, df: pd.DataFrame, future: Future, model):
+        try:
+            future.set_result(model.predict_proba(df))
+        except Exception as e:
+            future.set_exception(e)
@@ -0,0 +1,337 @@
+"""
+Model Artifact
+
+Memory-mappable model artifacts with a JSON manifest:
+
+    <model_dir>/
+        model.pkl                      fitted sklearn pipeline (fallback path)
+        manifest.json                  files, dtypes, shapes, sha256 checksums
+        arrays/<component>/<name>.npy  numeric arrays of compiled components
+
+Components (compiled scorer, tree ensemble) are plain .npy files
+saved without pickle and loaded with mmap_mode="r": every worker
+process maps the same page-cached file instead of holding a private
+copy, and loading costs a few page faults instead of a full read.
+
+The manifest also records the sha256 of model.pkl, so the pickle
+is only unpickled when it is the file training wrote. LazyPipeline
+defers unpickling until a request actually needs sklearn.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from churn_system.logging.logger import get_logger
+from churn_system.config.config import CONFIG
+
+logger = get_logger(__name__, CONFIG["logging"]["api"])
+
+MANIFEST_FILE = "manifest.json"
+ARRAYS_DIR = "arrays"
+PIPELINE_FILE = "model.pkl"
+FORMAT_VERSION = 1
+
+HASH_BLOCK_BYTES = 1 << 20
+
+
+class ArtifactError(ValueError):
+    """
+    Missing, incompatible or corrupted model artifact.
+    """
+
+
+# ---------- checksums ----------
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_BYTES), b""):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
+def verify_file(path: Path, entry: dict):
+    actual = file_sha256(path)
+
+    if actual != entry["sha256"]:
+        raise ArtifactError(
+            f"Checksum mismatch for {path} | expected = {entry['sha256']} | actual = {actual}"
+        )
+
+
+# ---------- manifest ----------
+
+def read_manifest(model_dir: Path) -> dict | None:
+    path = Path(model_dir) / MANIFEST_FILE
+
+    if not path.exists():
+        return None
+
+    with open(path, "r") as f:
+        manifest = json.load(f)
+
+    if manifest.get("format_version") != FORMAT_VERSION:
+        raise ArtifactError(f"Unsupported artifact format in {path}")
+
+    return manifest
+
+
+def write_manifest(model_dir: Path, manifest: dict):
+    """
+    Replace the manifest atomically, so readers never see half of it.
+    """
+
+    path = Path(model_dir) / MANIFEST_FILE
+    tmp = path.with_suffix(".tmp")
+
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    os.replace(tmp, path)
+
+
+def update_manifest(model_dir: Path, **entries):
+    manifest = read_manifest(model_dir) or {
+        "format_version": FORMAT_VERSION,
+        "components": {},
+    }
+
+    for key, value in entries.items():
+        if key == "components":
+            manifest["components"].update(value)
+        else:
+            manifest[key] = value
+
+    write_manifest(model_dir, manifest)
+
+
+# ---------- array components ----------
+
+def save_component(model_dir: Path, component: str, arrays: dict, format_version: int) -> Path:
+    """
+    Save a component's arrays as .npy files and register them in the manifest.
+
+    Returns
+    -------
+    Path
+        Directory holding the component's arrays.
+    """
+
+    component_dir = Path(model_dir) / ARRAYS_DIR / component
+    component_dir.mkdir(parents=True, exist_ok=True)
+
+    files = {}
+
+    for name, array in arrays.items():
+        array = np.asarray(array)
+        path = component_dir / f"{name}.npy"
+
+        # Object arrays would need pickle to load: refuse them
+        np.save(path, array, allow_pickle=False)
+
+        files[name] = {
+            "file": str(path.relative_to(model_dir)),
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+            "sha256": file_sha256(path),
+        }
+
+    update_manifest(
+        model_dir,
+        components={component: {"format_version": format_version, "arrays": files}},
+    )
+
+    return component_dir
+
+
+def has_component(model_dir: Path, component: str) -> bool:
+    try:
+        manifest = read_manifest(model_dir)
+    except (ArtifactError, ValueError):
+        return False
+
+    return manifest is not None and component in manifest["components"]
+
+
+def load_component(model_dir: Path, component: str, format_version: int, verify: bool = True) -> dict:
+    """
+    Memory-map a component's arrays.
+
+    Parameters
+    ----------
+    verify : bool
+        Check every file against its manifest sha256 first
+        (reads the files once, which also warms the page cache).
+
+    Raises
+    ------
+    ArtifactError
+        Unknown component, format version, dtype or shape, or checksum mismatch.
+    """
+
+    model_dir = Path(model_dir)
+    manifest = read_manifest(model_dir)
+
+    if manifest is None or component not in manifest["components"]:
+        raise ArtifactError(f"No {component} artifact in {model_dir}")
+
+    entry = manifest["components"][component]
+
+    if entry["format_version"] != format_version:
+        raise ArtifactError(f"Unsupported {component} format in {model_dir}")
+
+    arrays = {}
+
+    for name, spec in entry["arrays"].items():
+        path = model_dir / spec["file"]
+
+        if verify:
+            verify_file(path, spec)
+
+        array = np.load(path, mmap_mode="r", allow_pickle=False)
+
+        if array.dtype.str != spec["dtype"] or list(array.shape) != spec["shape"]:
+            raise ArtifactError(f"Unexpected dtype or shape in {path}")
+
+        arrays[name] = array
+
+    return arrays
+
+
+# ---------- pipeline ----------
+
+def save_pipeline(pipeline, model_dir: Path) -> Path:
+    """
+    Pickle the fitted pipeline and record its checksum in the manifest.
+    """
+
+    path = Path(model_dir) / PIPELINE_FILE
+
+    with open(path, "wb") as f:
+        pickle.dump(pipeline, f)
+
+    update_manifest(model_dir, pipeline={"file": PIPELINE_FILE, "sha256": file_sha256(path)})
+
+    return path
+
+
+def load_pipeline(model_dir: Path, verify: bool = True):
+    """
+    Unpickle the fitted pipeline of a model directory.
+
+    When the manifest records a checksum, the file is verified before
+    it is unpickled. Models saved before manifests existed are loaded
+    unverified.
+
+    Raises
+    ------
+    ArtifactError
+        If the checksum does not match.
+    """
+
+    model_dir = Path(model_dir)
+    path = model_dir / PIPELINE_FILE
+
+    manifest = read_manifest(model_dir)
+    entry = (manifest or {}).get("pipeline")
+
+    if verify:
+        if entry is not None:
+            verify_file(path, entry)
+        else:
+            logger.warning(f"No checksum recorded for {path}; loading unverified")
+
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+class LazyPipeline:
+    """
+    Fitted pipeline that is unpickled on first use.
+
+    Workers that only serve the compiled fast path never pay for
+    unpickling or hold a private copy of the model. The checksum is
+    still verified up front, so a corrupted model.pkl fails at startup.
+    """
+
+    def __init__(self, model_dir: Path, verify: bool = True):
+        self.model_dir = Path(model_dir)
+        self.verify = verify
+
+        self._pipeline = None
+        self._lock = threading.Lock()
+
+        entry = (read_manifest(self.model_dir) or {}).get("pipeline")
+
+        if verify and entry is not None:
+            verify_file(self.model_dir / PIPELINE_FILE, entry)
+
+    @property
+    def loaded(self) -> bool:
+        return self._pipeline is not None
+
+    def load(self):
+        if self._pipeline is None:
+            with self._lock:
+                if self._pipeline is None:
+                    logger.info(f"Loading pipeline from {self.model_dir / PIPELINE_FILE}")
+                    self._pipeline = load_pipeline(self.model_dir, verify=self.verify)
+
+        return self._pipeline
+
+    def __getattr__(self, name):
+        # Only called for attributes not set in __init__
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        return getattr(self.load(), name)
+
+
+def verify_artifact(model_dir: Path) -> dict:
+    """
+    Check every file listed in the manifest.
+
+    Returns
+    -------
+    dict
+        relative file path → "ok" or the error message.
+    """
+
+    model_dir = Path(model_dir)
+    manifest = read_manifest(model_dir)
+
+    if manifest is None:
+        raise ArtifactError(f"No manifest in {model_dir}")
+
+    entries = [spec for c in manifest["components"].values() for spec in c["arrays"].values()]
+    if "pipeline" in manifest:
+        entries.append(manifest["pipeline"])
+
+    report = {}
+
+    for entry in entries:
+        try:
+            verify_file(model_dir / entry["file"], entry)
+            report[entry["file"]] = "ok"
+        except (ArtifactError, OSError) as e:
+            report[entry["file"]] = str(e)
+
+    return report
+
+
+if __name__ == "__main__":
+    import sys
+
+    from churn_system.lifecycle.registry import resolve_production_dir
+
+    target = Path(sys.argv[1]) if len(sys.argv) > 1 else resolve_production_dir()
+
+    print(json.dumps(verify_artifact(target), indent=2))
@@ -4,34 +4,57 @@ import json
 
 from churn_system.logging.logger import get_logger
 from churn_system.config.config import CONFIG
+from churn_system.lifecycle.registry import resolve_production_dir
 
 logger = get_logger(__name__, CONFIG["logging"]["api"])
 
 _METADATA_CACHE = None
+_METADATA_DIR = None
 
 
 def load_model_contract():
     """
     Load Production model metadata once and cache it.
+
+    The cache follows the production pointer: a promotion or
+    rollback to another experiment loads that model's contract.
     """
     
-    global _METADATA_CACHE
+    global _METADATA_CACHE, _METADATA_DIR
+
+    production_dir = resolve_production_dir()
 
-    if _METADATA_CACHE is not None:
+    if _METADATA_CACHE is not None and _METADATA_DIR == production_dir:
         return _METADATA_CACHE
     
-    metadata_path = Path(CONFIG["paths"]["production_model"]).parent / "metadata.json"
+    metadata_path = production_dir / "metadata.json"
     
     if not metadata_path.exists():
         raise FileNotFoundError(f"Production metadata not found: {metadata_path}")
     
     with open(metadata_path, "r") as f:
         _METADATA_CACHE = json.load(f)
+
+    _METADATA_DIR = production_dir
         
     logger.info("Model Contract loaded into memory.")
     
     return _METADATA_CACHE
 
+def set_model_contract(metadata: dict, model_dir: Path):
+    """
+    Replace the cached contract, e.g. after the API hot-reloaded
+    a newly promoted model.
+    """
+
+    global _METADATA_CACHE, _METADATA_DIR
+
+    _METADATA_CACHE = metadata
+    _METADATA_DIR = Path(model_dir)
+
+    logger.info(f"Model Contract replaced | version = {metadata.get('model_version')}")
+
+
 def get_feature_schema():
     """
     Return feature schema expected by deployed model.
@@ -0,0 +1,328 @@
+"""
+Validation Plan
+
+Inference-time data contract of one model version, compiled once
+from its training data and saved next to the model:
+
+    <model_dir>/validation_plan.json
+
+- columns     : model features in training order (metadata.json)
+- numeric     : training dtype, min / max and whether nulls were seen
+- categorical : the categories seen in training (columns with more
+                than `validation.max_categories` are not checked)
+
+`ValidationPlan.validate` checks a whole frame with vectorized column
+operations and returns the valid rows, coerced and already in training
+column order, with one error message per invalid row. Missing feature
+columns and a present target column fail the whole frame.
+
+Unseen categories and out-of-range numbers are scored by default (the
+encoders ignore unseen categories); `validation.unknown_categories`
+and `validation.out_of_range` set to "reject" turn them into row errors.
+`ValidationPlan.record_error` applies those two checks to a single
+request record, for the compiled scoring path that builds no frame.
+
+Models trained before plans existed get a fallback plan: numeric
+dtypes and nullability from the training reference, so non-numeric
+values are still row errors, without ranges or categories (the
+reference may come from a later training run).
+"""
+
+import json
+import math
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from churn_system.config.config import CONFIG
+from churn_system.features.build_features import TARGET_COLUMN, ZERO_FILLED_COLUMNS
+from churn_system.logging.logger import get_logger
+
+logger = get_logger(__name__, CONFIG["logging"]["api"])
+
+VALIDATION_CONFIG = CONFIG["validation"]
+
+PLAN_FILE = "validation_plan.json"
+FORMAT_VERSION = 1
+
+
+class ValidationPlan:
+    """
+    Ordered feature columns plus per-column checks for one model version.
+
+    Parameters
+    ----------
+    columns : list
+        Model features in training order.
+    numeric : dict, optional
+        column → {"dtype", "min", "max", "nullable"}
+    categorical : dict, optional
+        column → {"categories": list | None}
+    """
+
+    def __init__(self, columns: list, numeric: dict | None = None, categorical: dict | None = None):
+        self.columns = list(columns)
+        self.numeric = numeric or {}
+        self.categorical = categorical or {}
+
+        self.reject_unknown = VALIDATION_CONFIG["unknown_categories"] == "reject"
+        self.reject_out_of_range = VALIDATION_CONFIG["out_of_range"] == "reject"
+
+        # Lookup structures built once, not per call
+        self._column_set = frozenset(self.columns)
+        self._allowed = {
+            col: pd.Index(spec["categories"])
+            for col, spec in self.categorical.items()
+            if spec.get("categories") is not None
+        }
+        self._allowed_sets = {col: frozenset(allowed) for col, allowed in self._allowed.items()}
+
+    # ---------- validation ----------
+
+    def check_columns(self, df: pd.DataFrame):
+        """
+        Raise ValueError when the frame cannot be scored at all.
+        """
+
+        if not self._column_set.issubset(df.columns):
+            missing = [c for c in self.columns if c not in df.columns]
+            raise ValueError(f"Missing required model features at inference: {missing}")
+
+        if TARGET_COLUMN in df.columns:
+            raise ValueError(
+                f"Target column '{TARGET_COLUMN}' must not appear at inference"
+            )
+
+    def validate(self, df: pd.DataFrame) -> tuple:
+        """
+        Validate and coerce a built feature frame.
+
+        Returns
+        -------
+        tuple[pd.DataFrame, dict[int, str]]
+            Valid rows in training column order, and error messages
+            keyed by row position in `df`.
+
+        Raises
+        ------
+        ValueError
+            If a feature column is missing or the target column is present.
+        """
+
+        self.check_columns(df)
+
+        # Request records already arrive in training order: no column copy then
+        X = df if df.columns.tolist() == self.columns else df[self.columns]
+
+        problems = []
+        coerced = {}
+
+        for col, spec in self.numeric.items():
+            values = X[col].to_numpy()
+            missing = None
+
+            if values.dtype.kind not in "iufb":
+                missing = pd.isna(values)
+                numbers = pd.to_numeric(X[col], errors="coerce").to_numpy()
+                problems.append((col, "not a number", np.isnan(numbers) & ~missing))
+                values = coerced[col] = numbers
+            elif values.dtype.kind == "f":
+                missing = np.isnan(values)
+
+            if missing is not None and not spec["nullable"]:
+                problems.append((col, "missing value", missing))
+
+            if self.reject_out_of_range and spec["min"] is not None:
+                outside = (values < spec["min"]) | (values > spec["max"])
+                problems.append((col, f"outside training range [{spec['min']}, {spec['max']}]", outside))
+
+        if self.reject_unknown:
+            for col, allowed in self._allowed.items():
+                values = X[col]
+                unknown = ~values.isin(allowed) & values.notna()
+                problems.append((col, "unknown category", unknown.to_numpy()))
+
+        if coerced:
+            X = X.assign(**coerced)
+
+        invalid = np.logical_or.reduce([mask for _, _, mask in problems]) if problems else None
+
+        if invalid is None or not invalid.any():
+            return X, {}
+
+        errors = {}
+
+        # Messages only for the failing rows
+        for position in np.flatnonzero(invalid):
+            errors[int(position)] = "; ".join(
+                f"{col}: {message}" for col, message, mask in problems if mask[position]
+            )
+
+        return X[~invalid], errors
+
+    def record_error(self, record: dict) -> str | None:
+        """
+        Error message of one request record under the range and category
+        checks of `validate`, or None when it passes.
+
+        Types and nulls are already enforced by the request model
+        generated from this plan, so only the opt-in rejections are
+        checked; nothing is checked when both are off.
+        """
+
+        problems = []
+
+        if self.reject_out_of_range:
+            for col, spec in self.numeric.items():
+                value = record.get(col)
+
+                # build_features fills these before validation
+                if col in ZERO_FILLED_COLUMNS and value is None:
+                    value = 0
+
+                if spec["min"] is None or value is None or value != value:
+                    continue
+
+                if value < spec["min"] or value > spec["max"]:
+                    problems.append(f"{col}: outside training range [{spec['min']}, {spec['max']}]")
+
+        if self.reject_unknown:
+            for col, allowed in self._allowed_sets.items():
+                value = record.get(col)
+
+                if value is not None and value not in allowed:
+                    problems.append(f"{col}: unknown category")
+
+        return "; ".join(problems) or None
+
+    def select(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Validated frame in training column order; any invalid row fails the call.
+        """
+
+        X, errors = self.validate(df)
+
+        if errors:
+            position, message = next(iter(errors.items()))
+            row = f" at row {position}" if len(df) > 1 else ""
+            raise ValueError(f"Invalid inference data{row}: {message}")
+
+        return X
+
+    # ---------- persistence ----------
+
+    def to_dict(self) -> dict:
+        return {
+            "format_version": FORMAT_VERSION,
+            "columns": self.columns,
+            "numeric": self.numeric,
+            "categorical": self.categorical,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ValidationPlan":
+        if data.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported validation plan format: {data.get('format_version')}")
+
+        return cls(data["columns"], data["numeric"], data["categorical"])
+
+    def save(self, model_dir: Path) -> Path:
+        path = Path(model_dir) / PLAN_FILE
+
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+        return path
+
+
+def _json_number(value):
+    value = float(value)
+    return value if math.isfinite(value) else None
+
+
+def build_validation_plan(X: pd.DataFrame, max_categories: int | None = None) -> ValidationPlan:
+    """
+    Compile the plan from the training features (output of build_features).
+    """
+
+    if max_categories is None:
+        max_categories = VALIDATION_CONFIG["max_categories"]
+
+    numeric = {}
+    categorical = {}
+
+    for col in X.columns:
+        values = X[col]
+
+        if pd.api.types.is_numeric_dtype(values.dtype) and not pd.api.types.is_bool_dtype(values.dtype):
+            numeric[col] = {
+                "dtype": values.dtype.name,
+                "min": _json_number(values.min()) if values.notna().any() else None,
+                "max": _json_number(values.max()) if values.notna().any() else None,
+                "nullable": bool(values.isna().any()),
+            }
+            continue
+
+        categories = values.dropna().unique()
+
+        categorical[col] = {
+            "categories": (
+                sorted(str(c) for c in categories)
+                if len(categories) <= max_categories else None
+            ),
+        }
+
+    return ValidationPlan(list(X.columns), numeric, categorical)
+
+
+def fallback_validation_plan(feature_schema: list) -> ValidationPlan:
+    """
+    Plan for a model without one: numeric dtypes and nullability from
+    the training reference, no ranges or category lists. Column-only
+    when the reference is missing or lacks a feature.
+    """
+
+    path = Path(CONFIG["paths"]["training_reference"])
+
+    if not path.exists():
+        logger.warning(f"No training reference at {path}; checking columns only")
+        return ValidationPlan(feature_schema)
+
+    reference = pd.read_csv(path)
+    missing = [c for c in feature_schema if c not in reference.columns]
+
+    if missing:
+        logger.warning(f"Training reference lacks model features {missing}; checking columns only")
+        return ValidationPlan(feature_schema)
+
+    plan = build_validation_plan(reference[list(feature_schema)])
+
+    numeric = {
+        col: {**spec, "min": None, "max": None}
+        for col, spec in plan.numeric.items()
+    }
+    categorical = {col: {"categories": None} for col in plan.categorical}
+
+    return ValidationPlan(feature_schema, numeric, categorical)
+
+
+def load_validation_plan(model_dir: Path, feature_schema: list) -> ValidationPlan:
+    """
+    The plan saved with the model, or a fallback plan for older models.
+    """
+
+    path = Path(model_dir) / PLAN_FILE
+
+    if not path.exists():
+        logger.info(f"No validation plan in {model_dir}; using dtypes of the training reference")
+        return fallback_validation_plan(feature_schema)
+
+    with open(path, "r") as f:
+        plan = ValidationPlan.from_dict(json.load(f))
+
+    if plan.columns != list(feature_schema):
+        logger.error(f"Validation plan columns differ from the feature schema in {model_dir}; using the fallback plan")
+        return fallback_validation_plan(feature_schema)
+
+    return plan
@@ -9,7 +9,6 @@ from pathlib import Path
 from datetime import datetime, timezone
 
 LINEAGE_PATH = Path("models/lineage/lineage.json")
-LINEAGE_PATH.parent.mkdir(parents=True, exist_ok=True)
 
 def load_lineage():
     if LINEAGE_PATH.exists():
@@ -18,6 +17,8 @@ def load_lineage():
     return []
 
 def save_lineage(data):
+    LINEAGE_PATH.parent.mkdir(parents=True, exist_ok=True)
+
     with open(LINEAGE_PATH, "w") as f:
         json.dump(data,f,indent=2)
         
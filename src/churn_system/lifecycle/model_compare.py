@@ -12,9 +12,9 @@ from pathlib import Path
 from churn_system.logging.logger import get_logger
 from churn_system.config.config import CONFIG
 from churn_system.lifecycle.schema_compare import compare_feature_schemas
+from churn_system.lifecycle.registry import production_version, resolve_production_dir
 
 
-PRODUCTION_MODEL = Path("models/production/current/metadata.json")
 EXPERIMENTS_DIR = Path("models/experiments")
 
 logger = get_logger(__name__, CONFIG["logging"]["lifecycle"])
@@ -57,17 +57,28 @@ def compare_models():
     challenger_meta = latest / "metadata.json"
     challenger_metrics = load_metrics(challenger_meta)
 
+    production_meta = resolve_production_dir() / "metadata.json"
+
     # First deployment case
-    if not PRODUCTION_MODEL.exists():
+    if not production_meta.exists():
         logger.info("No production model found. Auto-promoting first model.")
         return True
 
-    champion_metrics = load_metrics(PRODUCTION_MODEL)
+    champion_metrics = load_metrics(production_meta)
+
+    # Incremental challengers carry the champion's score on their own
+    # holdout; compare on that when it was measured against this champion
+    with open(challenger_meta, "r") as f:
+        comparison = json.load(f).get("comparison")
+
+    if comparison and comparison.get("parent_model") == production_version():
+        logger.info("Comparing on the challenger's holdout (incremental update).")
+        champion_metrics = comparison["champion_metrics"]
 
 
     try:
         schema_report = compare_feature_schemas(
-            PRODUCTION_MODEL,
+            production_meta,
             challenger_meta
         )
 
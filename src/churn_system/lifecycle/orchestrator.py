@@ -7,13 +7,7 @@ Runs monitoring pipeline and decides whether model retraining should be executed
 import json
 from pathlib import Path
 
-from requests import get
-
-from churn_system.lifecycle.model_compare import compare_models
 from churn_system.monitoring.model_health import evaluate_model_health
-from churn_system.training.train import main as train_model
-from churn_system.new_data.retraining_data import build_retraining_dataset
-from churn_system.lifecycle.promote import promote_model
 from churn_system.logging.logger import get_logger
 from churn_system.lifecycle.rollback import rollback_if_needed
 from churn_system.config.config import CONFIG
@@ -39,14 +33,36 @@ def run_lifecycle():
     with open(HEALTH_FILE, "r") as f:
         report = json.load(f)
 
+    # A freshly promoted model that is unhealthy is reverted first;
+    # retraining, if still needed, runs on the restored model next time
+    if rollback_if_needed():
+        print("\n Production model rolled back - retraining deferred to the next run.")
+        print("\n --- Evaluation is Completed ---")
+        return
+
     retrain_needed = report.get("retraining_recommended", False)
 
     if retrain_needed:
-        print("\n Drift Identified - preparing retraining data.")
-        build_retraining_dataset()
+        # The training stack (sklearn, search, encoders) is only
+        # imported when a run actually retrains
+        from churn_system.lifecycle.model_compare import compare_models
+        from churn_system.lifecycle.promote import promote_model
+        from churn_system.new_data.retraining_data import build_retraining_dataset
+        from churn_system.training.incremental import update_production_model
+        from churn_system.training.train import main as train_model
+
+        challenger = None
 
-        print("Started retraining...")
-        train_model()
+        if CONFIG["lifecycle"]["retraining_mode"] == "incremental":
+            print("\n Drift Identified - updating production model with new data.")
+            challenger = update_production_model()
+
+        if challenger is None:
+            print("\n Drift Identified - preparing retraining data.")
+            build_retraining_dataset()
+
+            print("Started retraining...")
+            train_model()
 
         print("Evaluating challenger model...")
 
@@ -64,8 +80,6 @@ def run_lifecycle():
     else:
         print("\n Model healthy, No retraining triggered.")
 
-    rollback_if_needed()
-
     print("\n --- Evaluation is Completed ---")
 
     
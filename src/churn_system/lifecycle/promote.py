@@ -1,10 +1,13 @@
-import shutil
 import json
-from pathlib import Path
 
 from churn_system.logging.logger import get_logger
 from churn_system.config.config import CONFIG
 from churn_system.lifecycle.lineage import record_lineage
+from churn_system.lifecycle.registry import (
+    EXPERIMENTS_DIR,
+    production_version,
+    set_production,
+)
 
 logger = get_logger(__name__, CONFIG["logging"]["lifecycle"])
 
@@ -19,49 +22,26 @@ def promote_model(version: str):
             Example: "churn_model_v1"
 
         1. Checks whether the requested experiment exists.
-        2. Removes the existing production model (if any).
-        3. Copies the selected experiment info for production.
-        4. Makes the promoted model the one used by the API.
+        2. Atomically points the production pointer at it (no copy).
+        3. Makes the promoted model the one used by the API
+           (running workers pick it up through hot reload).
 
         Note :
             if the requested model version does not exist it raises ValueError.
 
-        The API Always loads models from the production directory, never directly from experiments.
+        The API Always loads models through the production pointer, never by scanning experiments.
     """
 
-    experiments_dir = Path(CONFIG["paths"]["experiments_dir"])
-    production_dir = Path(CONFIG["paths"]["production_model"]).parent
+    metadata_path = EXPERIMENTS_DIR / version / "metadata.json"
 
-    source = experiments_dir / version
-    target = production_dir
+    parent_model = production_version()
 
-    if not source.exists():
-        raise ValueError(f"Model version {version} does not exist.")
-
-    metadata_path = source / "metadata.json"
-
-    if not metadata_path.exists():
-        raise ValueError("metadata.json missing for experiment.")
+    # Raises RegistryError (a ValueError) for unknown versions
+    set_production(version)
 
     with open(metadata_path, "r") as f:
         metadata = json.load(f)
 
-    parent_model = None
-    existing_metadata = target / "metadata.json"
-
-    if existing_metadata.exists():
-        try:
-            with open(existing_metadata, "r") as f:
-                parent_data = json.load(f)
-                parent_model = parent_data.get("model_version")
-        except Exception:
-            parent_model = "unknown"
-
-    if target.exists():
-        shutil.rmtree(target)
-
-    shutil.copytree(source, target)
-
     logger.info(f"Model {version} promoted to production.")
 
     record_lineage(
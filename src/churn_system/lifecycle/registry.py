@@ -0,0 +1,234 @@
+"""
+Model Registry
+
+Experiments in models/experiments/ are immutable once trained.
+Production is a pointer to one of them:
+
+    models/production/CURRENT.json
+    {
+        "version": "churn_model_20260227_131235",
+        "path": "models/experiments/churn_model_20260227_131235",
+        "digest": "sha256 of the experiment's content",
+        "digest_format": 2,
+        "promoted_at": "...",
+        "previous": "churn_model_20260226_003030"
+    }
+
+Promotion and rollback rewrite this small file and atomically rename
+it into place. Nothing is copied, and there is no moment without a
+production model. The digest pins the content: an experiment that
+changed after promotion no longer resolves as production.
+
+Deployments without a pointer keep using the copied
+models/production/current directory.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+from churn_system.logging.logger import get_logger
+from churn_system.config.config import CONFIG
+
+logger = get_logger(__name__, CONFIG["logging"]["lifecycle"])
+
+POINTER_PATH = Path(CONFIG["paths"]["production_pointer"])
+LEGACY_PRODUCTION_DIR = Path(CONFIG["paths"]["production_model"]).parent
+EXPERIMENTS_DIR = Path(CONFIG["paths"]["experiments_dir"])
+
+# Written by model_artifact.py; already lists a sha256 per artifact file
+MANIFEST_FILE = "manifest.json"
+
+# Files outside the manifest that serving reads: metadata, the validation
+# plan (inference/validation_plan.py) and the drift reference (monitoring/drift_state.py)
+DIGEST_FILES = ["metadata.json", "validation_plan.json", "drift_reference.json"]
+DIGEST_FORMAT = 2
+
+# Pointers written before DIGEST_FORMAT only hashed the metadata next to the manifest
+LEGACY_DIGEST_FILES = ["metadata.json"]
+
+
+class RegistryError(ValueError):
+    """
+    Unknown version, or production pointer that does not match its model.
+    """
+
+
+# ---------- content digest ----------
+
+def model_digest(model_dir: Path, digest_files: list = DIGEST_FILES) -> str:
+    """
+    Content address of a model directory.
+
+    Directories with an artifact manifest hash the manifest (which holds
+    the sha256 of every artifact) plus `digest_files` that exist. Older
+    directories hash every file.
+    """
+
+    model_dir = Path(model_dir)
+    digest = hashlib.sha256()
+
+    if (model_dir / MANIFEST_FILE).exists():
+        files = [model_dir / MANIFEST_FILE] + [model_dir / name for name in digest_files]
+    else:
+        files = sorted(p for p in model_dir.rglob("*") if p.is_file())
+
+    for path in files:
+        if not path.exists():
+            continue
+
+        digest.update(str(path.relative_to(model_dir)).encode())
+
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+
+    return digest.hexdigest()
+
+
+# ---------- pointer ----------
+
+def read_pointer() -> dict | None:
+    if not POINTER_PATH.exists():
+        return None
+
+    with open(POINTER_PATH, "r") as f:
+        return json.load(f)
+
+
+def write_pointer(pointer: dict):
+    """
+    Write the pointer next to its final path and rename it into place.
+    Readers see either the old or the new pointer, never a partial one.
+    """
+
+    POINTER_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = POINTER_PATH.with_suffix(".tmp")
+
+    with open(tmp, "w") as f:
+        json.dump(pointer, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(tmp, POINTER_PATH)
+
+
+def resolve_production_dir() -> Path:
+    """
+    Directory of the production model: the pointer's experiment,
+    or the legacy copied directory when no pointer exists.
+    """
+
+    pointer = read_pointer()
+
+    if pointer is None:
+        return LEGACY_PRODUCTION_DIR
+
+    return Path(pointer["path"])
+
+
+def verify_production(pointer: dict | None = None) -> Path:
+    """
+    Resolve production and check the experiment still has the promoted content.
+
+    Raises
+    ------
+    RegistryError
+        If the experiment is missing or its digest changed.
+    """
+
+    pointer = read_pointer() if pointer is None else pointer
+
+    if pointer is None:
+        return LEGACY_PRODUCTION_DIR
+
+    model_dir = Path(pointer["path"])
+
+    if not model_dir.exists():
+        raise RegistryError(f"Production model {pointer['version']} missing at {model_dir}")
+
+    if pointer.get("digest_format") == DIGEST_FORMAT:
+        digest = model_digest(model_dir)
+    else:
+        logger.warning(
+            f"Production pointer {pointer['version']} does not pin the validation plan "
+            f"and drift reference; promote it again to include them"
+        )
+        digest = model_digest(model_dir, LEGACY_DIGEST_FILES)
+
+    if digest != pointer["digest"]:
+        raise RegistryError(
+            f"Production model {pointer['version']} changed after promotion "
+            f"| expected = {pointer['digest']} | actual = {digest}"
+        )
+
+    return model_dir
+
+
+def production_version() -> str | None:
+    """
+    Experiment name currently in production, if any.
+    """
+
+    pointer = read_pointer()
+
+    if pointer is not None:
+        return pointer["version"]
+
+    metadata_path = LEGACY_PRODUCTION_DIR / "metadata.json"
+
+    if not metadata_path.exists():
+        return None
+
+    with open(metadata_path, "r") as f:
+        return f"churn_model_{json.load(f).get('model_version')}"
+
+
+# ---------- promotion ----------
+
+def set_production(version: str) -> dict:
+    """
+    Point production at an experiment in O(1): no files are copied.
+
+    Raises
+    ------
+    RegistryError
+        If the experiment or its metadata.json does not exist.
+    """
+
+    model_dir = EXPERIMENTS_DIR / version
+
+    if not model_dir.exists():
+        raise RegistryError(f"Model version {version} does not exist.")
+
+    if not (model_dir / "metadata.json").exists():
+        raise RegistryError("metadata.json missing for experiment.")
+
+    pointer = {
+        "version": version,
+        "path": str(model_dir),
+        "digest": model_digest(model_dir),
+        "digest_format": DIGEST_FORMAT,
+        "promoted_at": datetime.now(timezone.utc).isoformat(),
+        "previous": production_version(),
+    }
+
+    write_pointer(pointer)
+
+    logger.info(f"Production pointer -> {version} | digest = {pointer['digest'][:12]}")
+
+    return pointer
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) == 1:
+        print(json.dumps(read_pointer(), indent=2))
+    elif sys.argv[1] == "verify":
+        print(verify_production())
+    else:
+        print("Usage: python -m churn_system.lifecycle.registry [verify]")
+        sys.exit(1)
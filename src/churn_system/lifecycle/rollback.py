@@ -2,60 +2,100 @@
 Automatic Rollback System.
 
 Reverts production model if current model is marked unhealthy.
+
+Only a model the lifecycle promoted recently is rolled back, to the
+model it replaced, and only on a health report computed for that
+model. The rollback is recorded in the lineage, so the restored model
+is not rolled back again; if it is unhealthy too, the next run retrains.
 """
 
 import json
-import shutil
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 from churn_system.logging.logger import get_logger
 from churn_system.config.config import CONFIG
+from churn_system.lifecycle.lineage import load_lineage, record_lineage
+from churn_system.lifecycle.registry import RegistryError, production_version, set_production
 
 logger = get_logger(__name__, CONFIG["logging"]["lifecycle"])
 
-LINEAGE_PATH = Path("models/lineage/lineage.json")
 HEALTH_PATH = Path("models/monitoring/health_report.json")
 
+ROLLBACK_TRIGGER = "rollback"
+
 
-def rollback_if_needed():
+def rollback_if_needed() -> bool:
     """
     Roll back production model if health check fails.
+
+    Returns
+    -------
+    bool
+        True when production was pointed back to the previous model.
     """
 
     if not HEALTH_PATH.exists():
         logger.info("No health report found. Skipping rollback.")
-        return
+        return False
 
     with open(HEALTH_PATH, "r") as f:
         health = json.load(f)
 
+    current = production_version()
+
+    if health.get("model_version") != current:
+        logger.info(
+            f"Health report is for {health.get('model_version')}, production is {current}. Skipping rollback."
+        )
+        return False
+
     if not health.get("retraining_recommended", False):
         logger.info("Model healthy. No rollback required.")
-        return
+        return False
 
-    if not LINEAGE_PATH.exists():
-        logger.error("No lineage history available.")
-        return
+    entries = [e for e in load_lineage() if e["model_version"] == current]
 
-    with open(LINEAGE_PATH, "r") as f:
-        lineage = json.load(f)
+    if not entries:
+        logger.info(f"{current} was not promoted by the lifecycle. No rollback.")
+        return False
 
-    if len(lineage) < 2:
+    promotion = entries[-1]
+
+    if promotion["trigger"] == ROLLBACK_TRIGGER:
+        logger.info(f"{current} was restored by a rollback. Leaving it to retraining.")
+        return False
+
+    previous_model = promotion.get("parents_model")
+
+    if previous_model is None:
         logger.error("No previous model available for rollback.")
-        return
+        return False
 
-    previous_model = lineage[-2]["model_version"]
+    window = timedelta(hours=CONFIG["lifecycle"]["rollback_window_hours"])
 
-    experiments_dir = Path(CONFIG["paths"]["experiments_dir"])
-    production_dir = Path(CONFIG["paths"]["production_model"]).parent / "current"
+    if datetime.now(timezone.utc) - datetime.fromisoformat(promotion["timestamp"]) > window:
+        logger.info(f"{current} has served longer than {window}. Leaving it to retraining.")
+        return False
 
-    source = experiments_dir / previous_model
+    # O(1) pointer swap back to the previous experiment
+    try:
+        set_production(previous_model)
+    except RegistryError as e:
+        logger.error(f"Rollback failed: {e}")
+        return False
 
-    if not source.exists():
-        logger.error("Previous model folder missing.")
-        return
+    restored = [e for e in load_lineage() if e["model_version"] == previous_model]
 
-    shutil.rmtree(production_dir)
-    shutil.copytree(source, production_dir)
+    record_lineage(
+        model_version=previous_model,
+        metrics=restored[-1]["metrics"] if restored else {},
+        dataset_used=restored[-1]["dataset"] if restored else "unknown",
+        trigger=ROLLBACK_TRIGGER,
+        parent_model=current,
+    )
 
     logger.warning(f"Rollback completed -> restored {previous_model}")
+
+    return True
+
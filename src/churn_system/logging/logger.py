@@ -5,15 +5,32 @@ Supports:
 - Separate log files per subsystem
 - Console + file logging
 - Log rotation (prevents huge files)
+- Background writing for event-loop code (enable_background_logging)
 """
 
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
 
 LOG_DIR = Path("logs")
-LOG_DIR.mkdir(parents=True, exist_ok=True)
+
+
+class _LazyRotatingFileHandler(RotatingFileHandler):
+    """
+    Opens its file, creating the log directory, on the first record
+    rather than when the logger is created at import time.
+    """
+
+    def __init__(self, filename, **kwargs):
+        super().__init__(filename, delay=True, **kwargs)
+
+    def _open(self):
+        Path(self.baseFilename).parent.mkdir(parents=True, exist_ok=True)
+        return super()._open()
 
 
 def get_logger(name: str, logfile: str = "system.log") -> logging.Logger:
@@ -47,7 +64,7 @@ def get_logger(name: str, logfile: str = "system.log") -> logging.Logger:
 
     file_path = LOG_DIR / logfile
 
-    file_handler = RotatingFileHandler(
+    file_handler = _LazyRotatingFileHandler(
         file_path,
         maxBytes=5 * 1024 * 1024,  # 5 MB
         backupCount=3
@@ -64,3 +81,81 @@ def get_logger(name: str, logfile: str = "system.log") -> logging.Logger:
     logger.propagate = False
 
     return logger
+
+
+class _RoutingListener(QueueListener):
+    """
+    One background thread for many loggers: each record is handled
+    by the handlers its own logger had before it was queued.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.routes = {}
+
+    def handle(self, record):
+        for handler in self.routes.get(record.name, ()):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
+_listener = None
+_listener_pid = None
+
+
+def enable_background_logging(prefix: str = "churn_system", log_queue=None):
+    """
+    Move the file and console handlers of the loggers under `prefix`
+    to a background thread.
+
+    Logging then only puts the record on a queue, so an asyncio event
+    loop never blocks on disk or terminal writes. Loggers created
+    afterwards keep their direct handlers; call again to move them.
+
+    Parameters
+    ----------
+    prefix : str
+        Logger name prefix.
+    log_queue : multiprocessing queue, optional
+        Queue shared with worker processes forked afterwards. Their
+        records are written by this process only, so workers never
+        interleave or rotate the same log file concurrently.
+    """
+
+    global _listener, _listener_pid
+
+    if _listener is None:
+        if _listener_pid is not None:
+            # Forked worker: records already go to the parent's listener
+            return
+
+        _listener = _RoutingListener(log_queue if log_queue is not None else queue.SimpleQueue())
+        _listener_pid = os.getpid()
+        _listener.start()
+        atexit.register(_stop_listener)
+
+    for name, logger in list(logging.Logger.manager.loggerDict.items()):
+        if not name.startswith(prefix) or not isinstance(logger, logging.Logger):
+            continue
+
+        if not logger.handlers or isinstance(logger.handlers[0], QueueHandler):
+            continue
+
+        _listener.routes[name] = list(logger.handlers)
+        logger.handlers = [QueueHandler(_listener.queue)]
+
+
+def _stop_listener():
+    # Only the process that started the listener may stop it
+    if _listener is not None and _listener_pid == os.getpid():
+        _listener.stop()
+
+
+def _forget_listener_after_fork():
+    global _listener
+
+    # The listener thread does not exist in the child
+    _listener = None
+
+
+os.register_at_fork(after_in_child=_forget_listener_after_fork)
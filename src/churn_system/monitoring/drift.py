@@ -2,7 +2,8 @@
 Data Drift Detection Module
 
 Compares training data distribution with production
-inference data using Population Stability Index (PSI).
+inference data using Population Stability Index (PSI),
+for numeric and low-cardinality categorical features.
 
 PSI measures how much a feature's distribution has
 shifted between training and production data.
@@ -10,17 +11,20 @@ shifted between training and production data.
 
 import pandas as pd
 import numpy as np
-from pathlib import Path
 from churn_system.config.config import CONFIG
 from churn_system.logging.logger import get_logger
+from churn_system.monitoring.prediction_store import has_predictions
+from churn_system.monitoring.drift_state import (
+    build_reference,
+    count_frame,
+    compute_drift,
+    drift_report,
+    DRIFT_CONFIG,
+)
 
 logger = get_logger(__name__,CONFIG["logging"]["monitoring"])
 
 
-TRAIN_PATH = Path("data/training_reference.csv")
-PROD_PATH = Path("data/inference_logs/predictions.csv")
-
-
 PSI_THRESHOLD = 0.2
 
 
@@ -53,61 +57,81 @@ def calculate_psi(expected: pd.Series,
 
     actual_counts, _ = np.histogram(actual, bins=bin_edges)
 
-    expected_percents = expected_counts / len(expected)
-    actual_percents = actual_counts / len(actual)
+    # smoothing to avoid log(0)
+    e = np.maximum(expected_counts / len(expected), 1e-6)
+    a = np.maximum(actual_counts / len(actual), 1e-6)
+
+    return float(np.sum((a - e) * np.log(a / e)))
+
+
+def calculate_psi_frame(expected: pd.DataFrame,
+                        actual: pd.DataFrame,
+                        bins: int = 10,
+                        max_categories: int | None = None) -> dict:
+    """
+    Compute PSI for all shared features of two frames in one pass.
+
+    Numeric columns use histogram bins, object columns with at most
+    `max_categories` categories (default: drift.max_categories)
+    use category frequencies.
+
+    Parameters
+    ----------
+    expected : pd.DataFrame
+        Training distribution (reference).
+    actual : pd.DataFrame
+        Production distribution.
 
-    psi_values = []
+    Returns
+    -------
+    dict
+        {feature: {"type": "numeric" | "categorical", "psi": float | None, "samples": int}}
+    """
 
-    for e, a in zip(expected_percents, actual_percents):
-        # smoothing to avoid log(0)
-        e = max(e, 1e-6)
-        a = max(a, 1e-6)
+    shared = [c for c in expected.columns if c in actual.columns]
 
-        psi_values.append((a - e) * np.log(a / e))
+    if len(shared) < len(expected.columns):
+        expected = expected[shared]
 
-    return float(np.sum(psi_values))
+    reference = build_reference(expected, bins, max_categories)
+    production = count_frame(actual, reference)
 
+    return drift_report(reference, production)
 
 
-def detect_drift() -> None:
+def detect_drift(window_hours: float | None = None) -> None:
     """
     Compare training and production datasets and
     report feature-level drift.
+
+    PSI is computed from stored histogram counts
+    (see drift_state), optionally over a sliding window.
     """
 
-    if not TRAIN_PATH.exists() or not PROD_PATH.exists():
+    if not has_predictions():
         print(" Missing training or production data.")
         return
 
-    train_df = pd.read_csv(TRAIN_PATH)
-    prod_df = pd.read_csv(PROD_PATH)
-
-    numeric_cols = train_df.select_dtypes(include=np.number).columns
+    report = compute_drift(window_hours=window_hours or DRIFT_CONFIG["window_hours"])
 
-    if len(numeric_cols) == 0:
-        print(" No numeric columns found for drift detection.")
+    if not report:
+        print(" No reference features found for drift detection.")
         return
 
     print("\n----------- PSI Drift Report -----------")
 
-    for col in numeric_cols:
-
-        if col not in prod_df.columns:
-            continue
-
-        train_series = train_df[col].dropna()
-        prod_series = prod_df[col].dropna()
+    for col, result in report.items():
 
         # Skip if insufficient production data
-        if len(prod_series) < 20:
+        if result["samples"] < 20:
             print(f"{col:<22} |  insufficient production samples")
             continue
 
-        psi = calculate_psi(train_series, prod_series)
+        psi = result["psi"]
 
         status = " DRIFT" if psi > PSI_THRESHOLD else " STABLE"
 
-        print(f"{col:<22} | {status} | PSI={psi:.4f}")
+        print(f"{col:<22} | {result['type']:<11} | {status} | PSI={psi:.4f}")
 
     print("-----------------------------------------------\n")
 
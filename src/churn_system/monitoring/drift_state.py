@@ -0,0 +1,398 @@
+"""
+Incremental Drift State
+
+Keeps PSI inputs as histogram counts instead of raw data.
+
+- Reference bin edges and counts are computed once per model
+  (at training time, stored next to the model as drift_reference.json).
+- Production counts are computed once per prediction-log partition
+  and cached, so each logged row is binned only once.
+- PSI is then computed from summed counts in O(bins), no matter
+  how large the log grows, over any window of hour partitions.
+
+Numeric features are tracked as equal-width bins, low-cardinality
+categorical features as category frequencies (see psi.py).
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from churn_system.config.config import CONFIG
+from churn_system.logging.logger import get_logger
+from churn_system.monitoring.prediction_log_store import (
+    PartitionedPredictionStore,
+    partition_files,
+    to_utc_timestamp,
+)
+from churn_system.monitoring import prediction_store
+from churn_system.monitoring.psi import (
+    numeric_edges,
+    numeric_counts,
+    category_counts,
+    categorical_counts,
+    psi_segments,
+)
+
+logger = get_logger(__name__, CONFIG["logging"]["monitoring"])
+
+REFERENCE_FILE = "drift_reference.json"
+STATE_DIR = Path("models/monitoring/drift_state")
+TRAIN_PATH = Path("data/training_reference.csv")
+
+DRIFT_CONFIG = CONFIG["drift"]
+
+
+def feature_type(ref: dict) -> str:
+    # References saved before categorical support are numeric only
+    return ref.get("type", "numeric")
+
+
+def is_numeric_column(dtype) -> bool:
+    return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+
+
+def is_text_column(dtype) -> bool:
+    return (
+        pd.api.types.is_object_dtype(dtype)
+        or pd.api.types.is_string_dtype(dtype)
+        or isinstance(dtype, pd.CategoricalDtype)
+    )
+
+
+def numeric_arrays(frame: pd.DataFrame, columns: list) -> list:
+    """
+    One float64 array per column (NaN for missing or unparseable values).
+    """
+
+    arrays = []
+
+    for col in columns:
+        values = frame[col]
+
+        if not pd.api.types.is_numeric_dtype(values):
+            values = pd.to_numeric(values, errors="coerce")
+
+        arrays.append(values.to_numpy(dtype=np.float64, na_value=np.nan))
+
+    return arrays
+
+
+def build_reference(
+    df: pd.DataFrame,
+    bins: int | None = None,
+    max_categories: int | None = None,
+) -> dict:
+    """
+    Compute reference state for every numeric and low-cardinality
+    categorical column.
+
+    Numeric → bin edges and counts.
+    Categorical → categories and their counts (+ an empty "other" bucket).
+    Object columns with more than `max_categories` values are skipped.
+    """
+
+    bins = bins or DRIFT_CONFIG["bins"]
+    max_categories = max_categories or DRIFT_CONFIG["max_categories"]
+
+    features = {}
+
+    # Column dtypes are inspected directly; select_dtypes would copy the frame
+    numeric_cols = [
+        c for c, dtype in df.dtypes.items()
+        if is_numeric_column(dtype) and df[c].notna().any()
+    ]
+
+    if numeric_cols:
+        columns = numeric_arrays(df, numeric_cols)
+        edges = numeric_edges(columns, bins)
+        counts, totals = numeric_counts(columns, edges)
+
+        for j, col in enumerate(numeric_cols):
+            features[col] = {
+                "type": "numeric",
+                "edges": edges[j].tolist(),
+                "counts": counts[j].tolist(),
+                "total": int(totals[j]),
+            }
+
+    for col, dtype in df.dtypes.items():
+        if not is_text_column(dtype):
+            continue
+
+        codes, uniques = pd.factorize(df[col])
+
+        # High-cardinality columns (ids, free text) are not tracked
+        if len(uniques) > max_categories:
+            continue
+
+        labels = [str(u) for u in uniques]
+        categories = sorted(set(labels))
+
+        if not categories:
+            continue
+
+        features[col] = {
+            "type": "categorical",
+            "categories": categories,
+            "counts": category_counts(codes, labels, categories).tolist(),
+            "total": int(np.count_nonzero(codes >= 0)),
+        }
+
+    return {"bins": bins, "features": features}
+
+
+def save_reference(reference: dict, model_dir: Path):
+    with open(Path(model_dir) / REFERENCE_FILE, "w") as f:
+        json.dump(reference, f)
+
+
+def production_version() -> str:
+    from churn_system.inference.model_contract import load_model_contract
+
+    return str(load_model_contract().get("model_version", "unknown"))
+
+
+def load_reference() -> dict | None:
+    """
+    Load the reference histograms of the production model.
+
+    Models trained before drift references existed fall back to
+    binning training_reference.csv once and caching the result.
+    """
+
+    from churn_system.lifecycle.registry import resolve_production_dir
+
+    production_dir = resolve_production_dir()
+    path = production_dir / REFERENCE_FILE
+
+    if path.exists():
+        with open(path, "r") as f:
+            return json.load(f)
+
+    cached = STATE_DIR / f"reference_{production_version()}.json"
+
+    if cached.exists():
+        with open(cached, "r") as f:
+            return json.load(f)
+
+    if not TRAIN_PATH.exists():
+        return None
+
+    logger.info("No stored drift reference. Building from training reference data.")
+
+    reference = build_reference(pd.read_csv(TRAIN_PATH))
+
+    cached.parent.mkdir(parents=True, exist_ok=True)
+    with open(cached, "w") as f:
+        json.dump(reference, f)
+
+    return reference
+
+
+def count_frame(df: pd.DataFrame, reference: dict) -> dict:
+    """
+    Production counts for one frame of prediction logs,
+    all features in one vectorized pass per feature type.
+    """
+
+    counts = {}
+
+    numeric = [
+        col for col, ref in reference["features"].items()
+        if feature_type(ref) == "numeric" and col in df.columns
+    ]
+
+    if numeric:
+        edges = np.array([reference["features"][c]["edges"] for c in numeric])
+
+        c, totals = numeric_counts(numeric_arrays(df, numeric), edges)
+
+        for j, col in enumerate(numeric):
+            counts[col] = {"counts": c[j].tolist(), "total": int(totals[j])}
+
+    categorical = [
+        col for col, ref in reference["features"].items()
+        if feature_type(ref) == "categorical" and col in df.columns
+    ]
+
+    if categorical:
+        c, totals = categorical_counts(
+            df[categorical],
+            [reference["features"][col]["categories"] for col in categorical],
+        )
+
+        for j, col in enumerate(categorical):
+            counts[col] = {"counts": c[j].tolist(), "total": int(totals[j])}
+
+    return counts
+
+
+def partition_signature(directory: Path) -> list:
+    """
+    Identify partition contents; changes when files are added or compacted.
+    """
+
+    return sorted(
+        [p.name, p.stat().st_size] for p in partition_files(directory)
+    )
+
+
+def partition_counts(
+    store: PartitionedPredictionStore,
+    directory: Path,
+    reference: dict,
+    cache_dir: Path,
+) -> dict:
+    """
+    Bin counts for one hour partition, cached until the partition changes.
+    """
+
+    cache_path = cache_dir / f"{directory.parent.name}_{directory.name}.json"
+    signature = {
+        "files": partition_signature(directory),
+        "features": sorted(reference["features"]),
+    }
+
+    if cache_path.exists():
+        with open(cache_path, "r") as f:
+            cached = json.load(f)
+
+        if cached["signature"] == signature:
+            return cached["counts"]
+
+    df = store.read_partition(directory, columns=list(reference["features"]))
+    counts = count_frame(df, reference)
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    with open(cache_path, "w") as f:
+        json.dump({"signature": signature, "counts": counts}, f)
+
+    return counts
+
+
+def merge_counts(total: dict, part: dict):
+    for col, c in part.items():
+        if col not in total:
+            total[col] = {"counts": np.zeros(len(c["counts"]), dtype=np.int64), "total": 0}
+
+        total[col]["counts"] += np.asarray(c["counts"], dtype=np.int64)
+        total[col]["total"] += c["total"]
+
+
+def window_counts(reference: dict, start=None, end=None) -> dict:
+    """
+    Sum production bin counts over the [start, end) window.
+
+    Whole hour partitions come from the per-partition cache; partitions
+    cut by the window bounds are binned directly.
+    """
+
+    start = to_utc_timestamp(start)
+    end = to_utc_timestamp(end)
+
+    totals = {}
+
+    if prediction_store.BACKEND != "parquet":
+        df = prediction_store.load_predictions(
+            columns=list(reference["features"]), start=start, end=end
+        )
+        merge_counts(totals, count_frame(df, reference))
+        return totals
+
+    prediction_store.import_legacy_csv()
+
+    store = PartitionedPredictionStore(prediction_store.STORE_DIR)
+    cache_dir = STATE_DIR / production_version()
+
+    for directory in store.partitions(start, end):
+        hour = store.partition_hour(directory)
+
+        whole = (start is None or hour >= start) and (
+            end is None or hour + pd.Timedelta(hours=1) <= end
+        )
+
+        if whole:
+            part = partition_counts(store, directory, reference, cache_dir)
+        else:
+            df = store.read(
+                columns=list(reference["features"]),
+                start=max(start, hour) if start is not None else hour,
+                end=min(end, hour + pd.Timedelta(hours=1)) if end is not None else None,
+            )
+            part = count_frame(df, reference)
+
+        merge_counts(totals, part)
+
+    return totals
+
+
+def drift_report(reference: dict, production: dict) -> dict:
+    """
+    Per-feature PSI for every feature present in both states,
+    computed for all features at once.
+
+    Returns
+    -------
+    dict
+        {feature: {"type": str, "psi": float | None, "samples": int}}
+        psi is None when the window has no samples for the feature.
+    """
+
+    report = {}
+    scored = []
+
+    for col, ref in reference["features"].items():
+        if col not in production:
+            continue
+
+        samples = int(production[col]["total"])
+        report[col] = {"type": feature_type(ref), "psi": None, "samples": samples}
+
+        if samples > 0:
+            scored.append(col)
+
+    psi = psi_segments(
+        [reference["features"][c]["counts"] for c in scored],
+        [reference["features"][c]["total"] for c in scored],
+        [production[c]["counts"] for c in scored],
+        [production[c]["total"] for c in scored],
+    )
+
+    for col, value in zip(scored, psi):
+        report[col]["psi"] = float(value)
+
+    return report
+
+
+def compute_drift(start=None, end=None, window_hours: float | None = None) -> dict:
+    """
+    Feature-level PSI between the production model's reference
+    and the logged predictions in a time window.
+
+    Parameters
+    ----------
+    start, end : datetime or str, optional
+        Explicit [start, end) window.
+    window_hours : float, optional
+        Sliding window ending now (ignored when start is given).
+
+    Returns
+    -------
+    dict
+        Per-feature report, see drift_report.
+    """
+
+    reference = load_reference()
+
+    if reference is None:
+        return {}
+
+    if start is None and window_hours:
+        start = pd.Timestamp.now(tz="UTC") - pd.Timedelta(hours=window_hours)
+
+    production = window_counts(reference, start, end)
+
+    return drift_report(reference, production)
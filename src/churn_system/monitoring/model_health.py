@@ -7,20 +7,14 @@ model retraining should be triggered.
 
 import json
 from pathlib import Path
-from churn_system.monitoring.drift import calculate_psi
+from churn_system.monitoring.drift_state import compute_drift, DRIFT_CONFIG
+from churn_system.monitoring.prediction_store import has_predictions
 from churn_system.config.config import CONFIG
 from churn_system.logging.logger import get_logger
 
-import pandas as pd
-import numpy as np
-
 logger = get_logger(__name__,CONFIG["logging"]["monitoring"])
 
-TRAIN_PATH = Path("data/training_reference.csv")
-PROD_PATH = Path("data/inference_logs/predictions.csv")
-
 REPORT_PATH = Path("models/monitoring")
-REPORT_PATH.mkdir(parents=True, exist_ok=True)
 
 HEALTH_FILE = REPORT_PATH / "health_report.json"
 
@@ -28,46 +22,47 @@ PSI_THRESHOLD = 0.2
 DRIFT_FEATURE_LIMIT = 2
 
 
-def evaluate_model_health():
+def evaluate_model_health(window_hours: float | None = None):
     """
     Evaluate model stability using PSI drift metrics.
+
+    PSI comes from incremental histogram state (see drift_state),
+    so the cost does not grow with the prediction log size.
     """
 
-    if not TRAIN_PATH.exists() or not PROD_PATH.exists():
+    if not has_predictions():
         print("Missing data for health evaluation.")
         return
 
-    train_df = pd.read_csv(TRAIN_PATH)
-    prod_df = pd.read_csv(PROD_PATH)
-
-    numeric_cols = train_df.select_dtypes(include=np.number).columns
+    drift = compute_drift(window_hours=window_hours or DRIFT_CONFIG["window_hours"])
 
     drifting_features = []
 
-    for col in numeric_cols:
+    for col, result in drift.items():
 
-        if col not in prod_df.columns:
-            continue   
+        psi = result["psi"]
 
-        psi = calculate_psi(
-            train_df[col].dropna(),
-            prod_df[col].dropna()
-        )
-
-        if psi > PSI_THRESHOLD:
+        if psi is not None and psi > PSI_THRESHOLD:
             drifting_features.append({
                 "feature": col,
+                "type": result["type"],
                 "psi": round(float(psi), 4)
             })
 
     retrain_required = len(drifting_features) >= DRIFT_FEATURE_LIMIT
 
+    # Rollback only acts on a report about the model now in production
+    from churn_system.lifecycle.registry import production_version
+
     report = {
+        "model_version": production_version(),
         "drifting_feature_count": len(drifting_features),
         "drifting_features": drifting_features,
         "retraining_recommended": retrain_required
     }
 
+    REPORT_PATH.mkdir(parents=True, exist_ok=True)
+
     with open(HEALTH_FILE, "w") as f:
         json.dump(report, f, indent=4)
 
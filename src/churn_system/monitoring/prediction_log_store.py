@@ -0,0 +1,494 @@
+"""
+Partitioned Prediction Log Store
+
+Columnar (Parquet) storage for production prediction logs.
+
+Layout:
+
+    <root>/date=YYYY-MM-DD/hour=HH/part-*.parquet
+
+Every flush of the prediction writer becomes one small typed file
+inside the hour partition it belongs to. Closed partitions are
+compacted into a single file, and readers only load the columns
+and partitions (time range) they ask for.
+
+A compacted file lists the parts it replaces in its Parquet metadata.
+Readers skip those parts, so the rows are never seen twice while (or
+if, after a crash) the replaced parts are still on disk.
+"""
+
+import json
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# pandas loads pyarrow's pandas bridge on the first write, and that import
+# registers a thread-pool exit hook. Loading it up front keeps the final
+# flush of the prediction writer working during interpreter shutdown.
+import pyarrow.pandas_compat  # noqa: F401
+
+from churn_system.schema import NUMERIC_COLUMNS
+from churn_system.logging.logger import get_logger
+from churn_system.config.config import CONFIG
+
+logger = get_logger(__name__, CONFIG["logging"]["monitoring"])
+
+PART_PATTERN = "part-*.parquet"
+LOCK_FILE = ".compact.lock"
+
+# Parquet metadata key of a compacted file: JSON list of the part names it replaces
+REPLACES_KEY = b"churn.replaces"
+
+# A compaction lock older than this, or held by a dead process on this host, is broken
+LOCK_STALE_SECONDS = 3600
+
+
+def to_utc_timestamp(value) -> pd.Timestamp | None:
+    """
+    Normalize datetime / ISO string inputs to a UTC timestamp.
+    """
+
+    if value is None:
+        return None
+
+    ts = pd.Timestamp(value)
+
+    if ts.tzinfo is None:
+        return ts.tz_localize("UTC")
+
+    return ts.tz_convert("UTC")
+
+
+def partition_files(directory: Path) -> list:
+    """
+    Part files of one partition, without the parts a compacted file replaces.
+    """
+
+    paths = sorted(Path(directory).glob(PART_PATTERN))
+    replaced = set()
+
+    for path in paths:
+        if "-compacted-" not in path.name:
+            continue
+
+        try:
+            metadata = pq.read_schema(path).metadata or {}
+        except FileNotFoundError:
+            continue
+
+        replaced.update(json.loads(metadata.get(REPLACES_KEY, b"[]")))
+
+    return [p for p in paths if p.name not in replaced]
+
+
+def superseded_files(directory: Path) -> list:
+    """
+    Parts left behind by an interrupted compaction.
+    """
+
+    live = set(partition_files(directory))
+
+    return [p for p in sorted(Path(directory).glob(PART_PATTERN)) if p not in live]
+
+
+def normalize_prediction_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Apply the fixed column order and types used on disk.
+
+    Numeric features are stored as float64, categorical features as
+    strings, predictions as int8 and timestamps as UTC datetimes.
+    """
+
+    df = df.reindex(sorted(df.columns), axis=1)
+
+    for col in df.columns:
+
+        if col == "timestamp":
+            df[col] = pd.to_datetime(df[col], utc=True, format="ISO8601")
+        elif col == "prediction":
+            df[col] = df[col].astype("int8")
+        elif col == "prediction_probability" or col in NUMERIC_COLUMNS:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("float64")
+        else:
+            df[col] = df[col].map(
+                lambda v: v if v is None or isinstance(v, str) else str(v),
+                na_action="ignore",
+            ).astype(object)
+
+    return df
+
+
+def lock_is_stale(lock: Path) -> bool:
+    """
+    True when a compaction lock outlived LOCK_STALE_SECONDS, or its
+    owner was a process on this host that no longer runs.
+    """
+
+    try:
+        owner = lock.read_text().split()
+        age = time.time() - lock.stat().st_mtime
+    except FileNotFoundError:
+        return True
+
+    if age > LOCK_STALE_SECONDS:
+        return True
+
+    # Locks from before owners were recorded: only the age check applies
+    if len(owner) < 2 or owner[1] != socket.gethostname():
+        return False
+
+    try:
+        os.kill(int(owner[0]), 0)
+    except ProcessLookupError:
+        return True
+    except (PermissionError, ValueError):
+        return False
+
+    return False
+
+
+class PartitionedPredictionStore:
+    """
+    Date/hour partitioned Parquet store for prediction logs.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    # ---------- writing ----------
+
+    def partition_dir(self, ts: pd.Timestamp) -> Path:
+        return self.root / f"date={ts:%Y-%m-%d}" / f"hour={ts:%H}"
+
+    @staticmethod
+    def partition_hour(directory: Path) -> pd.Timestamp:
+        """
+        Start of the hour covered by a partition directory.
+        """
+
+        directory = Path(directory)
+
+        return pd.Timestamp(
+            f"{directory.parent.name[5:]} {directory.name[5:]}:00",
+            tz="UTC",
+        )
+
+    def write(self, records, name: str | None = None) -> list:
+        """
+        Write records (list of dicts or DataFrame) into their hour partitions.
+
+        `name` replaces the unique part file suffix: writing the same
+        records under the same name again overwrites instead of duplicating.
+
+        Returns
+        -------
+        list[Path]
+            Partition directories that received data.
+        """
+
+        df = records if isinstance(records, pd.DataFrame) else pd.DataFrame(records)
+
+        if df.empty:
+            return []
+
+        df = normalize_prediction_frame(df)
+
+        hours = df["timestamp"].dt.floor("h")
+        written = []
+
+        for hour, part in df.groupby(hours, sort=True):
+            directory = self.partition_dir(hour)
+            directory.mkdir(parents=True, exist_ok=True)
+
+            filename = f"part-{name}.parquet" if name is not None else (
+                f"part-{datetime.now(timezone.utc):%Y%m%dT%H%M%S}"
+                f"-{os.getpid()}-{uuid.uuid4().hex[:8]}.parquet"
+            )
+
+            self._write_file(part, directory / filename)
+            written.append(directory)
+
+        return written
+
+    @staticmethod
+    def _write_file(df: pd.DataFrame, path: Path, metadata: dict | None = None):
+        """
+        Write to a hidden temp file and rename, so readers never
+        see a half-written part. `metadata` is added to the Parquet schema.
+        """
+
+        tmp = path.with_name(f".{path.name}.tmp")
+
+        if metadata is None:
+            df.to_parquet(tmp, index=False)
+        else:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            table = table.replace_schema_metadata({**(table.schema.metadata or {}), **metadata})
+            pq.write_table(table, tmp)
+
+        os.replace(tmp, path)
+
+    # ---------- reading ----------
+
+    def partitions(self, start=None, end=None) -> list:
+        """
+        Partition directories overlapping [start, end), oldest first.
+        """
+
+        start = to_utc_timestamp(start)
+        end = to_utc_timestamp(end)
+
+        selected = []
+
+        for directory in sorted(self.root.glob("date=*/hour=*")):
+            try:
+                hour = self.partition_hour(directory)
+            except ValueError:
+                continue
+
+            if start is not None and hour + timedelta(hours=1) <= start:
+                continue
+
+            if end is not None and hour >= end:
+                continue
+
+            selected.append(directory)
+
+        return selected
+
+    def files(self, start=None, end=None) -> list:
+        return [
+            f
+            for directory in self.partitions(start, end)
+            for f in partition_files(directory)
+        ]
+
+    def read(self, columns: list | None = None, start=None, end=None) -> pd.DataFrame:
+        """
+        Load prediction logs.
+
+        Parameters
+        ----------
+        columns : list, optional
+            Columns to load (column projection). Columns missing
+            from older files are returned as nulls.
+        start, end : datetime or str, optional
+            Half-open UTC time range [start, end).
+        """
+
+        start = to_utc_timestamp(start)
+        end = to_utc_timestamp(end)
+
+        needs_time_filter = start is not None or end is not None
+
+        read_columns = None
+        if columns is not None:
+            read_columns = list(dict.fromkeys(
+                list(columns) + (["timestamp"] if needs_time_filter else [])
+            ))
+
+        df = self._read_files(self.files(start, end), read_columns)
+
+        if df is None:
+            return pd.DataFrame(columns=columns if columns is not None else [])
+
+        if needs_time_filter and "timestamp" in df.columns:
+            mask = np.ones(len(df), dtype=bool)
+
+            if start is not None:
+                mask &= (df["timestamp"] >= start).to_numpy()
+            if end is not None:
+                mask &= (df["timestamp"] < end).to_numpy()
+
+            df = df.loc[mask].reset_index(drop=True)
+
+        if columns is not None:
+            df = df.reindex(columns=list(columns))
+
+        return df
+
+    def read_partition(self, directory: Path, columns: list | None = None) -> pd.DataFrame:
+        """
+        Load every file of one hour partition.
+        """
+
+        df = self._read_files(partition_files(directory), columns)
+
+        if df is None:
+            return pd.DataFrame(columns=columns if columns is not None else [])
+
+        return df
+
+    @staticmethod
+    def _read_files(paths: list, columns: list | None):
+        frames = []
+
+        for path in paths:
+            available = pq.read_schema(path).names
+
+            if columns is None:
+                subset = available
+            else:
+                subset = [c for c in columns if c in available]
+
+            frames.append(pd.read_parquet(path, columns=subset))
+
+        if not frames:
+            return None
+
+        return pd.concat(frames, ignore_index=True)
+
+    def import_csv(self, path: Path, chunk_rows: int = 100000) -> int:
+        """
+        Copy a legacy predictions CSV into the store.
+
+        Part files are named after their CSV chunk, so rerunning an
+        interrupted import rewrites the same files.
+
+        Returns
+        -------
+        int
+            Rows imported.
+        """
+
+        rows = 0
+
+        for i, chunk in enumerate(pd.read_csv(path, chunksize=chunk_rows)):
+            self.write(chunk, name=f"legacy-{i:06d}")
+            rows += len(chunk)
+
+        return rows
+
+    def exists(self) -> bool:
+        return any(self.root.glob(f"date=*/hour=*/{PART_PATTERN}"))
+
+    # ---------- compaction ----------
+
+    @staticmethod
+    def _acquire_lock(directory: Path) -> int | None:
+        """
+        Create the partition's compaction lock, breaking a stale one.
+        Returns the lock's file descriptor, or None if it is held.
+        """
+
+        lock = Path(directory) / LOCK_FILE
+
+        for _ in range(2):
+            try:
+                fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if not lock_is_stale(lock):
+                    return None
+
+                logger.warning(f"Breaking stale compaction lock in {directory}")
+
+                # Renamed away first: of two processes breaking it, only one succeeds
+                try:
+                    os.rename(lock, lock.with_name(f"{LOCK_FILE}.stale-{uuid.uuid4().hex[:8]}"))
+                except FileNotFoundError:
+                    pass
+
+                for stale in Path(directory).glob(f"{LOCK_FILE}.stale-*"):
+                    stale.unlink(missing_ok=True)
+
+                continue
+
+            os.write(fd, f"{os.getpid()} {socket.gethostname()} {time.time()}".encode())
+
+            return fd
+
+        return None
+
+    def compact_partition(self, directory: Path) -> bool:
+        """
+        Merge all part files of one partition into a single file.
+
+        The compacted file is renamed into place before the parts are
+        deleted, and readers skip the parts it lists as replaced.
+        """
+
+        directory = Path(directory)
+
+        if len(partition_files(directory)) < 2 and not superseded_files(directory):
+            return False
+
+        fd = self._acquire_lock(directory)
+
+        if fd is None:
+            logger.info(f"Compaction already running for {directory}")
+            return False
+
+        lock = directory / LOCK_FILE
+
+        try:
+            # Leftovers of an interrupted compaction are already in its output
+            for p in superseded_files(directory):
+                p.unlink(missing_ok=True)
+
+            parts = partition_files(directory)
+
+            if len(parts) < 2:
+                return False
+
+            df = pd.concat(
+                [pd.read_parquet(p) for p in parts],
+                ignore_index=True,
+            )
+            df = df.reindex(sorted(df.columns), axis=1)
+            df = df.sort_values("timestamp", kind="stable")
+
+            target = directory / (
+                f"part-{datetime.now(timezone.utc):%Y%m%dT%H%M%S}"
+                f"-compacted-{uuid.uuid4().hex[:8]}.parquet"
+            )
+
+            self._write_file(
+                df, target, metadata={REPLACES_KEY: json.dumps([p.name for p in parts]).encode()}
+            )
+
+            for p in parts:
+                p.unlink()
+
+        finally:
+            os.close(fd)
+            lock.unlink(missing_ok=True)
+
+        logger.info(f"Compacted {len(parts)} files in {directory}")
+
+        return True
+
+    def compact(self, before=None) -> int:
+        """
+        Compact every partition that closed before `before`
+        (defaults to the current hour, which is still being written).
+        """
+
+        if before is None:
+            before = pd.Timestamp.now(tz="UTC").floor("h")
+
+        compacted = 0
+
+        for directory in self.partitions(end=before):
+            if self.compact_partition(directory):
+                compacted += 1
+
+        return compacted
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) != 2 or sys.argv[1] != "compact":
+        print("Usage: python -m churn_system.monitoring.prediction_log_store compact")
+        sys.exit(1)
+
+    store = PartitionedPredictionStore(Path(CONFIG["paths"]["prediction_store"]))
+    print(f"Compacted {store.compact()} partition(s).")
@@ -5,19 +5,17 @@ Analyzes live inference predictions
 to understand model behaviour in production 
 """
 
-import pandas as pd
 import json
 from pathlib import Path
 from datetime import datetime, timezone
 
 from churn_system.logging.logger import get_logger
+from churn_system.monitoring.prediction_store import has_predictions, load_predictions
 from churn_system.config.config import CONFIG
 
 logger = get_logger(__name__, CONFIG["logging"]["monitoring"])
 
-PRED_PATH = Path("data/inference_logs/predictions.csv")
 REPORT_DIR = Path("models/monitoring")
-REPORT_DIR.mkdir(parents = True, exist_ok=True)
 
 REPORT_FILE = REPORT_DIR / "prediction_report.json"
 
@@ -27,17 +25,17 @@ def generate_prediction_report():
     Analyze production predictions and generate monitoring metrics.
     """
     
-    if not PRED_PATH.exists():
+    if not has_predictions():
         logger.warning("No prediction logs found.")
         return 
     
-    df = pd.read_csv(PRED_PATH)
+    df = load_predictions(columns=["prediction_probability"])
     
     if df.empty:
         logger.warning("Prediction file empty.")
         return
     
-    if "prediction_probability" not in df.columns:
+    if df["prediction_probability"].isna().all():
         logger.warning("Prediction probability column missing.")
         return
     
@@ -54,6 +52,8 @@ def generate_prediction_report():
         "low_risk_ratio" : float((probs < 0.3).mean()),
     }
     
+    REPORT_DIR.mkdir(parents=True, exist_ok=True)
+
     with open(REPORT_FILE, "w") as f:
         json.dump(report, f, indent=4)
         
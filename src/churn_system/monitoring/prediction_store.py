@@ -1,14 +1,332 @@
+"""
+Prediction Store
+
+Logs inference requests for monitoring and retraining.
+
+Predictions are handed to a background writer through a
+bounded in-memory queue, so logging never adds disk I/O
+to the request path. The writer appends records in bulk
+when its buffer fills up or the flush interval elapses.
+
+Two storage backends are supported (`prediction_logging.backend`):
+- parquet : date/hour partitioned columnar store (default)
+- csv     : legacy single append-only CSV
+
+Monitoring code reads logs through `load_predictions`,
+which works the same for both backends.
+"""
+
+import atexit
+import queue
+import threading
+import time
 import pandas as pd
+import pyarrow.parquet as pq
 from pathlib import Path
 from datetime import datetime, timezone
 
+try:
+    import fcntl
+except ImportError:  # Windows: single-process serving only
+    fcntl = None
+
+from churn_system.monitoring.prediction_log_store import (
+    PartitionedPredictionStore,
+    to_utc_timestamp,
+)
 from churn_system.logging.logger import get_logger
 from churn_system.config.config import CONFIG
 
 logger = get_logger(__name__, CONFIG["logging"]["monitoring"])
 
 LOG_PATH = Path("data/inference_logs/predictions.csv")
-LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+
+# The legacy CSV after its one-time import into the parquet store
+IMPORTED_LOG_PATH = LOG_PATH.with_name(f"{LOG_PATH.name}.imported")
+
+STORE_DIR = Path(CONFIG["paths"]["prediction_store"])
+
+WRITER_CONFIG = CONFIG["prediction_logging"]
+BACKEND = WRITER_CONFIG["backend"]
+
+
+class CsvPredictionSink:
+    """
+    Legacy backend: append records to a single CSV file.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(f".{self.path.name}.lock")
+
+    def __call__(self, records: list):
+        df = pd.DataFrame(records)
+
+        df = df.reindex(sorted(df.columns), axis=1)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Serving workers (api/serve.py) share this file: the header
+        # check and the append happen under one exclusive lock
+        with open(self.lock_path, "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+
+            write_header = not self.path.exists()
+
+            df.to_csv(
+                self.path,
+                mode="a",
+                header=write_header,
+                index=False
+            )
+
+
+class ParquetPredictionSink:
+    """
+    Write records to the partitioned store and compact
+    the previous hour once the writer moves past it.
+    """
+
+    def __init__(self, store: PartitionedPredictionStore):
+        self.store = store
+        self._current_partition = None
+
+    def __call__(self, records: list):
+        partitions = self.store.write(records)
+
+        if not partitions:
+            return
+
+        latest = partitions[-1]
+
+        if self._current_partition is not None and latest != self._current_partition:
+            try:
+                self.store.compact()
+            except Exception as e:
+                logger.error(f"Prediction store compaction failed: {e}")
+
+        self._current_partition = latest
+
+
+class _Flush:
+    """
+    Control message asking the writer to flush its buffer.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+_STOP = object()
+
+
+class PredictionLogWriter:
+    """
+    Queue-backed background writer for prediction records.
+
+    Parameters
+    ----------
+    sink : callable
+        Receives each buffered batch of records and persists it.
+    queue_size : int
+        Maximum number of records waiting to be written.
+        Records submitted while the queue is full are dropped.
+    flush_records : int
+        Buffer size that triggers a bulk write.
+    flush_interval_seconds : float
+        Maximum time a record stays buffered in memory.
+    """
+
+    def __init__(
+        self,
+        sink,
+        queue_size: int = 10000,
+        flush_records: int = 500,
+        flush_interval_seconds: float = 1.0,
+    ):
+        self.sink = sink
+        self.flush_records = flush_records
+        self.flush_interval = flush_interval_seconds
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._buffer = []
+        self._thread = None
+        self._lock = threading.Lock()
+
+        self.dropped_records = 0
+        self.written_records = 0
+        self.failed_flushes = 0
+
+    def start(self):
+        """
+        Start the writer thread (idempotent).
+        """
+
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+
+            self._thread = threading.Thread(
+                target=self._run,
+                name="prediction-log-writer",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def submit(self, records: list) -> int:
+        """
+        Queue records without blocking.
+
+        Returns
+        -------
+        int
+            Number of records accepted.
+        """
+
+        if self._thread is None:
+            self.start()
+
+        accepted = 0
+
+        for record in records:
+            try:
+                self._queue.put_nowait(record)
+                accepted += 1
+            except queue.Full:
+                self.dropped_records += 1
+
+        return accepted
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Block until everything queued so far has been written.
+        """
+
+        if self._thread is None:
+            return True
+
+        request = _Flush()
+        self._queue.put(request)
+
+        return request.done.wait(timeout)
+
+    def close(self, timeout: float | None = None):
+        """
+        Drain the queue, write remaining records and stop the writer.
+        """
+
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+
+        if thread is None:
+            return
+
+        self._queue.put(_STOP)
+        thread.join(timeout)
+
+        logger.info(
+            f"Prediction log writer stopped | written = {self.written_records} "
+            f"| dropped = {self.dropped_records}"
+        )
+
+    def metrics(self) -> dict:
+        """
+        Writer health metrics.
+        """
+
+        return {
+            "queue_depth": self._queue.qsize(),
+            "buffered_records": len(self._buffer),
+            "written_records": self.written_records,
+            "dropped_records": self.dropped_records,
+            "failed_flushes": self.failed_flushes,
+        }
+
+    def _run(self):
+        deadline = time.monotonic() + self.flush_interval
+
+        while True:
+            timeout = max(deadline - time.monotonic(), 0)
+
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                self._drain()
+                self._write()
+                return
+
+            if isinstance(item, _Flush):
+                self._write()
+                item.done.set()
+            elif item is not None:
+                self._buffer.append(item)
+
+            if (
+                len(self._buffer) >= self.flush_records
+                or time.monotonic() >= deadline
+            ):
+                self._write()
+                deadline = time.monotonic() + self.flush_interval
+
+    def _drain(self):
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+
+            if isinstance(item, _Flush):
+                item.done.set()
+            elif item is not _STOP:
+                self._buffer.append(item)
+
+    def _write(self):
+        if not self._buffer:
+            return
+
+        records, self._buffer = self._buffer, []
+
+        try:
+            self.sink(records)
+            self.written_records += len(records)
+
+        except Exception as e:
+            self.failed_flushes += 1
+            self.dropped_records += len(records)
+            logger.error(f"Prediction log flush failed: {e}")
+
+
+def build_sink():
+    if BACKEND == "parquet":
+        return ParquetPredictionSink(PartitionedPredictionStore(STORE_DIR))
+
+    if BACKEND == "csv":
+        return CsvPredictionSink(LOG_PATH)
+
+    raise ValueError(f"Unknown prediction logging backend: {BACKEND}")
+
+
+_WRITER = PredictionLogWriter(
+    build_sink(),
+    queue_size=WRITER_CONFIG["queue_size"],
+    flush_records=WRITER_CONFIG["flush_records"],
+    flush_interval_seconds=WRITER_CONFIG["flush_interval_seconds"],
+)
+
+atexit.register(_WRITER.close)
+
+
+def get_prediction_writer() -> PredictionLogWriter:
+    """
+    Return the process-wide prediction log writer.
+    """
+
+    return _WRITER
 
 
 def store_prediction(input_record: dict, probability: float, prediction: int):
@@ -16,24 +334,163 @@ def store_prediction(input_record: dict, probability: float, prediction: int):
     Store inference request safely with fixed schema.
     """
 
-    record = input_record.copy()
+    store_predictions([input_record], [probability], [prediction])
+
+
+def store_predictions(input_records: list, probabilities: list, predictions: list):
+    """
+    Queue a batch of inference requests for the background writer.
+    """
+
+    if not input_records:
+        return
+
+    timestamp = datetime.now(timezone.utc).isoformat()
+
+    rows = []
+
+    for input_record, probability, prediction in zip(
+        input_records, probabilities, predictions
+    ):
+        record = input_record.copy()
 
+        record["prediction_probability"] = float(probability)
+        record["prediction"] = int(prediction)
+        record["timestamp"] = timestamp
 
-    record["prediction_probability"] = float(probability)
-    record["prediction"] = int(prediction)
-    record["timestamp"] = datetime.now(timezone.utc).isoformat()
+        rows.append(record)
+
+    _WRITER.submit(rows)
+
+
+# Whether this process already looked for a legacy CSV to import
+_legacy_checked = False
+
+
+def import_legacy_csv():
+    """
+    Move the history of the legacy CSV backend into the parquet store,
+    once, so drift and health keep the predictions logged before the switch.
+
+    Runs on the first read, under a lock shared by all processes;
+    the CSV is then renamed to `predictions.csv.imported`.
+    """
 
-    df = pd.DataFrame([record])
+    global _legacy_checked
+
+    if _legacy_checked or BACKEND != "parquet":
+        return
+
+    _legacy_checked = True
+
+    if not LOG_PATH.exists():
+        return
+
+    STORE_DIR.mkdir(parents=True, exist_ok=True)
+
+    with open(STORE_DIR / ".import.lock", "a") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+
+        # Another process finished the import while this one waited
+        if not LOG_PATH.exists():
+            return
+
+        store = PartitionedPredictionStore(STORE_DIR)
+        rows = store.import_csv(LOG_PATH, CONFIG["ingestion"]["chunk_rows"])
+        store.compact()
+
+        LOG_PATH.rename(IMPORTED_LOG_PATH)
+
+    logger.info(f"Imported {rows} legacy prediction logs from {LOG_PATH} into {STORE_DIR}")
+
+
+def has_predictions() -> bool:
+    """
+    Return True if any prediction logs exist for the configured backend.
+    """
+
+    if BACKEND == "parquet":
+        import_legacy_csv()
+        return PartitionedPredictionStore(STORE_DIR).exists()
+
+    return LOG_PATH.exists()
+
+
+def load_predictions(columns: list | None = None, start=None, end=None) -> pd.DataFrame:
+    """
+    Load prediction logs from the configured backend.
+
+    Parameters
+    ----------
+    columns : list, optional
+        Only load these columns.
+    start, end : datetime or str, optional
+        Half-open UTC time range [start, end) on the `timestamp` column.
+    """
+
+    if BACKEND == "parquet":
+        import_legacy_csv()
+        return PartitionedPredictionStore(STORE_DIR).read(columns, start, end)
+
+    if not LOG_PATH.exists():
+        return pd.DataFrame(columns=columns if columns is not None else [])
+
+    start = to_utc_timestamp(start)
+    end = to_utc_timestamp(end)
+    needs_time_filter = start is not None or end is not None
+
+    usecols = None
+    if columns is not None:
+        wanted = set(columns) | ({"timestamp"} if needs_time_filter else set())
+        usecols = lambda c: c in wanted
+
+    df = pd.read_csv(LOG_PATH, usecols=usecols)
+
+    if needs_time_filter and "timestamp" in df.columns:
+        ts = pd.to_datetime(df["timestamp"], utc=True, format="ISO8601")
+
+        if start is not None:
+            df = df[ts >= start]
+        if end is not None:
+            df = df[ts < end]
+
+    if columns is not None:
+        df = df.reindex(columns=list(columns))
+
+    return df.reset_index(drop=True)
+
+
+def iter_predictions(batch_rows: int = 65536, start=None):
+    """
+    Stream prediction logs from the configured backend in batches,
+    so callers never hold the whole log in memory.
+
+    Parameters
+    ----------
+    start : datetime or str, optional
+        Only rows logged at or after this UTC time; with the parquet
+        backend, older hour partitions are not read at all.
+    """
 
-    df = df.reindex(sorted(df.columns), axis=1)
+    start = to_utc_timestamp(start)
 
-    write_header = not LOG_PATH.exists()
+    if BACKEND == "parquet":
+        import_legacy_csv()
+        chunks = (
+            batch.to_pandas()
+            for path in PartitionedPredictionStore(STORE_DIR).files(start=start)
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_rows)
+        )
+    elif LOG_PATH.exists():
+        chunks = pd.read_csv(LOG_PATH, chunksize=batch_rows)
+    else:
+        return
 
-    df.to_csv(
-        LOG_PATH,
-        mode="a",
-        header=write_header,
-        index=False
-    )
+    for chunk in chunks:
+        if start is not None:
+            ts = pd.to_datetime(chunk["timestamp"], utc=True, format="ISO8601")
+            chunk = chunk[(ts >= start).to_numpy()].reset_index(drop=True)
 
-    logger.info("Prediction stored successfully.")
+        if len(chunk):
+            yield chunk
@@ -1,38 +1,62 @@
 """
 Build Retraining dataset by combining
 original training data with production data
+
+Both sources are streamed chunk by chunk into a columnar
+TrainingDataStore, so memory stays bounded by one chunk
+however large the prediction logs grow.
 """
 
-import pandas as pd
+import os
+import shutil
 from pathlib import Path
 
-RAW_DATA = Path("data/Telco_customer_churn_raw.csv")
-PROD_LOGS = Path("data/inference_logs/predictions.csv")
+from churn_system.config.config import CONFIG
+from churn_system.monitoring.prediction_store import has_predictions, iter_predictions
+from churn_system.new_data.training_store import TrainingDataStore
+from churn_system.training.steps.data_ingestion import ingest_csv
+
+RAW_DATA = Path(CONFIG["paths"]["raw_data"])
+
+OUTPUT = Path(CONFIG["paths"]["retraining_store"])
+
+CHUNK_ROWS = CONFIG["ingestion"]["chunk_rows"]
+
+# Prediction log fields that are not model inputs
+LOG_COLUMNS = ["prediction", "prediction_probability", "timestamp"]
 
-OUTPUT = Path("data/retraining_dataset.csv")
 
 def build_retraining_dataset():
     if not RAW_DATA.exists():
         raise ValueError("Original dataset missing.")
-    
-    base_df = pd.read_csv(RAW_DATA)
-    
-    if PROD_LOGS.exists():
-        prod_df = pd.read_csv(PROD_LOGS)
-        
-        prod_df = prod_df.drop(
-            columns=[
-                "prediction",
-                "prediction_probability",
-                "timestamp"
-            ],
-            errors = "ignore"
-        )
-        combined = pd.concat([base_df, prod_df], ignore_index = True)
-        print(f"Added {len(prod_df)} production samples.")
+
+    # Built next to the live store and swapped in when complete
+    tmp_dir = OUTPUT.with_name(f"{OUTPUT.name}.tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    store = TrainingDataStore(tmp_dir)
+
+    ingest_csv(RAW_DATA, store, CHUNK_ROWS)
+
+    if has_predictions():
+        added = 0
+
+        # Production rows carry no label; training keeps labeled rows only
+        for chunk in iter_predictions(CHUNK_ROWS):
+            store.write(chunk.drop(columns=LOG_COLUMNS, errors="ignore"))
+            added += len(chunk)
+
+        print(f"Added {added} production samples.")
     else:
-        combined = base_df
         print("No production data yet.")
-        
-    combined.to_csv(OUTPUT, index = False)
-    print("Retraining dataset created.")
\ No newline at end of file
+
+    old_dir = OUTPUT.with_name(f"{OUTPUT.name}.old")
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+    if OUTPUT.exists():
+        os.rename(OUTPUT, old_dir)
+
+    os.rename(tmp_dir, OUTPUT)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+    print(f"Retraining dataset created: {OUTPUT} ({TrainingDataStore(OUTPUT).num_rows()} rows).")
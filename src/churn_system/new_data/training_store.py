@@ -0,0 +1,190 @@
+"""
+Training Data Store
+
+Columnar (Parquet) storage for training data that may not fit in memory.
+
+Layout:
+
+    <root>/part-*.parquet
+
+Every ingested chunk becomes one immutable part file with the compact
+dtypes of `schema.training_dtypes()` (categoricals dictionary-encoded,
+nullable integers so unlabeled production rows fit the same schema).
+
+Readers never load the whole store at once: they stream record
+batches for incremental learners, or draw a bounded random sample
+as an in-memory frame.
+"""
+
+import os
+import uuid
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+from pandas.api.types import union_categoricals
+
+from churn_system.schema import TARGET_COLUMN, training_dtypes
+from churn_system.logging.logger import get_logger
+from churn_system.config.config import CONFIG
+
+logger = get_logger(__name__, CONFIG["logging"]["training"])
+
+PART_PATTERN = "part-*.parquet"
+
+
+def store_dtypes() -> dict:
+    """
+    Training dtypes with nullable integers: production rows have no
+    label and no Count/CLTV/Churn Score.
+    """
+
+    return {
+        col: dtype.capitalize() if dtype.startswith("int") else dtype
+        for col, dtype in training_dtypes().items()
+    }
+
+
+def concat_frames(frames: list) -> pd.DataFrame:
+    """
+    Concatenate chunks while keeping categorical columns categorical
+    (plain pd.concat falls back to object when categories differ).
+    """
+
+    frames = [f for f in frames if len(f)]
+
+    if not frames:
+        return pd.DataFrame()
+
+    if len(frames) == 1:
+        return frames[0].reset_index(drop=True)
+
+    columns = {}
+
+    for col in frames[0].columns:
+        if isinstance(frames[0][col].dtype, pd.CategoricalDtype):
+            columns[col] = union_categoricals(
+                [f[col] for f in frames],
+                ignore_order=True,
+            )
+        else:
+            columns[col] = pd.concat([f[col] for f in frames], ignore_index=True)
+
+    return pd.DataFrame(columns)
+
+
+def labeled_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Keep rows with a target and restore plain NumPy dtypes on columns
+    that no longer hold missing values.
+    """
+
+    df = df[df[TARGET_COLUMN].notna()].reset_index(drop=True)
+
+    for col, dtype in df.dtypes.items():
+        if pd.api.types.is_extension_array_dtype(dtype) and pd.api.types.is_integer_dtype(dtype):
+            if df[col].isna().any():
+                df[col] = df[col].astype("float32")
+            else:
+                df[col] = df[col].astype(dtype.numpy_dtype)
+
+    return df
+
+
+class TrainingDataStore:
+    """
+    Append-only Parquet store of typed training rows.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    # ---------- writing ----------
+
+    def write(self, df: pd.DataFrame) -> Path | None:
+        """
+        Cast a chunk to the store schema and write it as one part file.
+        """
+
+        if df.empty:
+            return None
+
+        self.root.mkdir(parents=True, exist_ok=True)
+
+        dtypes = store_dtypes()
+        df = df.reindex(columns=list(dtypes)).astype(dtypes)
+
+        path = self.root / f"part-{len(self.files()):06d}-{uuid.uuid4().hex[:8]}.parquet"
+        tmp = path.with_name(f".{path.name}.tmp")
+
+        # Readers never see a half-written part
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, path)
+
+        return path
+
+    # ---------- reading ----------
+
+    def files(self) -> list:
+        return sorted(self.root.glob(PART_PATTERN))
+
+    def exists(self) -> bool:
+        return bool(self.files())
+
+    def num_rows(self) -> int:
+        """
+        Row count from the Parquet footers (no data is read).
+        """
+
+        return sum(pq.ParquetFile(path).metadata.num_rows for path in self.files())
+
+    def iter_batches(self, columns: list | None = None, batch_rows: int = 65536, labeled: bool = True):
+        """
+        Stream the store as DataFrames of at most `batch_rows` rows.
+
+        Parameters
+        ----------
+        labeled : bool
+            Only yield rows with a target (for supervised / partial_fit learners).
+        """
+
+        if labeled and columns is not None and TARGET_COLUMN not in columns:
+            columns = list(columns) + [TARGET_COLUMN]
+
+        for path in self.files():
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_rows, columns=columns):
+                df = batch.to_pandas()
+
+                if labeled:
+                    df = labeled_rows(df)
+
+                if len(df):
+                    yield df
+
+    def sample(self, max_rows: int | None = None, columns: list | None = None, seed: int = 42) -> pd.DataFrame:
+        """
+        Labeled rows as one in-memory frame, downsampled to about
+        `max_rows` (uniform Bernoulli sample) when the store is larger.
+        """
+
+        total = self.num_rows()
+        fraction = 1.0 if not max_rows or total <= max_rows else max_rows / total
+
+        rng = np.random.default_rng(seed)
+        frames = []
+
+        for df in self.iter_batches(columns=columns):
+            if fraction < 1.0:
+                df = df[rng.random(len(df)) < fraction]
+
+            frames.append(df)
+
+        df = concat_frames(frames)
+
+        logger.info(
+            f"Loaded training sample from {self.root} | rows = {len(df)} of {total} "
+            f"| memory = {df.memory_usage(deep=True).sum() / 2**20:.1f} MB"
+        )
+
+        return df
@@ -5,8 +5,6 @@ Responsible for orchestrating model training workflow.
 Does not implement ML Logic - delegates to training module.
 """
 
-from venv import logger
-from churn_system.training.train import main as train_model
 from churn_system.logging.logger import get_logger
 from churn_system.config.config import CONFIG
 
@@ -20,7 +18,10 @@ def run_training_pipeline():
     """
     
     logger.info("--- Training Pipeline Started ---")
-    
+
+    # Imported here so importing the pipeline does not load sklearn
+    from churn_system.training.train import main as train_model
+
     try:
         train_model()
         logger.info("Training completed successfully.")
@@ -1,6 +1,6 @@
-from pathlib import Path
-import json
+from functools import lru_cache
 from churn_system.inference.model_contract import get_feature_schema
+from churn_system.inference.validation_plan import ValidationPlan
 
 TARGET_COLUMN = "Churn Value"
 
@@ -45,6 +45,50 @@ REQUIRED_COLUMNS = {
 }
 
 
+# Raw columns holding numeric values (everything else is categorical text)
+NUMERIC_COLUMNS = {
+    "Count",
+    "Zip Code",
+    "Latitude",
+    "Longitude",
+    "Tenure Months",
+    "Monthly Charges",
+    "Total Charges",
+    "Churn Value",
+    "Churn Score",
+    "CLTV",
+}
+
+
+# Compact dtypes for raw numeric columns (value ranges of the Telco dataset).
+# Decimals stay float64: requests are scored in float64, and float32
+# training values would shift split thresholds and validation bounds.
+NUMERIC_DTYPES = {
+    "Count": "int16",
+    "Zip Code": "int32",
+    "Latitude": "float64",
+    "Longitude": "float64",
+    "Tenure Months": "int16",
+    "Monthly Charges": "float64",
+    "Total Charges": "float64",
+    "Churn Value": "int8",
+    "Churn Score": "int16",
+    "CLTV": "int32",
+}
+
+
+def training_dtypes() -> dict:
+    """
+    Explicit dtype map for reading raw training data:
+    numerics as compact ints/floats, everything else as `category`.
+    """
+
+    return {
+        col: NUMERIC_DTYPES[col] if col in NUMERIC_COLUMNS else "category"
+        for col in sorted(REQUIRED_COLUMNS)
+    }
+
+
 def validate_training_data(df):
     missing_cols = REQUIRED_COLUMNS - set(df.columns)
     if missing_cols:
@@ -57,31 +101,22 @@ def validate_training_data(df):
 
 
 
-PRODUCTION_METADATA = Path(
-    "models/production/current/current/metadata.json"
-)
-
-
-
+@lru_cache(maxsize=8)
+def _column_plan(feature_schema: tuple) -> ValidationPlan:
+    return ValidationPlan(list(feature_schema))
 
 
-def validate_inference_data(df):
+def validate_inference_data(df, feature_schema: list | None = None):
     """
     Validate inference dataframe against MODEL FEATURE SCHEMA
     (not raw dataset schema).
-    """
-
-    required_features = set(get_feature_schema())
 
-    missing = required_features - set(df.columns)
-    if missing:
-        raise ValueError(
-            f"Missing required model features at inference: {missing}"
-        )
+    `feature_schema` defaults to the production model contract.
+    Returns the features in training order. Serving uses the model's
+    full ValidationPlan instead (inference/validation_plan.py).
+    """
 
-    if TARGET_COLUMN in df.columns:
-        raise ValueError(
-            f"Target column '{TARGET_COLUMN}' must not appear at inference"
-        )
+    if feature_schema is None:
+        feature_schema = get_feature_schema()
 
-    return df[list(required_features)]
\ No newline at end of file
+    return _column_plan(tuple(feature_schema)).select(df)
@@ -0,0 +1,240 @@
+"""
+Incremental Model Update
+
+Drift-triggered alternative to full retraining: the challenger
+continues from the current production model and only sees the
+prediction-log partitions added since that model's data watermark
+(`trained_until` in metadata.json).
+
+- Tree ensembles (GradientBoosting, RandomForest) are warm-started:
+  `incremental.extra_estimators` new trees/stages are fitted on the
+  new rows, the existing ones are kept.
+- Estimators with `partial_fit` (e.g. SGDClassifier) are updated
+  batch by batch.
+- The fitted preprocessor is reused as-is, so the feature schema does
+  not change (unseen categories are ignored like at serving time).
+
+Only labeled rows (prediction logs joined with their outcome in the
+target column) can be learned from. The most recent
+`incremental.holdout_fraction` of them is held out, and both champion
+and challenger are scored on it, so `compare_models` compares like
+with like.
+
+The cost scales with the volume of new data, not with the history.
+When there are too few new labeled rows, or the model cannot be
+updated incrementally, no challenger is produced and the caller falls
+back to full retraining.
+"""
+
+import json
+import shutil
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from churn_system.config.config import CONFIG
+from churn_system.features.build_features import build_features
+from churn_system.inference.compiled_scorer import export_compiled_scorer
+from churn_system.inference.model_artifact import load_pipeline, save_pipeline
+from churn_system.inference.tree_ensemble import export_tree_ensemble
+from churn_system.inference.validation_plan import PLAN_FILE
+from churn_system.lifecycle.registry import EXPERIMENTS_DIR, production_version, resolve_production_dir
+from churn_system.logging.logger import get_logger
+from churn_system.monitoring.drift_state import REFERENCE_FILE
+from churn_system.monitoring.prediction_log_store import to_utc_timestamp
+from churn_system.monitoring.prediction_store import iter_predictions
+from churn_system.schema import TARGET_COLUMN, validate_inference_data
+from churn_system.training.steps.model_evaluation import compute_metrics
+
+logger = get_logger(__name__, CONFIG["logging"]["training"])
+
+INCREMENTAL_CONFIG = CONFIG["incremental"]
+
+# Ensembles that keep their fitted members when refit with warm_start
+WARM_START_ENSEMBLES = {"GradientBoostingClassifier", "RandomForestClassifier"}
+
+
+def data_watermark(metadata: dict) -> pd.Timestamp | None:
+    """
+    Time up to which prediction logs are already reflected in a model.
+    Models trained before watermarks existed fall back to their training date.
+    """
+
+    return to_utc_timestamp(metadata.get("trained_until") or metadata.get("training_date"))
+
+
+def load_new_rows(since: pd.Timestamp | None, feature_schema: list) -> pd.DataFrame:
+    """
+    Labeled prediction-log rows logged since the watermark,
+    restricted to the model features plus target and timestamp.
+    """
+
+    columns = list(feature_schema) + [TARGET_COLUMN, "timestamp"]
+    frames = []
+
+    for chunk in iter_predictions(INCREMENTAL_CONFIG.get("batch_rows", 65536), start=since):
+        if TARGET_COLUMN not in chunk.columns:
+            continue
+
+        chunk = chunk[chunk[TARGET_COLUMN].notna()]
+        frames.append(chunk.reindex(columns=columns))
+
+    if not frames:
+        return pd.DataFrame(columns=columns)
+
+    df = pd.concat(frames, ignore_index=True)
+    df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True, format="ISO8601")
+
+    return df.sort_values("timestamp", kind="stable").reset_index(drop=True)
+
+
+def warm_start_update(model, Xt, y) -> dict:
+    """
+    Update a fitted estimator with new rows in place.
+
+    Raises
+    ------
+    NotImplementedError
+        If the estimator can neither warm-start nor partial_fit.
+    """
+
+    name = type(model).__name__
+
+    if name in WARM_START_ENSEMBLES:
+        before = model.n_estimators
+        extra = INCREMENTAL_CONFIG["extra_estimators"]
+
+        model.set_params(warm_start=True, n_estimators=before + extra)
+        model.fit(Xt, y)
+        model.set_params(warm_start=False)
+
+        return {"method": "warm_start", "estimators_before": before, "estimators_after": model.n_estimators}
+
+    if hasattr(model, "partial_fit"):
+        batch_rows = INCREMENTAL_CONFIG.get("batch_rows", 65536)
+
+        for start in range(0, Xt.shape[0], batch_rows):
+            model.partial_fit(Xt[start:start + batch_rows], y[start:start + batch_rows], classes=model.classes_)
+
+        return {"method": "partial_fit", "batches": -(-Xt.shape[0] // batch_rows)}
+
+    raise NotImplementedError(f"{name} supports neither warm_start ensembles nor partial_fit")
+
+
+def update_production_model() -> Path | None:
+    """
+    Build an incrementally updated challenger from the production model.
+
+    Returns
+    -------
+    Path | None
+        The challenger's experiment directory, or None when an incremental
+        update is not possible (caller should retrain fully).
+    """
+
+    production_dir = resolve_production_dir()
+
+    with open(production_dir / "metadata.json", "r") as f:
+        parent_metadata = json.load(f)
+
+    feature_schema = parent_metadata["feature_schema"]
+    since = data_watermark(parent_metadata)
+
+    rows = load_new_rows(since, feature_schema)
+
+    logger.info(f"Incremental update | new labeled rows since {since} = {len(rows)}")
+
+    if len(rows) < INCREMENTAL_CONFIG["min_rows"]:
+        logger.info(f"Fewer than {INCREMENTAL_CONFIG['min_rows']} new labeled rows; incremental update skipped")
+        return None
+
+    # Time-ordered holdout: the latest rows judge the update
+    split = int(len(rows) * (1 - INCREMENTAL_CONFIG["holdout_fraction"]))
+    train_rows, holdout_rows = rows.iloc[:split], rows.iloc[split:]
+
+    y_train = train_rows[TARGET_COLUMN].astype(int).to_numpy()
+    y_holdout = holdout_rows[TARGET_COLUMN].astype(int).to_numpy()
+
+    if len(np.unique(y_train)) < 2 or len(np.unique(y_holdout)) < 2:
+        logger.info("New rows hold a single class; incremental update skipped")
+        return None
+
+    X_train = validate_inference_data(
+        build_features(train_rows.drop(columns=[TARGET_COLUMN, "timestamp"])), feature_schema
+    )
+    X_holdout = validate_inference_data(
+        build_features(holdout_rows.drop(columns=[TARGET_COLUMN, "timestamp"])), feature_schema
+    )
+
+    champion = load_pipeline(production_dir)
+    champion_metrics = compute_metrics(champion, X_holdout, y_holdout)
+
+    # A second copy is updated; the champion stays untouched for comparison
+    pipeline = load_pipeline(production_dir)
+    Xt_train = pipeline.named_steps["preprocessor"].transform(X_train)
+
+    if sp.issparse(Xt_train):
+        Xt_train = Xt_train.tocsr()
+
+    try:
+        update = warm_start_update(pipeline.named_steps["model"], Xt_train, y_train)
+    except NotImplementedError as e:
+        logger.info(f"Incremental update skipped: {e}")
+        return None
+
+    metrics = compute_metrics(pipeline, X_holdout, y_holdout)
+
+    logger.info(
+        f"Incremental update | {update['method']} | holdout ROC-AUC "
+        f"champion = {champion_metrics['roc_auc']:.4f} | challenger = {metrics['roc_auc']:.4f}"
+    )
+
+    model_version = datetime.now().strftime("%Y%m%d_%H%M%S")
+    model_dir = EXPERIMENTS_DIR / f"churn_model_{model_version}"
+    model_dir.mkdir(parents=True, exist_ok=True)
+
+    save_pipeline(pipeline, model_dir)
+
+    if export_compiled_scorer(pipeline, model_dir, X_holdout) is None:
+        export_tree_ensemble(pipeline, model_dir, X_holdout)
+
+    # Drift is still measured against the original training distribution,
+    # and inputs are still validated against it
+    for name in (REFERENCE_FILE, PLAN_FILE):
+        if (production_dir / name).exists():
+            shutil.copy(production_dir / name, model_dir / name)
+
+    parent = production_version()
+
+    metadata = {
+        **parent_metadata,
+        "model_version": model_version,
+        "training_date": datetime.now().strftime("%Y-%m-%d"),
+        "trained_until": rows["timestamp"].max().isoformat(),
+        "training_mode": "incremental",
+        "split_strategy": "time-ordered holdout of new prediction logs",
+        "metrics": metrics,
+        # Champion scored on the same holdout, for compare_models
+        "comparison": {"parent_model": parent, "champion_metrics": champion_metrics},
+        "incremental": {
+            **update,
+            "parent_model": parent,
+            "since": since.isoformat() if since is not None else None,
+            "train_rows": len(train_rows),
+            "holdout_rows": len(holdout_rows),
+        },
+    }
+
+    with open(model_dir / "metadata.json", "w") as f:
+        json.dump(metadata, f, indent=2)
+
+    logger.info(f"Incremental challenger saved at {model_dir}")
+
+    return model_dir
+
+
+if __name__ == "__main__":
+    print(update_production_model())
@@ -2,39 +2,137 @@
 Data Ingestion Step
 
 Responsible for loading training dataset from configured source.
+
+Raw CSV data is read in chunks with an explicit dtype map
+(`schema.training_dtypes()`: categoricals as `category`, numerics as
+compact ints, decimals as float64), and every chunk is validated before it is kept.
+Larger-than-memory data goes through the columnar TrainingDataStore
+instead, consumed as a downsampled frame or as a stream of batches.
 """
 
 import pandas as pd
 from pathlib import Path
 
+from churn_system.new_data.training_store import TrainingDataStore, concat_frames
+from churn_system.schema import training_dtypes, validate_training_data
 from churn_system.logging.logger import get_logger
 from churn_system.config.config import CONFIG
 
 logger = get_logger(__name__, CONFIG["logging"]["training"])
 
+INGESTION_CONFIG = CONFIG["ingestion"]
+
+
+def read_csv_chunks(path: Path, chunk_rows: int | None = None):
+    """
+    Stream a raw CSV as typed, validated chunks.
+
+    Raises
+    ------
+    ValueError
+        If a chunk is missing columns, has invalid target values, or has
+        values that do not fit the dtype map (e.g. a missing integer).
+    """
+
+    chunk_rows = chunk_rows or INGESTION_CONFIG["chunk_rows"]
+
+    reader = pd.read_csv(
+        path,
+        dtype=training_dtypes(),
+        # Blank "Total Charges" for new customers
+        na_values={"Total Charges": [" "]},
+        chunksize=chunk_rows,
+    )
+
+    for i, chunk in enumerate(reader):
+        try:
+            validate_training_data(chunk)
+        except ValueError as e:
+            raise ValueError(f"{path} chunk {i} (rows {i * chunk_rows}+): {e}") from e
+
+        yield chunk
+
+
+def ingest_csv(path: Path, store: TrainingDataStore, chunk_rows: int | None = None) -> int:
+    """
+    Append a raw CSV to a columnar store, one chunk at a time.
+
+    Returns
+    -------
+    int
+        Number of rows written.
+    """
+
+    rows = 0
+
+    for chunk in read_csv_chunks(path, chunk_rows):
+        store.write(chunk)
+        rows += len(chunk)
+
+    logger.info(f"Ingested {path} into {store.root} | rows = {rows}")
+
+    return rows
+
+
+def training_data_path() -> Path:
+    """
+    Source selected by `ingestion.source`: the raw CSV or the retraining store.
+    """
+
+    if INGESTION_CONFIG.get("source", "raw") == "store":
+        return Path(CONFIG["paths"]["retraining_store"])
+
+    return Path(CONFIG["paths"]["raw_data"])
+
 
 def load_training_data():
     """
     Load raw dataset used for model training.
 
+    `ingestion.source` selects the source:
+    - raw   : the raw CSV, read in typed and validated chunks
+    - store : labeled rows of the retraining store, downsampled to
+              `ingestion.max_training_rows` when larger
+
     Returns
     -------
     tuple[pd.DataFrame, Path]
         Loaded dataframe and source data path.
     """
 
-    data_path = Path(CONFIG["paths"]["raw_data"])
+    data_path = training_data_path()
+
+    if INGESTION_CONFIG.get("source", "raw") == "store":
+        store = TrainingDataStore(data_path)
+
+        if not store.exists():
+            raise FileNotFoundError(f"Training data store not found: {data_path}")
 
-    if not data_path.exists():
-        raise FileNotFoundError(f"Training dataset not found: {data_path}")
+        logger.info(f"Loading training data from {data_path}")
 
-    logger.info(f"Loading training data from {data_path}")
+        df = store.sample(INGESTION_CONFIG.get("max_training_rows"))
+    else:
+        if not data_path.exists():
+            raise FileNotFoundError(f"Training dataset not found: {data_path}")
 
-    df = pd.read_csv(data_path)
+        logger.info(f"Loading training data from {data_path}")
+
+        df = concat_frames(list(read_csv_chunks(data_path)))
 
     logger.info(
-        f"Dataset loaded | rows = {len(df)} | cols = {len(df.columns)}"
+        f"Dataset loaded | rows = {len(df)} | cols = {len(df.columns)} "
+        f"| memory = {df.memory_usage(deep=True).sum() / 2**20:.1f} MB"
     )
 
+    return df, data_path
+
+
+def iter_training_batches(columns: list | None = None, batch_rows: int | None = None):
+    """
+    Labeled batches of the retraining store for incremental
+    (`partial_fit`) learners; memory stays bounded by one batch.
+    """
+
+    store = TrainingDataStore(Path(CONFIG["paths"]["retraining_store"]))
 
-    return df, data_path
\ No newline at end of file
+    yield from store.iter_batches(columns, batch_rows or INGESTION_CONFIG["chunk_rows"])
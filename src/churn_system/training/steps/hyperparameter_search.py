@@ -0,0 +1,273 @@
+"""
+Hyperparameter Search Step
+
+Tunes every candidate model before the final fit.
+
+- Folds are time-aware: rows are tenure-ordered, and each fold trains
+  on earlier tenure and validates on the tenure that follows
+  (TimeSeriesSplit), matching the final train/test split.
+- Each fold is preprocessed once; the fitted fold matrices are shared
+  by every configuration and sent once to each worker process.
+- Successive halving: all configurations are scored on the first
+  (smallest, cheapest) folds, and only the best 1/factor go on to be
+  scored on more folds, until the survivors have seen every fold.
+- (configuration, fold) fits run concurrently in a process pool.
+
+Search spaces live under `search.spaces` in settings.yaml.
+"""
+
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import ParameterGrid, TimeSeriesSplit
+from threadpoolctl import threadpool_limits
+
+from churn_system.logging.logger import get_logger
+from churn_system.config.config import CONFIG
+from churn_system.training.steps.model_training import (
+    build_candidates,
+    build_preprocessor,
+    resolve_workers,
+)
+
+logger = get_logger(__name__, CONFIG["logging"]["training"])
+
+SEARCH_CONFIG = CONFIG.get("search", {})
+
+
+# ---------- fold cache ----------
+
+def build_fold_matrices(X_train, y_train, n_splits: int) -> list:
+    """
+    Preprocess every tenure-ordered fold exactly once.
+
+    Returns
+    -------
+    list[tuple]
+        (Xt_train, y_train, Xt_val, y_val) per fold, smallest training window first.
+    """
+
+    folds = []
+
+    for train_idx, val_idx in TimeSeriesSplit(n_splits=n_splits).split(X_train):
+        preprocessor = build_preprocessor(X_train)
+
+        folds.append((
+            preprocessor.fit_transform(X_train.iloc[train_idx]),
+            np.asarray(y_train.iloc[train_idx]),
+            preprocessor.transform(X_train.iloc[val_idx]),
+            np.asarray(y_train.iloc[val_idx]),
+        ))
+
+    return folds
+
+
+FOLD_PARTS = ("Xt_train", "y_train", "Xt_val", "y_val")
+
+
+def fold_items(folds: list) -> dict:
+    """
+    Flatten fold matrices into named items (for the feature cache).
+    """
+
+    return {
+        f"fold{i}_{part}": value
+        for i, fold in enumerate(folds)
+        for part, value in zip(FOLD_PARTS, fold)
+    }
+
+
+def folds_from_items(items: dict) -> list:
+    n_splits = len(items) // len(FOLD_PARTS)
+
+    return [
+        tuple(items[f"fold{i}_{part}"] for part in FOLD_PARTS)
+        for i in range(n_splits)
+    ]
+
+
+# ---------- worker ----------
+
+# Fold matrices, set once per worker process by the pool initializer
+_WORKER_FOLDS = []
+
+
+def _init_worker(folds):
+    _WORKER_FOLDS[:] = folds
+
+
+def _score_config(name: str, params: dict, fold: int, folds=None) -> tuple:
+    """
+    Fit one candidate configuration on one fold and return its validation ROC-AUC.
+    """
+
+    Xt_train, y_fold, Xt_val, y_val = (_WORKER_FOLDS if folds is None else folds)[fold]
+
+    model = build_candidates()[name].set_params(**params)
+
+    if "n_jobs" in model.get_params():
+        model.set_params(n_jobs=1)
+
+    with threadpool_limits(limits=1):
+        model.fit(Xt_train, y_fold)
+
+    # A validation window with one class has no ROC-AUC
+    if len(np.unique(y_val)) < 2:
+        return name, params, fold, float("nan")
+
+    return name, params, fold, float(roc_auc_score(y_val, model.predict_proba(Xt_val)[:, 1]))
+
+
+# ---------- search ----------
+
+def search_spaces() -> dict:
+    """
+    Configurations per candidate. Candidates without a search space
+    keep their default hyperparameters.
+    """
+
+    spaces = SEARCH_CONFIG.get("spaces") or {}
+
+    return {
+        name: list(ParameterGrid(spaces[name])) if spaces.get(name) else [{}]
+        for name in build_candidates()
+    }
+
+
+def run_hyperparameter_search(
+    X_train,
+    y_train,
+    max_workers: int | None = None,
+    folds: list | None = None,
+) -> dict:
+    """
+    Successive-halving search over tenure-ordered CV folds for every candidate.
+
+    Parameters
+    ----------
+    X_train : pd.DataFrame
+        Training features, sorted by tenure.
+    y_train : pd.Series
+        Training target in the same order.
+    folds : list, optional
+        Precomputed fold matrices (e.g. from the feature cache).
+
+    Returns
+    -------
+    dict
+        Per candidate: best_params, cv_roc_auc (mean over all folds)
+        and the rungs of the search.
+    """
+
+    n_splits = SEARCH_CONFIG.get("n_splits", 3)
+    factor = SEARCH_CONFIG.get("factor", 3)
+    min_folds = SEARCH_CONFIG.get("min_folds", 1)
+
+    start = time.perf_counter()
+
+    if folds is None:
+        folds = build_fold_matrices(X_train, y_train, n_splits)
+        logger.info(f"Search fold matrices built | folds = {n_splits} | {time.perf_counter() - start:.2f}s")
+
+    if len(folds) != n_splits:
+        raise ValueError(f"Expected {n_splits} fold matrices, got {len(folds)}")
+
+    spaces = search_spaces()
+    survivors = {name: list(range(len(configs))) for name, configs in spaces.items()}
+    scores = {name: {} for name in spaces}
+    rungs = {name: [] for name in spaces}
+
+    n_tasks = sum(len(configs) for configs in spaces.values())
+    workers = resolve_workers(n_tasks, max_workers=max_workers)
+
+    logger.info(f"Hyperparameter search | configurations = {n_tasks} | workers = {workers}")
+
+    pool = None
+    if workers > 1:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(folds,))
+
+    try:
+        n_folds = min(min_folds, n_splits)
+
+        while True:
+            # Only (configuration, fold) pairs not scored in an earlier rung
+            tasks = [
+                (name, i, fold)
+                for name, alive in survivors.items()
+                for i in alive
+                for fold in range(n_folds)
+                if (i, fold) not in scores[name]
+            ]
+
+            if pool is None:
+                results = [
+                    _score_config(name, spaces[name][i], fold, folds)
+                    for name, i, fold in tasks
+                ]
+            else:
+                futures = [
+                    pool.submit(_score_config, name, spaces[name][i], fold)
+                    for name, i, fold in tasks
+                ]
+                results = [future.result() for future in futures]
+
+            for (name, i, fold), (_, _, _, score) in zip(tasks, results):
+                scores[name][(i, fold)] = score
+
+            for name, alive in survivors.items():
+                ranked = sorted(
+                    alive,
+                    key=lambda i: np.nanmean([scores[name][(i, f)] for f in range(n_folds)]),
+                    reverse=True,
+                )
+
+                rungs[name].append({
+                    "folds": n_folds,
+                    "configs": [
+                        {
+                            "params": spaces[name][i],
+                            "roc_auc": float(np.nanmean([scores[name][(i, f)] for f in range(n_folds)])),
+                        }
+                        for i in ranked
+                    ],
+                })
+
+                # Weak configurations stop here; the final rung keeps its ranking
+                keep = len(ranked) if n_folds == n_splits else max(1, math.ceil(len(ranked) / factor))
+                survivors[name] = ranked[:keep]
+
+            logger.info(
+                f"Search rung | folds = {n_folds} | fits = {len(tasks)} | "
+                f"survivors = { {name: len(alive) for name, alive in survivors.items()} }"
+            )
+
+            if n_folds == n_splits:
+                break
+
+            n_folds = min(n_splits, n_folds * factor)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    report = {}
+
+    for name, alive in survivors.items():
+        best = alive[0]
+        cv_roc_auc = float(np.nanmean([scores[name][(best, f)] for f in range(n_splits)]))
+
+        report[name] = {
+            "best_params": spaces[name][best],
+            "cv_roc_auc": cv_roc_auc,
+            "configurations": len(spaces[name]),
+            "fits": len(scores[name]),
+            "rungs": rungs[name],
+        }
+
+        logger.info(f"{name} best params = {spaces[name][best]} | CV ROC-AUC = {cv_roc_auc:.4f}")
+
+    logger.info(f"Hyperparameter search completed in {time.perf_counter() - start:.2f}s")
+
+    return report
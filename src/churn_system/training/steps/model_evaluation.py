@@ -19,9 +19,31 @@ from churn_system.config.config import CONFIG
 logger = get_logger(__name__, CONFIG["logging"]["training"])
 
 
-def evaluate_candidates(models, X_test, y_test):
+def compute_metrics(model, X, y) -> dict:
+    """
+    Holdout metrics of a fitted classifier / pipeline.
+    """
+
+    probs = model.predict_proba(X)[:, 1]
+    preds = model.predict(X)
+
+    return {
+        "accuracy": float(accuracy_score(y, preds)),
+        "precision": float(precision_score(y, preds)),
+        "recall": float(recall_score(y, preds)),
+        "f1_score": float(f1_score(y, preds)),
+        "roc_auc": float(roc_auc_score(y, probs)),
+        "pr_auc": float(average_precision_score(y, probs)),
+    }
+
+
+def evaluate_candidates(models, X_test, y_test, cv_scores: dict | None = None):
     """
     Evaluate all models and return winner + experiment report.
+
+    With `cv_scores` (mean cross-validated ROC-AUC per candidate, from
+    the hyperparameter search), the winner is the best CV score rather
+    than the best score on the single holdout split.
     """
 
     results = {}
@@ -31,31 +53,24 @@ def evaluate_candidates(models, X_test, y_test):
 
     for name, model in models.items():
 
-        probs = model.predict_proba(X_test)[:, 1]
-        preds = model.predict(X_test)
-
-        metrics = {
-            "accuracy": float(accuracy_score(y_test, preds)),
-            "precision": float(precision_score(y_test, preds)),
-            "recall": float(recall_score(y_test, preds)),
-            "f1_score": float(f1_score(y_test, preds)),
-            "roc_auc": float(roc_auc_score(y_test, probs)),
-            "pr_auc": float(average_precision_score(y_test, probs)),
-        }
+        metrics = compute_metrics(model, X_test, y_test)
 
         logger.info(f"{name} ROC-AUC = {metrics['roc_auc']:.4f}")
 
         results[name] = metrics
 
         # winner selection rule
-        if metrics["roc_auc"] > best_score:
-            best_score = metrics["roc_auc"]
+        score = metrics["roc_auc"] if cv_scores is None else cv_scores[name]
+
+        if score > best_score:
+            best_score = score
             best_model = model
             best_name = name
 
     experiment_report = {
         "candidates": results,
         "winner": best_name,
+        "selection": "roc_auc" if cv_scores is None else "cv_roc_auc",
     }
 
     logger.info(f"Winner selected: {best_name}")
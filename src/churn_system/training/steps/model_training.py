@@ -3,46 +3,49 @@ Model Training Step
 
 Trains multiple candidate models and returns the best one.
 Also records experiment results.
+
+The preprocessor is fitted once and its transformed matrix is shared
+by every candidate. With `training.parallel` enabled, the candidates
+are fitted concurrently in a process pool, each within its own thread
+budget, so retraining takes about as long as the slowest candidate.
+
+Allocation tracing (`training.profile_memory`) slows fitting down and
+is off unless asked for.
 """
 
+import os
+import resource
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
 from sklearn.pipeline import Pipeline
-from sklearn.compose import ColumnTransformer
-from sklearn.preprocessing import StandardScaler, OneHotEncoder
 from sklearn.linear_model import LogisticRegression
 from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
+from threadpoolctl import threadpool_limits
 
+from churn_system.features.encoding import build_column_encoder
 from churn_system.logging.logger import get_logger
 from churn_system.config.config import CONFIG
 
 logger = get_logger(__name__, CONFIG["logging"]["training"])
 
+TRAINING_CONFIG = CONFIG.get("training", {})
+
 
 def build_preprocessor(X):
     """
     Build preprocessing pipeline shared across models.
-    """
 
-    categorical_cols = X.select_dtypes(include=["object"]).columns
-    numerical_cols = X.select_dtypes(exclude=["object"]).columns
-
-    preprocessor = ColumnTransformer(
-        transformers=[
-            ("num", StandardScaler(), numerical_cols),
-            ("cat", OneHotEncoder(handle_unknown="ignore"), categorical_cols),
-        ]
-    )
-
-    return preprocessor
-
-
-def train_candidate_models(X_train, y_train):
-    """
-    Train multiple candidate models.
+    Categorical columns are one-hot, frequency or hash encoded
+    depending on their cardinality (see features/encoding.py).
     """
 
-    preprocessor = build_preprocessor(X_train)
+    return build_column_encoder(X)
+
 
-    candidates = {
+def build_candidates() -> dict:
+    return {
         "logistic_regression": LogisticRegression(
             max_iter=1000, class_weight="balanced"
         ),
@@ -54,19 +57,205 @@ def train_candidate_models(X_train, y_train):
         ),
     }
 
+
+# ---------- worker ----------
+
+# Transformed training data, set once per worker process by the pool initializer
+_WORKER_DATA = {}
+
+
+def _init_worker(Xt, y):
+    _WORKER_DATA["Xt"] = Xt
+    _WORKER_DATA["y"] = y
+
+
+def _fit_candidate(name: str, model, threads: int, Xt=None, y=None, profile_memory: bool = False) -> tuple:
+    """
+    Fit one estimator on the transformed matrix within a thread budget.
+
+    Returns
+    -------
+    tuple
+        (name, fitted model, stats) with wall-clock seconds, the process
+        RSS high-water mark and, with `profile_memory`, the peak
+        Python/NumPy memory traced while fitting. The RSS peak also
+        covers C-level buffers (e.g. tree nodes); it is per candidate
+        only in a fresh worker process.
+    """
+
+    Xt = _WORKER_DATA["Xt"] if Xt is None else Xt
+    y = _WORKER_DATA["y"] if y is None else y
+
+    # Joblib workers (RandomForest) and BLAS/OpenMP pools share the same budget.
+    # The training budget is not kept: the fitted model is pickled and served.
+    has_n_jobs = "n_jobs" in model.get_params()
+
+    if has_n_jobs:
+        n_jobs = model.get_params()["n_jobs"]
+        model.set_params(n_jobs=threads)
+
+    if profile_memory:
+        tracemalloc.start()
+
+    start = time.perf_counter()
+
+    try:
+        with threadpool_limits(limits=threads):
+            model.fit(Xt, y)
+    finally:
+        if has_n_jobs:
+            model.set_params(n_jobs=n_jobs)
+
+    seconds = time.perf_counter() - start
+
+    stats = {
+        "wall_seconds": round(seconds, 3),
+        # ru_maxrss is in KiB on Linux
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "threads": threads,
+        "pid": os.getpid(),
+    }
+
+    if profile_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        stats["peak_memory_mb"] = round(peak / 2**20, 1)
+
+    return name, model, stats
+
+
+# ---------- scheduling ----------
+
+def resolve_workers(n_candidates: int, parallel: bool | None = None, max_workers: int | None = None) -> int:
+    """
+    Number of candidate processes: 1 when parallel training is off,
+    otherwise `training.max_workers` (default: CPU count), capped at
+    the number of candidates.
+    """
+
+    parallel = TRAINING_CONFIG.get("parallel", False) if parallel is None else parallel
+
+    if not parallel:
+        return 1
+
+    max_workers = TRAINING_CONFIG.get("max_workers") if max_workers is None else max_workers
+
+    return max(1, min(n_candidates, max_workers or os.cpu_count() or 1))
+
+
+def resolve_threads(name: str, workers: int) -> int:
+    """
+    Thread budget of one candidate: `training.threads.<name>`, otherwise
+    an even share of the CPUs among the concurrent workers.
+    """
+
+    configured = (TRAINING_CONFIG.get("threads") or {}).get(name)
+
+    if configured:
+        return int(configured)
+
+    return max(1, (os.cpu_count() or 1) // workers)
+
+
+def train_candidate_models(
+    X_train,
+    y_train,
+    params: dict | None = None,
+    parallel: bool | None = None,
+    max_workers: int | None = None,
+    preprocessor=None,
+    Xt=None,
+    profile_memory: bool | None = None,
+):
+    """
+    Train multiple candidate models.
+
+    `params` maps candidate names to hyperparameters overriding the
+    defaults (e.g. the best configurations of the hyperparameter search).
+    A `preprocessor` already fitted on X_train, with its output `Xt`
+    (e.g. from the feature cache), skips the preprocessing fit.
+    `profile_memory` (default: `training.profile_memory`) traces the
+    peak allocation of every fit.
+
+    Returns
+    -------
+    tuple[dict, dict]
+        Fitted pipelines by candidate name, and training stats
+        (wall-clock, memory, threads) per candidate.
+    """
+
+    if profile_memory is None:
+        profile_memory = TRAINING_CONFIG.get("profile_memory", False)
+
+    start = time.perf_counter()
+
+    if preprocessor is None or Xt is None:
+        preprocessor = build_preprocessor(X_train)
+        Xt = preprocessor.fit_transform(X_train)
+
+    preprocess_seconds = time.perf_counter() - start
+
+    logger.info(f"Preprocessor fitted once | shape = {Xt.shape} | {preprocess_seconds:.2f}s")
+
+    candidates = build_candidates()
+
+    for name, overrides in (params or {}).items():
+        candidates[name].set_params(**overrides)
+
+    workers = resolve_workers(len(candidates), parallel, max_workers)
+
+    logger.info(f"Training {len(candidates)} candidates | workers = {workers}")
+
+    start = time.perf_counter()
+    results = []
+
+    if workers == 1:
+        for name, model in candidates.items():
+            logger.info(f"Training candidate model: {name}")
+            results.append(_fit_candidate(name, model, resolve_threads(name, 1), Xt, y_train, profile_memory))
+    else:
+        # The matrix is sent once per worker, not once per candidate
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(Xt, y_train),
+        ) as pool:
+            futures = [
+                pool.submit(_fit_candidate, name, model, resolve_threads(name, workers), profile_memory=profile_memory)
+                for name, model in candidates.items()
+            ]
+            results = [future.result() for future in futures]
+
+    total_seconds = time.perf_counter() - start
+
     trained_models = {}
+    candidate_stats = {}
 
-    for name, model in candidates.items():
-        logger.info(f"Training candidate model: {name}")
+    for name, model, stats in results:
+        peak = f"peak = {stats['peak_memory_mb']:.1f} MB | " if "peak_memory_mb" in stats else ""
 
-        pipeline = Pipeline(
+        logger.info(
+            f"Trained {name} | {stats['wall_seconds']:.2f}s | "
+            f"{peak}rss = {stats['max_rss_mb']:.0f} MB | threads = {stats['threads']}"
+        )
+
+        # Every pipeline shares the single fitted preprocessor
+        trained_models[name] = Pipeline(
             steps=[
                 ("preprocessor", preprocessor),
                 ("model", model),
             ]
         )
+        candidate_stats[name] = stats
+
+    training_stats = {
+        "workers": workers,
+        "preprocess_seconds": round(preprocess_seconds, 3),
+        "wall_seconds": round(total_seconds, 3),
+        "candidates": candidate_stats,
+    }
 
-        pipeline.fit(X_train, y_train)
-        trained_models[name] = pipeline
+    logger.info(f"Candidate training completed in {total_seconds:.2f}s")
 
-    return trained_models
\ No newline at end of file
+    return trained_models, training_stats
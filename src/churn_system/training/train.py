@@ -6,21 +6,36 @@ Data → Validation → Feature Engineering → Training → Evaluation → Arti
 """
 
 import json
-import pickle
 import numpy as np
-from datetime import datetime
+import pandas as pd
+from datetime import datetime, timezone
 from pathlib import Path
 
 from churn_system.logging.logger import get_logger
-from churn_system.schema import TARGET_COLUMN
+from churn_system.schema import TARGET_COLUMN, training_dtypes
 from churn_system.config.config import CONFIG
 
 # pipeline steps
-from churn_system.training.steps.data_ingestion import load_training_data
+from churn_system.training.steps import data_ingestion, data_validation, feature_engineering
+from churn_system.training.steps.data_ingestion import load_training_data, training_data_path
 from churn_system.training.steps.data_validation import run_data_validation
 from churn_system.training.steps.feature_engineering import run_feature_engineering
-from churn_system.training.steps.model_training import train_candidate_models
+from churn_system.training.steps.hyperparameter_search import (
+    build_fold_matrices,
+    fold_items,
+    folds_from_items,
+    run_hyperparameter_search,
+)
+from churn_system.training.steps.model_training import build_preprocessor, train_candidate_models
 from churn_system.training.steps.model_evaluation import evaluate_candidates
+from churn_system.features import encoding
+from churn_system.features.feature_cache import get_or_build
+from churn_system.new_data import training_store
+from churn_system.monitoring.drift_state import build_reference, save_reference
+from churn_system.inference.compiled_scorer import export_compiled_scorer
+from churn_system.inference.validation_plan import build_validation_plan
+from churn_system.inference.model_artifact import save_pipeline
+from churn_system.inference.tree_ensemble import export_tree_ensemble
 
 
 MODEL_VERSION = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -43,68 +58,123 @@ def summarize_feature(name, train_series, test_series):
 
 
 
-def main():
+def prepare_training_data() -> dict:
+    """
+    Load and validate the raw data, split it time-aware, build features
+    and fit the shared preprocessor on the training split.
 
-    logger.info("===== Training Pipeline Started =====")
+    Returns
+    -------
+    dict
+        X_train, X_test, y_train, y_test, the fitted preprocessor
+        and its encoded training matrix Xt_train.
+    """
 
     df, data_path = load_training_data()
 
-    logger.info(f"Training dataset used: {data_path}")
-    logger.info(f"Training samples: {len(df)}")
-
     df = run_data_validation(df)
 
-    # Fix numeric column issue
-    df["Total Charges"] = (
-        df["Total Charges"]
-        .replace(" ", np.nan)
-        .astype(float)
-        .fillna(0)
-    )
+    # Blank "Total Charges" (new customers) is read as missing
+    df["Total Charges"] = df["Total Charges"].fillna(0)
 
-    df_sorted = df.sort_values("Tenure Months")
+    # Stable: ties keep file order, whatever dtype the column was read as
+    df_sorted = df.sort_values("Tenure Months", kind="stable")
 
     split_index = int(0.8 * len(df_sorted))
     train_df = df_sorted.iloc[:split_index]
     test_df = df_sorted.iloc[split_index:]
 
-    y_train = train_df[TARGET_COLUMN]
-    y_test = test_df[TARGET_COLUMN]
-
-    log_target_distribution(y_train)
-
     X_train = run_feature_engineering(train_df)
     X_test = run_feature_engineering(test_df)
 
-    feature_schema = list(X_train.columns)
-    logger.info(f"Feature schema captured ({len(feature_schema)} features)")
+    preprocessor = build_preprocessor(X_train)
+    Xt_train = preprocessor.fit_transform(X_train)
+
+    return {
+        "X_train": X_train,
+        "X_test": X_test,
+        "y_train": train_df[TARGET_COLUMN],
+        "y_test": test_df[TARGET_COLUMN],
+        "preprocessor": preprocessor,
+        "Xt_train": Xt_train,
+    }
+
 
-    summarize_feature(
-        "Tenure Months",
-        train_df["Tenure Months"],
-        test_df["Tenure Months"],
+def feature_cache_inputs() -> tuple[tuple, dict]:
+    """
+    Code and settings the cached training features are derived from.
+
+    Returns
+    -------
+    tuple[tuple, dict]
+        Modules/functions (`*code` of the cache key) and build
+        parameters (`**params`).
+    """
+
+    code = (
+        data_ingestion,
+        training_store,
+        data_validation,
+        prepare_training_data,
+        feature_engineering,
+        build_preprocessor,
+        encoding,
     )
 
-    summarize_feature(
-        "Monthly Charges",
-        train_df["Monthly Charges"],
-        test_df["Monthly Charges"],
+    params = {
+        "ingestion": CONFIG.get("ingestion", {}),
+        "dtypes": training_dtypes(),
+        "encoding": CONFIG.get("encoding", {}),
+    }
+
+    return code, params
+
+
+def main():
+
+    logger.info("===== Training Pipeline Started =====")
+
+    data_path = training_data_path()
+
+    # Unchanged data, feature code and settings → straight to model fitting
+    cache_code, cache_params = feature_cache_inputs()
+
+    data, features_cache = get_or_build(
+        "training_features",
+        data_path,
+        prepare_training_data,
+        *cache_code,
+        **cache_params,
     )
 
-    summarize_feature(
-        "Total Charges",
-        train_df["Total Charges"],
-        test_df["Total Charges"],
+    X_train, X_test = data["X_train"], data["X_test"]
+    y_train, y_test = data["y_train"], data["y_test"]
+
+    logger.info(f"Training dataset used: {data_path}")
+    logger.info(f"Training samples: {len(X_train) + len(X_test)}")
+
+    log_target_distribution(y_train)
+
+    feature_schema = list(X_train.columns)
+    logger.info(f"Feature schema captured ({len(feature_schema)} features)")
+
+    strategies = encoding.encoding_plan(data["preprocessor"])
+    logger.info(
+        f"Encoded width = {strategies['encoded_width']} | high-cardinality columns = "
+        f"{ {c: s['strategy'] for c, s in strategies['columns'].items() if s['strategy'] in ('frequency', 'hash')} }"
     )
 
+    for name in ["Tenure Months", "Monthly Charges", "Total Charges"]:
+        summarize_feature(name, X_train[name], X_test[name])
+
     logger.info(
         f"Train tenure range: "
-        f"{train_df['Tenure Months'].min()} - {train_df['Tenure Months'].max()}"
+        f"{X_train['Tenure Months'].min()} - {X_train['Tenure Months'].max()}"
     )
 
     logger.info(
         f"Test tenure range: "
-        f"{test_df['Tenure Months'].min()} - {test_df['Tenure Months'].max()}"
+        f"{X_test['Tenure Months'].min()} - {X_test['Tenure Months'].max()}"
     )
 
     reference_path = Path(CONFIG["paths"]["training_reference"])
@@ -115,18 +185,64 @@ def main():
 
 
 
+    search_report = None
+    best_params = None
+    cv_scores = None
+
+    feature_cache = {"training_features": features_cache}
+
+    if CONFIG.get("search", {}).get("enabled", False):
+        logger.info("Searching candidate hyperparameters...")
+
+        n_splits = CONFIG["search"].get("n_splits", 3)
+
+        fold_data, feature_cache["search_folds"] = get_or_build(
+            "search_folds",
+            data_path,
+            lambda: fold_items(build_fold_matrices(X_train, y_train, n_splits)),
+            *cache_code,
+            build_fold_matrices,
+            n_splits=n_splits,
+            **cache_params,
+        )
+
+        # X_train is tenure-sorted, so the CV folds are time-aware
+        search_report = run_hyperparameter_search(
+            X_train,
+            y_train,
+            folds=folds_from_items(fold_data),
+        )
+        best_params = {name: r["best_params"] for name, r in search_report.items()}
+        cv_scores = {name: r["cv_roc_auc"] for name, r in search_report.items()}
+
     logger.info("Training candidate models...")
 
-    candidate_models = train_candidate_models(X_train, y_train)
+    candidate_models, training_stats = train_candidate_models(
+        X_train,
+        y_train,
+        params=best_params,
+        preprocessor=data["preprocessor"],
+        Xt=data["Xt_train"],
+    )
 
     logger.info("Evaluating candidate models...")
 
     pipeline, experiment_report, metrics = evaluate_candidates(
         candidate_models,
         X_test,
-        y_test
+        y_test,
+        cv_scores=cv_scores,
     )
 
+    # Per-candidate wall-clock and peak memory
+    experiment_report["training"] = training_stats
+
+    if search_report is not None:
+        experiment_report["search"] = search_report
+
+    # Hit / miss per cached stage
+    experiment_report["feature_cache"] = feature_cache
+
     winner_name = experiment_report["winner"]
 
     logger.info(f"Champion model selected: {winner_name}")
@@ -137,27 +253,48 @@ def main():
     )
     model_dir.mkdir(parents=True, exist_ok=True)
 
-    model_path = model_dir / "model.pkl"
-
-    with open(model_path, "wb") as f:
-        pickle.dump(pipeline, f)
+    # model.pkl + manifest.json with its checksum
+    model_path = save_pipeline(pipeline, model_dir)
 
     logger.info(f"Model saved at {model_path}")
 
+    # NumPy-only scorer for the API fast path, verified against predict_proba.
+    # Tree models save their packed ensemble with it; when the pipeline
+    # cannot be compiled the ensemble is still exported for batch scoring
+    if export_compiled_scorer(pipeline, model_dir, X_test) is None:
+        export_tree_ensemble(pipeline, model_dir, X_test)
+
     # Save experiment comparison report
     with open(model_dir / "experiment_report.json", "w") as f:
         json.dump(experiment_report, f, indent=2)
 
     logger.info("Experiment report saved.")
 
+    # Reference histograms for incremental drift monitoring
+    save_reference(build_reference(X_train), model_dir)
+
+    logger.info("Drift reference saved.")
+
+    # Column order, dtypes, categories and ranges checked at inference.
+    # Both splits: the split is by tenure, so the training split alone
+    # would reject the longest-tenure customers as out of range
+    build_validation_plan(pd.concat([X_train, X_test])).save(model_dir)
+
+    logger.info("Validation plan saved.")
+
 
     metadata = {
         "model_version": MODEL_VERSION,
         "training_date": datetime.now().strftime("%Y-%m-%d"),
         "model_type": winner_name,
         "split_strategy": "time-aware (tenure-based)",
+        "training_mode": "full",
+        # Prediction logs up to here are reflected; incremental updates start after it
+        "trained_until": datetime.now(timezone.utc).isoformat(),
         "feature_schema": feature_schema,
         "feature_count": len(feature_schema),
+        # Per-column categorical strategies of the fitted preprocessor
+        "encoding": encoding.encoding_plan(pipeline.named_steps["preprocessor"]),
         "metrics": metrics,
         "dataset": str(data_path),
     }
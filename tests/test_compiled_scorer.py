@@ -0,0 +1,176 @@
+"""
+Parity of the compiled scorer with the sklearn pipeline it was compiled from.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+from churn_system.benchmarks.synthetic import make_telco_frame
+from churn_system.features.build_features import TARGET_COLUMN, build_features
+from churn_system.features.encoding import FrequencyEncoder, HashingEncoder
+from churn_system.inference.compiled_scorer import (
+    PARITY_TOLERANCE,
+    CompiledScorer,
+    check_parity,
+    compile_pipeline,
+    load_compiled_scorer,
+)
+
+FREQUENCY_COLUMNS = ["City"]
+HASH_COLUMNS = ["Lat Long"]
+
+ESTIMATORS = {
+    "logistic_regression": lambda: LogisticRegression(max_iter=1000),
+    "random_forest": lambda: RandomForestClassifier(n_estimators=20, max_depth=6, random_state=0),
+    "gradient_boosting": lambda: GradientBoostingClassifier(n_estimators=30, random_state=0),
+}
+
+
+@pytest.fixture(scope="module")
+def data():
+    df = make_telco_frame(600, seed=3)
+    return build_features(df, training=True), df[TARGET_COLUMN]
+
+
+def make_pipeline(X, estimator) -> Pipeline:
+    numeric = X.select_dtypes("number").columns.tolist()
+    text = [c for c in X.columns if c not in numeric]
+    one_hot = [c for c in text if c not in FREQUENCY_COLUMNS + HASH_COLUMNS]
+
+    preprocessor = ColumnTransformer([
+        ("num", StandardScaler(), numeric),
+        ("cat", OneHotEncoder(handle_unknown="ignore"), one_hot),
+        ("freq", FrequencyEncoder(), FREQUENCY_COLUMNS),
+        ("hash", HashingEncoder(width=16), HASH_COLUMNS),
+    ])
+
+    return Pipeline([("preprocessor", preprocessor), ("model", estimator)])
+
+
+@pytest.fixture(scope="module", params=list(ESTIMATORS))
+def fitted(request, data):
+    X, y = data
+    pipeline = make_pipeline(X, ESTIMATORS[request.param]()).fit(X, y)
+    return pipeline, compile_pipeline(pipeline)
+
+
+def expected(pipeline, records: list) -> np.ndarray:
+    X = build_features(pd.DataFrame(records))
+    return pipeline.predict_proba(X)[:, 1]
+
+
+def assert_parity(scorer, pipeline, records):
+    compiled = np.array([scorer.score_record(r) for r in records], dtype=np.float64)
+
+    assert not np.isnan(compiled).any()
+    np.testing.assert_allclose(compiled, expected(pipeline, records), rtol=0, atol=PARITY_TOLERANCE)
+
+
+def test_encoders_compiled(fitted):
+    _, scorer = fitted
+
+    assert scorer.frequency_columns == FREQUENCY_COLUMNS
+    assert scorer.hash_columns == HASH_COLUMNS
+
+
+def test_records_match_pipeline(fitted, data):
+    pipeline, scorer = fitted
+    X, _ = data
+
+    assert_parity(scorer, pipeline, X.to_dict(orient="records"))
+
+
+def test_check_parity_within_tolerance(fitted, data):
+    pipeline, scorer = fitted
+    X, _ = data
+
+    parity = check_parity(scorer, pipeline, X)
+
+    assert parity["fallback_rows"] == 0
+    assert parity["max_abs_difference"] <= PARITY_TOLERANCE
+
+
+def test_unseen_categories(fitted, data):
+    pipeline, scorer = fitted
+    X, _ = data
+
+    records = X.head(50).to_dict(orient="records")
+
+    for record in records:
+        for col in scorer.categorical_columns + scorer.frequency_columns + scorer.hash_columns:
+            record[col] = "__unseen__"
+
+    assert_parity(scorer, pipeline, records)
+
+
+def test_frequency_and_hash_values(fitted, data):
+    pipeline, scorer = fitted
+    X, _ = data
+
+    counts = X["City"].value_counts()
+    rare = counts[counts == 1].index[0]
+    common = counts.index[0]
+
+    records = X.head(3).to_dict(orient="records")
+    records[0]["City"] = rare
+    records[1]["City"] = common
+    records[2]["City"] = "__unseen__"
+
+    # Unseen values still hash into one of the buckets
+    records[2]["Lat Long"] = "0.0, 0.0"
+
+    assert_parity(scorer, pipeline, records)
+
+
+def test_missing_zero_filled_value(fitted, data):
+    pipeline, scorer = fitted
+    X, _ = data
+
+    record = X.iloc[0].to_dict()
+    missing = {**record, "Total Charges": None}
+    nan = {**record, "Total Charges": float("nan")}
+
+    # build_features fills a missing Total Charges with 0
+    reference = expected(pipeline, [{**record, "Total Charges": 0}])[0]
+
+    assert abs(scorer.score_record(missing) - reference) <= PARITY_TOLERANCE
+    assert abs(scorer.score_record(nan) - reference) <= PARITY_TOLERANCE
+
+
+@pytest.mark.parametrize("column, value", [
+    ("Monthly Charges", None),
+    ("Monthly Charges", float("nan")),
+    ("Monthly Charges", "70.5"),
+    ("Contract", None),
+    ("City", None),
+    ("Lat Long", 1.5),
+])
+def test_records_needing_the_pipeline(fitted, data, column, value):
+    _, scorer = fitted
+    X, _ = data
+
+    record = {**X.iloc[0].to_dict(), column: value}
+
+    assert scorer.score_record(record) is None
+
+
+def test_save_and_load(fitted, data, tmp_path):
+    _, scorer = fitted
+    X, _ = data
+
+    scorer.save(tmp_path)
+    loaded = CompiledScorer.load(tmp_path)
+
+    records = X.head(20).to_dict(orient="records")
+
+    np.testing.assert_array_equal(loaded.predict_records(records), scorer.predict_records(records))
+
+
+def test_no_scorer_for_legacy_models(tmp_path):
+    assert load_compiled_scorer(tmp_path) is None
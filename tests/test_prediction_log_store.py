@@ -0,0 +1,97 @@
+"""
+Compaction of the partitioned prediction log store.
+"""
+
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from churn_system.monitoring import prediction_log_store
+from churn_system.monitoring.prediction_log_store import (
+    LOCK_FILE,
+    PartitionedPredictionStore,
+    partition_files,
+)
+
+
+def records(n: int, start: str = "2026-01-01T10:00:00Z") -> list:
+    base = pd.Timestamp(start)
+
+    return [
+        {
+            "timestamp": (base + pd.Timedelta(seconds=i)).isoformat(),
+            "Monthly Charges": 20.0 + i,
+            "Contract": "One year",
+            "prediction_probability": 0.5,
+            "prediction": 0,
+        }
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = PartitionedPredictionStore(tmp_path)
+
+    for i in range(3):
+        store.write(records(4, start=f"2026-01-01T10:0{i}:00Z"))
+
+    return store
+
+
+def test_compaction_keeps_every_row_once(store):
+    directory = store.partitions()[0]
+
+    assert store.compact_partition(directory)
+    assert len(partition_files(directory)) == 1
+    assert len(store.read()) == 12
+
+
+def test_readers_skip_replaced_parts(store, monkeypatch):
+    directory = store.partitions()[0]
+
+    # Crash after the compacted file is in place, before the parts are deleted
+    unlink = prediction_log_store.Path.unlink
+    monkeypatch.setattr(
+        prediction_log_store.Path,
+        "unlink",
+        lambda self, missing_ok=False: None if self.name.startswith("part-") else unlink(self, missing_ok),
+    )
+    store.compact_partition(directory)
+    monkeypatch.undo()
+
+    assert len(list(directory.glob("part-*.parquet"))) == 4
+    assert len(store.read()) == 12
+
+    # The next compaction deletes the leftovers
+    store.compact_partition(directory)
+
+    assert len(list(directory.glob("part-*.parquet"))) == 1
+    assert len(store.read()) == 12
+
+
+def test_held_lock_blocks_compaction(store):
+    directory = store.partitions()[0]
+    (directory / LOCK_FILE).write_text(f"{os.getpid()} {os.uname().nodename} {time.time()}")
+
+    assert not store.compact_partition(directory)
+    assert len(partition_files(directory)) == 3
+
+
+@pytest.mark.parametrize("owner, age", [
+    ("999999999 {host} 0", 0),
+    ("", 2 * prediction_log_store.LOCK_STALE_SECONDS),
+])
+def test_stale_lock_is_broken(store, owner, age):
+    directory = store.partitions()[0]
+    lock = directory / LOCK_FILE
+    lock.write_text(owner.format(host=os.uname().nodename))
+
+    mtime = time.time() - age
+    os.utime(lock, (mtime, mtime))
+
+    assert store.compact_partition(directory)
+    assert not lock.exists()
+    assert len(store.read()) == 12
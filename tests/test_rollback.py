@@ -0,0 +1,83 @@
+"""
+Automatic rollback of an unhealthy, freshly promoted model.
+"""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from churn_system.lifecycle import rollback
+from churn_system.lifecycle.lineage import load_lineage, save_lineage
+from churn_system.lifecycle.promote import promote_model
+from churn_system.lifecycle.registry import EXPERIMENTS_DIR, production_version, set_production
+
+
+def write_health(model_version: str, unhealthy: bool = True):
+    rollback.HEALTH_PATH.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(rollback.HEALTH_PATH, "w") as f:
+        json.dump({"model_version": model_version, "retraining_recommended": unhealthy}, f)
+
+
+@pytest.fixture
+def promoted(tmp_path, monkeypatch):
+    """
+    churn_model_a in production, then churn_model_b promoted over it.
+    """
+
+    monkeypatch.chdir(tmp_path)
+
+    for version in ("churn_model_a", "churn_model_b"):
+        (EXPERIMENTS_DIR / version).mkdir(parents=True)
+        (EXPERIMENTS_DIR / version / "metadata.json").write_text(json.dumps({"metrics": {"roc_auc": 0.8}}))
+
+    set_production("churn_model_a")
+    promote_model("churn_model_b")
+
+
+def test_unhealthy_promotion_is_rolled_back(promoted):
+    write_health("churn_model_b")
+
+    assert rollback.rollback_if_needed()
+    assert production_version() == "churn_model_a"
+
+    entry = load_lineage()[-1]
+    assert entry["model_version"] == "churn_model_a"
+    assert entry["trigger"] == rollback.ROLLBACK_TRIGGER
+    assert entry["parents_model"] == "churn_model_b"
+
+
+def test_rollback_does_not_repeat(promoted):
+    write_health("churn_model_b")
+    rollback.rollback_if_needed()
+
+    # The restored model is unhealthy too: that is for retraining, not another rollback
+    write_health("churn_model_a")
+
+    assert not rollback.rollback_if_needed()
+    assert production_version() == "churn_model_a"
+    assert len(load_lineage()) == 2
+
+
+@pytest.mark.parametrize("report_version, unhealthy", [
+    ("churn_model_b", False),
+    # A report computed before the promotion says nothing about the new model
+    ("churn_model_a", True),
+])
+def test_no_rollback(promoted, report_version, unhealthy):
+    write_health(report_version, unhealthy)
+
+    assert not rollback.rollback_if_needed()
+    assert production_version() == "churn_model_b"
+
+
+def test_no_rollback_after_the_window(promoted):
+    lineage = load_lineage()
+    lineage[-1]["timestamp"] = (datetime.now(timezone.utc) - timedelta(days=30)).isoformat()
+    save_lineage(lineage)
+
+    write_health("churn_model_b")
+
+    assert not rollback.rollback_if_needed()
+    assert production_version() == "churn_model_b"
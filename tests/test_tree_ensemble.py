@@ -0,0 +1,138 @@
+"""
+Parity of the packed tree ensemble with sklearn's predict_proba.
+"""
+
+import numpy as np
+import pytest
+import scipy.sparse as sp
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+from churn_system.benchmarks.synthetic import make_telco_frame
+from churn_system.features.build_features import TARGET_COLUMN, build_features
+from churn_system.inference import tree_ensemble
+from churn_system.inference.tree_ensemble import (
+    PARITY_TOLERANCE,
+    EnsemblePipeline,
+    TreeEnsemble,
+)
+
+# name → (estimator, scored through lookup tables)
+ESTIMATORS = {
+    "gradient_boosting_depth_2": (lambda: GradientBoostingClassifier(n_estimators=40, max_depth=2, random_state=0), True),
+    "gradient_boosting_depth_3": (lambda: GradientBoostingClassifier(n_estimators=40, max_depth=3, random_state=0), True),
+    "gradient_boosting_depth_5": (lambda: GradientBoostingClassifier(n_estimators=40, max_depth=5, random_state=0), False),
+    "random_forest_depth_3": (lambda: RandomForestClassifier(n_estimators=25, max_depth=3, random_state=0), True),
+    "random_forest": (lambda: RandomForestClassifier(n_estimators=25, random_state=0), False),
+}
+
+
+def make_preprocessor(X) -> ColumnTransformer:
+    numeric = X.select_dtypes("number").columns.tolist()
+    text = [c for c in X.columns if c not in numeric]
+
+    return ColumnTransformer([
+        ("num", StandardScaler(), numeric),
+        ("cat", OneHotEncoder(handle_unknown="ignore"), text),
+    ], sparse_threshold=0)
+
+
+@pytest.fixture(scope="module")
+def data():
+    train = make_telco_frame(800, seed=3)
+    X = build_features(train, training=True)
+
+    # Scored rows come from another draw: unseen categories and new values
+    X_new = build_features(make_telco_frame(300, seed=4))
+
+    return X, train[TARGET_COLUMN], X_new
+
+
+@pytest.fixture(scope="module", params=list(ESTIMATORS))
+def fitted(request, data):
+    X, y, _ = data
+    make_estimator, lookup = ESTIMATORS[request.param]
+
+    pipeline = Pipeline([
+        ("preprocessor", make_preprocessor(X)),
+        ("model", make_estimator()),
+    ]).fit(X, y)
+
+    return pipeline, TreeEnsemble.from_estimator(pipeline.named_steps["model"]), lookup
+
+
+def transformed(pipeline, X) -> np.ndarray:
+    return pipeline.named_steps["preprocessor"].transform(X)
+
+
+def test_evaluator_choice(fitted):
+    _, ensemble, lookup = fitted
+
+    assert ensemble.lookup == lookup
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+def test_predict_matches_sklearn(fitted, data, sparse):
+    pipeline, ensemble, _ = fitted
+    _, _, X_new = data
+
+    features = transformed(pipeline, X_new)
+    expected = pipeline.named_steps["model"].predict_proba(features)[:, 1]
+
+    if sparse:
+        features = sp.csr_matrix(features)
+
+    np.testing.assert_allclose(ensemble.predict(features), expected, rtol=0, atol=PARITY_TOLERANCE)
+
+
+def test_predict_across_chunks(fitted, data, monkeypatch):
+    pipeline, ensemble, _ = fitted
+    _, _, X_new = data
+
+    # A few rows per chunk, so chunk boundaries are crossed many times
+    monkeypatch.setattr(tree_ensemble, "CHUNK_PAIRS", 3 * ensemble.n_trees)
+    monkeypatch.setattr(tree_ensemble, "LOOKUP_CHUNK_PAIRS", 3 * ensemble.n_trees)
+
+    features = transformed(pipeline, X_new)
+    expected = pipeline.named_steps["model"].predict_proba(features)[:, 1]
+
+    np.testing.assert_allclose(ensemble.predict(features), expected, rtol=0, atol=PARITY_TOLERANCE)
+
+
+def test_predict_row_matches_sklearn(fitted, data):
+    pipeline, ensemble, _ = fitted
+    _, _, X_new = data
+
+    features = transformed(pipeline, X_new.head(25)).astype(np.float64)
+    expected = pipeline.named_steps["model"].predict_proba(features)[:, 1]
+
+    rows = np.array([ensemble.predict_row(x) for x in features])
+
+    np.testing.assert_allclose(rows, expected, rtol=0, atol=PARITY_TOLERANCE)
+
+
+@pytest.mark.parametrize("rows", [1, tree_ensemble.TRAVERSAL_MAX_ROWS, 200])
+def test_ensemble_pipeline_matches_pipeline(fitted, data, rows):
+    pipeline, ensemble, _ = fitted
+    _, _, X_new = data
+
+    X = X_new.head(rows)
+
+    np.testing.assert_allclose(
+        EnsemblePipeline(pipeline, ensemble).predict_proba(X),
+        pipeline.predict_proba(X),
+        rtol=0,
+        atol=PARITY_TOLERANCE,
+    )
+
+
+def test_save_and_load(fitted, data, tmp_path):
+    pipeline, ensemble, _ = fitted
+    _, _, X_new = data
+
+    ensemble.save(tmp_path)
+    features = transformed(pipeline, X_new)
+
+    np.testing.assert_array_equal(TreeEnsemble.load(tmp_path).predict(features), ensemble.predict(features))
@@ -0,0 +1,96 @@
+"""
+/predict (compiled fast path) and /predict/batch agree on which records
+the validation plan rejects.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+
+from churn_system.api.schema_generator import generate_request_model
+from churn_system.api.scoring_executor import StageError, score_record
+from churn_system.benchmarks.synthetic import make_telco_frame
+from churn_system.features.build_features import TARGET_COLUMN, build_features
+from churn_system.inference.batch import score_records
+from churn_system.inference.compiled_scorer import compile_pipeline
+from churn_system.inference.validation_plan import build_validation_plan
+from churn_system.training.steps.model_training import build_preprocessor
+
+
+@pytest.fixture(scope="module")
+def active():
+    df = make_telco_frame(600, seed=3)
+    X = build_features(df, training=True)
+
+    pipeline = Pipeline([
+        ("preprocessor", build_preprocessor(X)),
+        ("model", LogisticRegression(max_iter=1000)),
+    ]).fit(X, df[TARGET_COLUMN])
+
+    plan = build_validation_plan(X)
+
+    return SimpleNamespace(
+        compiled_scorer=compile_pipeline(pipeline),
+        scoring_model=pipeline,
+        validation_plan=plan,
+        request_model=generate_request_model(list(X.columns), plan),
+    )
+
+
+@pytest.fixture
+def records(active):
+    numeric = active.validation_plan.numeric
+
+    records = make_telco_frame(6, seed=4).drop(columns=[TARGET_COLUMN]).to_dict("records")
+
+    records[1]["Payment Method"] = "Barter"
+    records[2]["Monthly Charges"] = numeric["Monthly Charges"]["max"] + 50
+    records[3]["Tenure Months"] = int(numeric["Tenure Months"]["max"]) + 1
+    records[3]["Contract"] = "Weekly"
+    records[4]["Total Charges"] = None
+
+    return records
+
+
+def predict_single(active, record) -> dict:
+    try:
+        prob, _, _ = score_record(active, active.request_model.model_validate(record).model_dump())
+    except StageError as e:
+        return {"error": e.message.removeprefix("Invalid inference data: ")}
+
+    return {"churn_probability": round(prob, 4)}
+
+
+@pytest.mark.parametrize("reject_unknown, reject_out_of_range", [
+    (False, False),
+    (True, False),
+    (False, True),
+    (True, True),
+])
+def test_single_and_batch_agree(active, records, monkeypatch, reject_unknown, reject_out_of_range):
+    monkeypatch.setattr(active.validation_plan, "reject_unknown", reject_unknown)
+    monkeypatch.setattr(active.validation_plan, "reject_out_of_range", reject_out_of_range)
+
+    batch, _, _, _ = score_records(
+        active.scoring_model, records, active.request_model, 0.5, active.validation_plan,
+    )
+
+    for record, result in zip(records, batch):
+        single = predict_single(active, record)
+
+        if "error" in result:
+            assert single == {"error": result["error"]}
+        else:
+            assert single == {"churn_probability": result["churn_probability"]}
+
+    expected = set()
+
+    if reject_unknown:
+        expected |= {1, 3}
+
+    if reject_out_of_range:
+        expected |= {2, 3}
+
+    assert {i for i, result in enumerate(batch) if "error" in result} == expected